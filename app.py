@@ -15,11 +15,9 @@ from urllib.parse import urlencode, urlparse, quote_plus
 
 from flask import (Flask, request, render_template, redirect, url_for, jsonify,
                    make_response, session, current_app, flash, abort, g, render_template_string)
-from flask_session import Session
 from flask_wtf import CSRFProtect
 from wtforms import ValidationError
 from flask_wtf.csrf import validate_csrf, CSRFError
-from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_talisman import Talisman
 from flask_sitemap import Sitemap
@@ -27,17 +25,14 @@ from flask.cli import with_appcontext
 
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.exceptions import HTTPException
+from werkzeug.http import is_resource_modified, quote_etag
 
 import traceback
 
-from upstash_redis import Redis
-
 from dotenv import load_dotenv
 from authlib.integrations.flask_client import OAuth
-from authlib.jose import jwt, JsonWebKey
 import requests
 from sqlalchemy import func, or_
-from pycognito import Cognito
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
 
 from helpers.analytics import get_admin_metrics, city_distribution, awareness_distribution
@@ -55,17 +50,27 @@ from helpers.flow_session import (
     new_confirm_token,          # replace the inline version
     SessionExpired
 )
-from helpers.cus_limiter import code_email_key
+from helpers.cus_limiter import code_email_key, PipelinedLimiter
+import helpers.redis_pool as redis_pool
+import helpers.session_store as session_store
+from helpers.page_cache import cacheable_page, render_cached
+import helpers.page_cache as page_cache
+import helpers.query_stats as query_stats
+import helpers.route_events as route_events
+import helpers.breadcrumbs as breadcrumbs
+from helpers.query_stats import query_budget
 from helpers.address import verifyZip, verifyAddress, AddressError
 from helpers.helpers import format_date
 from helpers.capture_ip import client_ip
 import helpers.import_backfill as backfill_mod
+import helpers.export as export_mod
 # from helpers.routing import compute_optimized_route, seconds_to_hms
 from helpers.mapbox_routing import compute_optimized_route, compute_optimized_route_with_metrics, seconds_to_hms, _maybe_geocode, _coords_like, hms_to_seconds, seconds_to_pretty
-from helpers.scheduling import build_schedule
+from helpers.scheduling import build_schedule, invalidate_schedule, is_bookable, note_booking_changed
 from helpers.emailer import (send_contact_email, send_request_email, send_mopf_email,
                              send_error_report, send_edited_request_email, send_cancellation_email)
-from helpers.auth import verify_cognito_jwt, JoseError
+from helpers.auth import (verify_cognito_jwt, session_claims, remember_claims,
+                          start_jwks_refresher, JoseError)
 from helpers.export import weekly_export
 from helpers.forms import (RequestForm, DateSelectionForm, UpdateAddressForm,
                            PickupStatusForm, AdminScheduleForm, AdminAddressForm,
@@ -74,11 +79,22 @@ from helpers.forms import (RequestForm, DateSelectionForm, UpdateAddressForm,
                            DeletePickupForm, ContactForm, CleanPickupsForm, AddPickupNotes,
                            updateCustomerNotes, RatingForm, DebugAdminRoutes, RefreshRoute,
                            taxReceiptForm)
-from helpers.mopf import save_donation_submission
+from helpers.mopf import save_donation_submission, start_mopf_flusher
+import helpers.mopf as mopf_mod
+import helpers.service_area as service_area_mod
+from helpers.site_config import site_config, set_depot
+from helpers.live_route import remaining_stops, roll_forward, row_state, save_route, state_etag
+import helpers.startup_profile as startup_profile_mod
+import helpers.images as images_mod
+import helpers.assets as assets_mod
+from helpers.prefork import threads_managed_externally
+from helpers.compression import CompressionMiddleware
+from helpers.api_urls import mapbox_url
+from helpers.service_area import service_areas, geofence
 
 from models import (db, PickupRequest, ServiceSchedule, DriverLocation,
-                    RouteSolution, DonationRecord, Config as DBConfig, add_request,
-                    get_service_schedule, get_address)
+                    RouteSolution, DonationRecord, add_request,
+                    get_service_schedule)
 
 from extensions import mail
 
@@ -111,13 +127,11 @@ def today_pacific() -> date:
 # Extension singletons
 # ──────────────────────────────────────────────────────────────────────────
 csrf    = CSRFProtect()
-limiter = Limiter(
+limiter = PipelinedLimiter(
     key_func=client_ip,
     default_limits=ConfigClass.DEFAULT_RATE_LIMITS
 )
 
-redis = Redis.from_env() 
-
 # ──────────────────────────────────────────────────────────────────────────
 # Factory
 # ──────────────────────────────────────────────────────────────────────────
@@ -130,15 +144,12 @@ def create_app():
     sitemap = Sitemap(app=app)
     app.config.from_object(ConfigClass)
 
-    if app.config["SESSION_TYPE"] == "redis":
-        import redis
-        # now we know UPSTASH_TLS_URL is set (and only needed in prod)
-        app.config["SESSION_REDIS"] = redis.from_url(
-            app.config["UPSTASH_TLS_URL"]
-        )
+    # One pooled Redis client (prod) for sessions + rate limits; sets
+    # SESSION_REDIS and RATELIMIT_STORAGE_OPTIONS before those extensions init.
+    redis_pool.init_app(app)
 
-    sess = Session()
-    sess.init_app(app)
+    # Redis sessions get a per-worker read-through cache (helpers.session_store)
+    session_store.init_app(app)
 
     # OAuth (Amazon Cognito)
     oauth = OAuth(app)
@@ -170,6 +181,10 @@ def create_app():
 
     limiter.init_app(app)
 
+    # gzip/brotli for dynamic responses; inside ProxyFix so ProxyFix stays outermost
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app,
+                                         min_size=app.config.get("COMPRESS_MIN_SIZE", 1024))
+
     # Put ProxyFix before the limiter so it sees the real client IP
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1)
 
@@ -232,6 +247,9 @@ def create_app():
         "form-action":     [SELF],
     }
 
+    # Before Talisman, so its 304 hook runs after Talisman's headers are set.
+    page_cache.init_app(app)
+
     talisman = Talisman(
         app,
         content_security_policy=csp,
@@ -257,9 +275,9 @@ def create_app():
     mail.init_app(app)
     csrf.init_app(app)
     db.init_app(app)
+    query_stats.init_app(app)
 
     from flask_migrate import Migrate
-    from langdetect import detect, DetectorFactory
     migrate = Migrate(app, db)
 
     # Create tables once if needed
@@ -380,7 +398,7 @@ def create_app():
                 record_login_failure()
                 return redirect(url_for("admin_login", next=request.url))
             try:
-                claims = verify_cognito_jwt(id_token)
+                claims = session_claims(session, id_token)
             except JoseError:
                 session.clear()
                 record_login_failure()
@@ -432,8 +450,11 @@ def create_app():
         ))
         app.logger.addHandler(handler)
 
-    if not app.testing:
+    # Under gunicorn.conf.py the threads are started per worker after fork.
+    if not app.testing and not threads_managed_externally():
         start_monitoring_threads()
+        start_mopf_flusher(app)
+        start_jwks_refresher(app)
 
     app.logger.setLevel(app.config["LOGGER_LEVEL"])
     app.logger.info('LOGGER LEVEL: %s', app.config["LOGGER_LEVEL"])
@@ -503,39 +524,46 @@ def create_app():
 
 
     @app.route('/', methods=['GET'])
+    @cacheable_page
     def home():
         current_app.logger.info("GET / - Rendering landing page.")
-        return render_template('landing.html')
+        return render_cached('landing.html')
     
     @app.route('/textile-waste', methods=['GET'])
+    @cacheable_page
     def textileWaste():
         current_app.logger.info("GET /textile-waste - Rendering textile_waste page.")
-        return render_template('textile_waste.html')
+        return render_cached('textile_waste.html')
     
     @app.route('/about', methods=['GET'])
+    @cacheable_page
     def about():
         current_app.logger.info("GET /about - Rendering about page.")
-        return render_template('about.html')
+        return render_cached('about.html')
         
     @app.route('/contact', methods=['GET'])
+    @cacheable_page
     @no_cache
     def contact():
         current_app.logger.info("GET /contact - Rendering contact page.")
         mark_form_start()
         form = ContactForm()
-        return render_template('contact.html', contact_form=form)
+        return render_cached('contact.html', contact_form=form)
 
     @app.route('/drop-boxes', methods=['GET'])
+    @cacheable_page
     def dropBoxes():
         current_app.logger.info("GET /drop-boxes - Rendering drop boxes page.")
-        return render_template('drop_boxes.html')
+        return render_cached('drop_boxes.html')
     
     @app.route('/mopf', methods=['GET'])
+    @cacheable_page
     def mopf():
         current_app.logger.info("GET /mopf - Rendering MOPF page.")
         form = taxReceiptForm()
         today = date.today().isoformat()  # "YYYY-MM-DD"
-        return render_template('mopf.html', form=form, GOOGLE_API_KEY=GOOGLE_API_KEY, today=today)
+        return render_cached('mopf.html', vary=(today,), form=form,
+                             GOOGLE_API_KEY=GOOGLE_API_KEY, today=today)
     
     @app.route('/mopf-submit', methods=['POST'])
     def mopf_submit():
@@ -567,9 +595,7 @@ def create_app():
             db.session.add(new_donation)
             db.session.commit()
 
-            save_donation_submission(
-                fname, lname, email, address, address2, city, zip_, donation_date, estimated_value
-            )
+            save_donation_submission(new_donation)
 
             try:
                 send_mopf_email(email, estimated_value, donation_date)
@@ -599,8 +625,7 @@ def create_app():
         zip_code = request.args.get('zipcode')
         current_app.logger.debug("Zip code provided: %s", zip_code)
 
-        approved_zips = ["94566", "94568", "94588", "94568", "94550", "94551", "94582", "94583", "94506", "94526", "94507"] 
-        result = verifyZip(approved_zips, zip_code)
+        result = verifyZip(service_areas(), zip_code or "")
         current_app.logger.debug("verifyZip result: %s", result)
 
         return jsonify(result)
@@ -627,6 +652,15 @@ def create_app():
             return jsonify(valid=False,
                         message="Address, city and ZIP are required."), 200
 
+        # 2½ Geofence (optional, free) – reject out-of-area pins pre-Google -
+        fence = geofence()
+        lon, lat = data.get("lon"), data.get("lat")
+        if fence and isinstance(lon, (int, float)) and isinstance(lat, (int, float)):
+            if not fence.contains(lon, lat):
+                log.info("validate_address: point outside service geofence")
+                return jsonify(valid=False,
+                            message="We're sorry, that address is outside our service area."), 200
+
         # 3️⃣ Call the validator -------------------------------------------
         try:
             ok, msg = verifyAddress(full_addr, place_id, city, zip_code)
@@ -652,18 +686,10 @@ def create_app():
         form = RequestForm()
         mark_form_start()
         zipcode = request.args.get('zipcode')
-        ZIP_TO_CITY = {
-            "94566": "Pleasanton",
-            "94568": "Dublin",
-            "94588": "Pleasanton",
-            "94550": "Livermore",
-            "94551": "Livermore"
-        }
         current_app.logger.debug("Checking user's zipcode: %s", zipcode)
 
-        if zipcode in ZIP_TO_CITY:
-            city = ZIP_TO_CITY[zipcode]
-        else:
+        city = service_areas().primary_city(zipcode) if zipcode else None
+        if not city:
             city = None
             zipcode = None
             current_app.logger.warning("Invalid or missing zipcode provided: %s", zipcode)
@@ -776,7 +802,8 @@ def create_app():
         if offset > 2: 
             offset = 2
 
-        days_list, base_date_str = build_schedule(offset)
+        service_days = service_areas().service_days(pickup.zipcode, pickup.city)
+        days_list, base_date_str = build_schedule(offset, service_days)
         current_app.logger.debug("Built schedule and sending to /select-date")
         form = DateSelectionForm()
 
@@ -784,10 +811,16 @@ def create_app():
             chosen_date = form.chosen_date.data  # e.g., "2025-01-11"
             chosen_time = form.chosen_time.data  # e.g., "08:00-16:00"
 
+            if not is_bookable(chosen_date, service_days):
+                current_app.logger.warning("Date %s not bookable for request_id=%s", chosen_date, request_id)
+                flash("That day isn't available for your address. Please choose another.", 'warning')
+                return redirect(url_for('select_date', request_id=request_id, week_offset=offset))
+
             pickup.request_date = chosen_date
             pickup.request_time = chosen_time
             pickup.status = "Requested"
             pickup.date_filed = today_pacific().isoformat()
+            note_booking_changed()
             db.session.commit()
             current_app.logger.info(
                 "Pickup request %s updated with chosen_date=%s, chosen_time=%s. Redirecting to confirmation.",
@@ -1104,9 +1137,8 @@ def create_app():
         if offset > 2: 
             offset = 2
 
-        offset = request.args.get('week_offset', default=0, type=int)
-        
-        days_list, base_date_str = build_schedule(offset)
+        days_list, base_date_str = build_schedule(
+            offset, service_areas().service_days(pickup.zipcode, pickup.city))
         current_app.logger.debug(
             "Built schedule and routing to edit_request"
         )
@@ -1157,11 +1189,18 @@ def create_app():
                 current_app.logger.warning("No pickup found for request_id=%s, redirecting to edit_request.", request_id)
 
                 return redirect(url_for('edit_request'))
+
+            if not is_bookable(chosen_date.isoformat(),
+                               service_areas().service_days(pickup.zipcode, pickup.city)):
+                current_app.logger.warning("Date %s not bookable for request_id=%s", chosen_date, request_id)
+                flash("That day isn't available for your address. Please choose another.", 'warning')
+                return redirect(url_for('edit_request_time', request_id=request_id))
             
             pickup.request_date = chosen_date
             pickup.request_time = chosen_time
             pickup.status = "Requested"
             pickup.date_filed = today_pacific().isoformat()
+            note_booking_changed()
             db.session.commit()
 
             current_app.logger.info(
@@ -1237,6 +1276,7 @@ def create_app():
                 }), 404
             
             pickup.status = "Cancelled"
+            note_booking_changed()
             db.session.commit()
             if pickup.status == "Cancelled":
                 current_app.logger.info(
@@ -1274,6 +1314,13 @@ def create_app():
 
 
 
+    @app.route('/admin/metrics')
+    @login_required
+    def admin_metrics():
+        """This worker's DB query and Redis round-trip totals since start-up."""
+        return jsonify(db=query_stats.stats(), redis=redis_pool.stats(),
+                       route_events=route_events.stats(), pid=os.getpid())
+
     @app.route('/admin')
     def admin():
         current_app.logger.info("GET /admin - User accessed admin route; redirecting to admin_console.")
@@ -1308,10 +1355,7 @@ def create_app():
         # Extra defence: verify the ID-token signature & claims ourselves :contentReference[oaicite:1]{index=1}
         # --------------------------------------------------------------------------
         try:
-            jwks_uri = oauth.oidc.load_server_metadata()["jwks_uri"]
-            jwks     = JsonWebKey.import_key_set(requests.get(jwks_uri, timeout=5).json())
-            id_token = jwt.decode(token["id_token"], jwks)  # verifies signature
-            id_token.validate()                            # exp, iat, aud, iss…
+            id_token = verify_cognito_jwt(token["id_token"])  # signature, exp, iss, aud
         except Exception as exc:
             record_login_failure()
             current_app.logger.exception("ID-token validation failed: %s", exc)
@@ -1321,6 +1365,7 @@ def create_app():
         session.permanent = True
         session["id_token"]  = token["id_token"]
         session["expires_at"] = id_token["exp"]
+        remember_claims(session, token["id_token"], id_token)
 
         current_app.logger.info("Admin logged in.")
 
@@ -1428,7 +1473,7 @@ def create_app():
         current_app.logger.info("Accessing /admin-schedule.")
 
         schedule_data = get_service_schedule()
-        address = get_address()
+        address = site_config().admin_address
         admin_schedule_form = AdminScheduleForm()
         admin_address_form = AdminAddressForm()
 
@@ -1460,6 +1505,7 @@ def create_app():
                         schedule_record.slot1_end    = "16:00"
                         schedule_record.slot2_start  = ""
                         schedule_record.slot2_end    = ""
+                invalidate_schedule()
                 db.session.commit()
                 current_app.logger.info("Schedule data updated; redirecting to /admin-schedule.")
 
@@ -1500,17 +1546,7 @@ def create_app():
         new_address = form.admin_address.data
         current_app.logger.debug("Form validated. New address: %r", new_address)
 
-        # 2) Persist the raw text under key "admin_address"
-        admin_cfg = DBConfig.query.filter_by(key='admin_address').first()
-        if admin_cfg:
-            admin_cfg.value = new_address
-            current_app.logger.debug("Updated existing admin_address config.")
-        else:
-            admin_cfg = DBConfig(key='admin_address', value=new_address)
-            db.session.add(admin_cfg)
-            current_app.logger.debug("Created new admin_address config.")
-
-        # 3) Geocode it
+        # 2) Geocode it
         token = os.getenv("MAPBOX_ACCESS_TOKEN")
         if not token:
             raise ValueError("MAPBOX_ACCESS_TOKEN env var not set")
@@ -1524,17 +1560,10 @@ def create_app():
             )
             geocoded = None
 
-        # 4) Persist the geocode under key "geocoded_admin_addr"
-        geo_cfg = DBConfig.query.filter_by(key='geocoded_admin_addr').first()
-        if geo_cfg:
-            geo_cfg.value = geocoded
-            current_app.logger.debug("Updated existing geocoded_admin_addr config.")
-        else:
-            geo_cfg = DBConfig(key='geocoded_admin_addr', value=geocoded)
-            db.session.add(geo_cfg)
-            current_app.logger.debug("Created new geocoded_admin_addr config.")
+        # 3) Persist text + geocode; every worker reloads the site config
+        set_depot(new_address, geocoded)
 
-        # 5) Commit once, then redirect
+        # 4) Commit once, then redirect
         db.session.commit()
         current_app.logger.info("Admin address and geocode updated. Redirecting.")
         return redirect(url_for('admin_schedule'))
@@ -1542,11 +1571,11 @@ def create_app():
 
     @app.route('/admin-pickups', methods=['GET', 'POST'])
     @login_required
+    @query_budget(4)
     def admin_pickups():
         current_app.logger.info("Accessing /admin-pickups page.")
 
         delete_form = DeletePickupForm()
-        schedule_data = get_service_schedule()
 
         # Start with a base query for PickupRequest
         query = PickupRequest.query
@@ -1581,7 +1610,7 @@ def create_app():
         current_app.logger.debug("Found %d pickup requests after applying filters/sorts.", len(requests))
         cleanup_form = CleanPickupsForm()
 
-        return render_template('admin/admin_pickups.html', schedule_data=schedule_data, requests=requests, delete_form=delete_form, cleanup_form=cleanup_form)
+        return render_template('admin/admin_pickups.html', requests=requests, delete_form=delete_form, cleanup_form=cleanup_form)
     
     def format_iso_to_pretty(date_str: str) -> str:
         try:
@@ -1657,6 +1686,7 @@ def create_app():
 
     @app.route('/admin/filtered_requests')
     @login_required
+    @query_budget(3)
     def filtered_requests():
         current_app.logger.info("Accessing /admin/filtered_requests - AJAX partial update of pickups table.")
 
@@ -1709,6 +1739,7 @@ def create_app():
             pickup = PickupRequest.query.get_or_404(pickup_id)
             
             db.session.delete(pickup)
+            note_booking_changed()
             db.session.commit()
             current_app.logger.info("Pickup request %s deleted successfully.", pickup_id)
 
@@ -1910,8 +1941,7 @@ def create_app():
         requested_addresses = [f"{p.address}, {p.city} CA" for p in all_pickups]
 
         # Depot (TEXT) – compute will geocode as needed; UI will remain textual
-        admin_cfg = DBConfig.query.filter_by(key='admin_address').first()
-        depot = admin_cfg.value if (admin_cfg and admin_cfg.value) else "5389 Mallard Dr., Pleasanton, CA 94566"
+        depot = site_config().depot_text
 
         # Defaults so the template logic never breaks
         sorted_addresses = requested_addresses[:]  # default to "as-entered" order
@@ -1975,16 +2005,15 @@ def create_app():
         # Fallback – tweak to match how you normally format text addresses
         return f"{pr.address}, {pr.city}, CA {pr.zipcode}"
     
+    def _miles_pretty(meters: int | float) -> str:
+        # 1 decimal for 10+ miles, 2 decimals for under 10 for a nicer read
+        miles = float(meters) / 1609.344
+        return f"{miles:.1f} mi" if miles >= 10 else f"{miles:.2f} mi"
+
     @app.route('/live-route', methods=['GET'])
     @login_required
+    @query_budget(10)
     def live_route():
-        def meters_to_miles(m: int | float) -> float:
-            return float(m) / 1609.344
-
-        def miles_pretty(miles: float) -> str:
-            # 1 decimal for 10+ miles, 2 decimals for under 10 for a nicer read
-            return f"{miles:.1f} mi" if miles >= 10 else f"{miles:.2f} mi"
-
         CACHE_MAX_AGE_MINUTES = 15  # informational only; no auto-refresh by age
         pickup_status_form    = PickupStatusForm()
         debug_form            = DebugAdminRoutes()
@@ -2013,14 +2042,13 @@ def create_app():
         driver_current_location = _clean_coord(driver_loc.full_address()) if (driver_loc and driver_loc.full_address()) else None
 
         # Depot values from config: TEXT for UI, GEO for compute
-        admin_text_cfg = DBConfig.query.filter_by(key='admin_address').first()
-        admin_address_text = (admin_text_cfg.value if admin_text_cfg and admin_text_cfg.value
-                            else "5389 Mallard Dr., Pleasanton, CA 94566")
+        cfg = site_config()
+        admin_address_text = cfg.depot_text
 
-        depot_geo_cfg = DBConfig.query.filter_by(key='geocoded_admin_addr').first()
-        depot_address_geo = _clean_coord(
-            depot_geo_cfg.value if depot_geo_cfg and depot_geo_cfg.value else "5389 Mallard Dr., Pleasanton, CA 94566"
-        )
+        # Shown as the last stop's address: the GPS fix changes with every ping
+        # and reaches open pages through the ping response and "driver" events.
+        display_driver_loc = (driver_loc and driver_loc.text_address()) or admin_address_text
+        depot_address_geo = _clean_coord(cfg.depot_geo)
 
         def _pickup_addr_fmt(p: PickupRequest) -> str:
             return _pickup_addr(p)
@@ -2034,64 +2062,17 @@ def create_app():
         # 2) Cache handling
         # ------------------------------------------------------------------ #
         cached = RouteSolution.query.filter_by(date=selected_date).first()
-        should_refresh = (cached is None) or explicit_refresh
+        should_refresh = (cached is None) or explicit_refresh or not cached.stops
         time_display_str     = ""
         distance_display_str = ""
 
-        def _roll_forward_cached_route(cached_obj: RouteSolution) -> tuple[list[str], int, int]:
-            """
-            Trim completed legs from the FRONT of the cached route and decrement both time and distance.
-            Returns: (remaining_route_addresses, remaining_seconds, remaining_meters)
-            """
-            old_route        = json.loads(cached_obj.route_json or "[]")
-            old_legs_seconds = json.loads(cached_obj.legs_json or "[]")              # seconds per leg
-            old_legs_meters  = json.loads(cached_obj.legs_meters_json or "[]")       # meters per leg
-
-            if not old_route:
-                return addresses, 0, 0
-
-            # Ensure depot (geo token) is last
-            if not old_route or old_route[-1] != depot_address_geo:
-                if depot_address_geo in old_route:
-                    old_route = [a for a in old_route if a != depot_address_geo] + [depot_address_geo]
-                else:
-                    old_route.append(depot_address_geo)
-
-            # Replace dynamic start with current driver location for display only
-            if old_route and driver_current_location:
-                old_route[0] = driver_current_location
-
-            # Trim completed/not-possible stops ONLY from the front.
-            travelled_sec = 0
-            travelled_m   = 0
-            while len(old_route) > 2 and old_route[1] not in requested_keys:
-                if old_legs_seconds:
-                    travelled_sec += int(old_legs_seconds.pop(0))
-                if old_legs_meters:
-                    travelled_m += int(old_legs_meters.pop(0))
-                old_route.pop(1)
-
-            total_seconds = hms_to_seconds(cached_obj.total_time_str)
-            remaining_sec = max(0, total_seconds - travelled_sec)
-
-            total_meters = int(cached_obj.total_distance_meters or 0)
-            remaining_m  = max(0, total_meters - travelled_m) if total_meters else sum(int(x) for x in old_legs_meters)
-
-            # Persist back
-            cached_obj.route_json            = json.dumps(old_route)
-            cached_obj.legs_json             = json.dumps(old_legs_seconds)
-            cached_obj.legs_meters_json      = json.dumps(old_legs_meters)
-            cached_obj.total_time_str        = seconds_to_hms(remaining_sec)
-            cached_obj.total_distance_meters = int(remaining_m)
-            cached_obj.last_updated          = datetime.now()
-            db.session.commit()
-
-            return old_route, remaining_sec, remaining_m
-
         if cached and not should_refresh:
-            addresses, remaining_sec, remaining_m = _roll_forward_cached_route(cached)
-            time_display_str     = seconds_to_pretty(remaining_sec)
-            distance_display_str = miles_pretty(meters_to_miles(remaining_m))
+            # Derived on every view; the cached solution itself is never rewritten here
+            remaining = roll_forward(cached, [p.id for p in pickups_requested], depot_address_geo, driver_current_location)
+            if remaining.addresses:
+                addresses = list(remaining.addresses)
+            time_display_str     = seconds_to_pretty(remaining.seconds)
+            distance_display_str = _miles_pretty(remaining.meters)
             current_app.logger.info(
                 "Used cached route (stable), remaining: %s, %s",
                 time_display_str,
@@ -2150,31 +2131,20 @@ def create_app():
                 total_distance_m  = int(res["total_distance_meters"])
 
             # Save cache
-            if cached:
-                cached.route_json            = json.dumps(final_route)
-                cached.legs_json             = json.dumps(legs_seconds)
-                cached.total_time_str        = seconds_to_hms(total_seconds)
-                cached.legs_meters_json      = json.dumps(legs_meters)
-                cached.total_distance_meters = int(total_distance_m)
-                cached.last_updated          = datetime.now()
-                cached.needs_refresh         = False
-            else:
-                cached = RouteSolution(
-                    date=selected_date,
-                    route_json=json.dumps(final_route),
-                    legs_json=json.dumps(legs_seconds),
-                    total_time_str=seconds_to_hms(total_seconds),
-                    legs_meters_json=json.dumps(legs_meters),
-                    total_distance_meters=int(total_distance_m),
-                    last_updated=datetime.now(),
-                    needs_refresh=False,
-                )
+            if not cached:
+                cached = RouteSolution(date=selected_date)
                 db.session.add(cached)
-
+            save_route(
+                cached, final_route, legs_seconds, legs_meters,
+                [(p.id, _pickup_addr_fmt(p)) for p in pickups_requested],
+                total_seconds=total_seconds, total_meters=total_distance_m,
+            )
+            cached.last_updated  = datetime.now()
+            cached.needs_refresh = False
             db.session.commit()
             addresses            = final_route
             time_display_str     = seconds_to_pretty(total_seconds)
-            distance_display_str = miles_pretty(meters_to_miles(total_distance_m))
+            distance_display_str = _miles_pretty(total_distance_m)
 
             # Strip flags immediately so they don't stick
             if explicit_refresh:
@@ -2193,6 +2163,21 @@ def create_app():
             or_(PickupRequest.status == 'Complete', PickupRequest.status == 'Incomplete')
         ).all()
 
+        # Conditional GET: only what the page shows (stop order is the row order),
+        # so driver pings alone never defeat the 304.
+        # The time bucket makes a cached page re-render well before its CSRF token expires.
+        csrf_ttl = current_app.config.get("WTF_CSRF_TIME_LIMIT") or 3600
+        etag = state_etag(
+            selected_date, time_display_str, distance_display_str,
+            admin_address_text, display_driver_loc,
+            [row_state(p) for p in pickups_requested], [row_state(p) for p in pickups_completed],
+            session.get(current_app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token")),
+            int(time.time() // max(60, csrf_ttl // 2)),
+        )
+        validators = {"ETag": quote_etag(etag, weak=True), "Cache-Control": "private, no-cache"}
+        if not session.get("_flashes") and not is_resource_modified(request.environ, etag=etag):
+            return current_app.response_class(status=304, headers=validators)
+
         # ------------------------------------------------------------------ #
         # 5) Presentation mapping: show text for depot, keep compute stable
         # ------------------------------------------------------------------ #
@@ -2200,11 +2185,10 @@ def create_app():
             (admin_address_text if a == depot_address_geo else a)
             for a in addresses
         ]
-        display_driver_loc = driver_current_location or admin_address_text
 
         current_app.logger.debug("Calculated route (display): %s", route_for_display)
 
-        return render_template(
+        resp = make_response(render_template(
             "admin/live_route.html",
             date=format_iso_to_pretty(selected_date),
             pickups_requested=pickups_requested,
@@ -2216,7 +2200,106 @@ def create_app():
             refresh_form=refresh_form,
             total_time_str=time_display_str,
             total_distance_str=distance_display_str,
+        ))
+        resp.headers.update(validators)
+        return resp
+
+    @app.route('/live-route/events', methods=['GET'])
+    @login_required
+    def live_route_events():
+        """SSE feed of stop/remaining/driver updates for one day (see helpers.route_events)."""
+        selected_date = request.args.get('date')
+        if not selected_date:
+            return "Date parameter is required", 400
+        try:
+            sub = route_events.subscribe(selected_date, current_app.config.get("ROUTE_EVENTS_MAX_STREAMS"))
+        except route_events.TooManyStreams as e:
+            current_app.logger.warning("live-route events refused: %s", e)
+            return "Too many live streams", 503, {"Retry-After": "30"}
+
+        # Plain generator (no request context): the DB session and request
+        # resources are released before the stream starts.
+        return current_app.response_class(
+            route_events.stream(sub),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
         )
+
+    def _publish_route_update(pickup) -> dict:
+        """
+        Tell open /live-route pages about *pickup*'s new status. Call after
+        commit. Returns the events sent (``{name: data}``) so the response can
+        carry them too: without Redis a stream served by another worker never
+        sees them, and the page that made the change must not wait for it.
+        """
+        day = pickup.request_date
+        updates = {"stop": {
+            "pickup_id": pickup.id, "status": pickup.status,
+            "address": pickup.address, "address2": pickup.address2, "city": pickup.city,
+        }}
+        try:
+            cfg = site_config()
+            driver_loc = DriverLocation.query.first()
+            driver_geo = _clean_coord(driver_loc.full_address()) if (driver_loc and driver_loc.full_address()) else None
+            updates["driver"] = {"location": driver_geo or cfg.depot_text}
+
+            cached = RouteSolution.query.filter_by(date=day).first()
+            if cached is not None and not cached.needs_refresh:   # else pages reload and recompute
+                pending = db.session.query(PickupRequest.id).filter_by(request_date=day, status='Requested')
+                remaining = roll_forward(cached, [pid for (pid,) in pending],
+                                         _clean_coord(cfg.depot_geo), driver_geo)
+                updates["remaining"] = {
+                    "time": seconds_to_pretty(remaining.seconds),
+                    "distance": _miles_pretty(remaining.meters),
+                }
+            for event, data in updates.items():
+                route_events.publish(day, event, data)
+        except Exception:
+            # The status change is committed; pages still catch up on reload
+            current_app.logger.exception("Failed to publish live route update for %s", day)
+        return updates
+    
+    @app.route('/driver/pings', methods=['POST'])
+    @login_required
+    @limiter.limit("30 per minute")
+    @query_budget(8)
+    def driver_pings():
+        """
+        Batched GPS fixes from the driver's phone (see helpers.breadcrumbs).
+        Stores them, moves DriverLocation to the newest fix and returns – and
+        streams to open /live-route pages – the ETA of every stop still ahead.
+        """
+        payload = request.get_json(silent=True) or {}
+        retention = timedelta(hours=current_app.config.get("DRIVER_PING_RETENTION_HOURS", 72))
+        try:
+            pings = breadcrumbs.parse_pings(payload, max_age=retention)
+        except ValueError as e:
+            return jsonify(error=str(e)), 400
+        if not pings:
+            return jsonify(accepted=0, location=None, etas=[], time=None)
+
+        latest = breadcrumbs.record_pings(pings, retention)
+        db.session.commit()
+
+        day = str(payload.get("date") or today_pacific().isoformat())
+        etas, remaining = [], None
+        cached = RouteSolution.query.filter_by(date=day).first()
+        if cached and cached.stops and not cached.needs_refresh:
+            pending = db.session.query(PickupRequest.id).filter_by(request_date=day, status='Requested')
+            done, ahead = remaining_stops(cached.stops, [pid for (pid,) in pending])
+            seconds = breadcrumbs.stop_etas(
+                done, ahead, (latest.lon, latest.lat),
+                dwell_seconds=current_app.config.get("DRIVER_STOP_DWELL_SECONDS", 0),
+            )
+            now = now_pacific()
+            etas = [{"pickup_id": stop.pickup_id, "seconds": secs,
+                     "at": (now + timedelta(seconds=secs)).strftime("%-I:%M%p").lower()}
+                    for stop, secs in zip(ahead, seconds)]      # last entry: back at the depot
+            remaining = seconds_to_pretty(seconds[-1]) if seconds else None
+            route_events.publish(day, "eta", {"stops": etas, "time": remaining})
+        route_events.publish(day, "driver", {"location": latest.geo})
+
+        return jsonify(accepted=len(pings), location=latest.geo, etas=etas, time=remaining)
     
     @app.route('/refresh-route', methods=['POST'])
     @login_required
@@ -2247,9 +2330,7 @@ def create_app():
 
             if from_depot:
                 # Read the TEXT admin address for display, and use it as the current driver location.
-                admin_text_cfg = DBConfig.query.filter_by(key='admin_address').first()
-                depot_text = (admin_text_cfg.value if admin_text_cfg and admin_text_cfg.value
-                            else "5389 Mallard Dr., Pleasanton, CA 94566")
+                depot_text = site_config().depot_text
 
                 # Write TEXT address so the frontend shows the human-readable string.
                 driver_loc.geocoded_addr = None
@@ -2320,7 +2401,7 @@ def create_app():
         def _reverse_geocode(lonlat: str) -> str:
             # Best-effort: if reverse geocode fails, return the lonlat
             try:
-                url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{lonlat}.json"
+                url = mapbox_url(f"/geocoding/v5/mapbox.places/{lonlat}.json")
                 params = {"limit": 1, "access_token": token}
                 r = requests.get(url, params=params, timeout=8)
                 r.raise_for_status()
@@ -2338,22 +2419,13 @@ def create_app():
             request_date=selected_date, status='Requested'
         ).all()
 
+        depot_address = _clean_coord(site_config().depot_geo)
         driver_loc = DriverLocation.query.first()
         if driver_loc and driver_loc.full_address():
             driver_current_location = _clean_coord(driver_loc.full_address())
         else:
-            admin_cfg = DBConfig.query.filter_by(key='geocoded_admin_addr').first()
-            driver_current_location = _clean_coord(
-                admin_cfg.value if admin_cfg else "5389 Mallard Dr., Pleasanton, CA 94566"
-            )
-
-        depot_cfg = DBConfig.query.filter_by(key='geocoded_admin_addr').first()
-        depot_address = _clean_coord(
-            depot_cfg.value if depot_cfg else "5389 Mallard Dr., Pleasanton, CA 94566"
-        )
+            driver_current_location = depot_address
 
-        today_waypoints = [_pickup_addr(p) for p in pickups_requested]
-        addresses_expected = [driver_current_location] + today_waypoints + [depot_address]
 
         # ------------------------------------------------------------------ #
         # 2) Fetch cache only                                                #
@@ -2366,37 +2438,21 @@ def create_app():
         age = datetime.now() - cached.last_updated
         would_refresh = (age >= timedelta(minutes=CACHE_MAX_AGE_MINUTES)) or bool(cached.needs_refresh)
 
-        # Snapshot raw cached payloads (do not mutate DB)
-        raw_route = json.loads(cached.route_json or "[]")
-        raw_legs  = json.loads(cached.legs_json  or "[]")
-        raw_total_time_hms = cached.total_time_str or "00:00:00"
-
         # ------------------------------------------------------------------ #
         # 3) Derive the 'display' view your page would show when not refresh #
         #     (peel already-visited legs; update start to driver's location) #
         # ------------------------------------------------------------------ #
-        peeled_route = list(raw_route)
-        peeled_legs  = list(raw_legs)
-        travelled_sec = 0
-
-        removed_count = max(0, len(raw_route) - len(addresses_expected))
-        for _ in range(removed_count):
-            if len(peeled_route) > 2 and peeled_legs:
-                travelled_sec += peeled_legs.pop(0)
-                peeled_route.pop(1)
-
-        if peeled_route:
-            peeled_route[0] = driver_current_location
-
-        remaining_sec = max(0, hms_to_seconds(raw_total_time_hms) - travelled_sec)
-        display_str = seconds_to_pretty(remaining_sec)
+        remaining = roll_forward(cached, [p.id for p in pickups_requested], depot_address, driver_current_location)
+        peeled_route = list(remaining.addresses)
+        peeled_legs  = list(remaining.legs_seconds)
+        display_str = seconds_to_pretty(remaining.seconds)
 
         # ------------------------------------------------------------------ #
         # 4) Directions metrics for the *peeled display* route               #
         #     + address labels derived from cached values                    #
         # ------------------------------------------------------------------ #
         def _dir(a_lonlat: str, b_lonlat: str) -> tuple[float, float]:
-            base = "https://api.mapbox.com/directions/v5"
+            base = mapbox_url("/directions/v5")
             url  = f"{base}/{profile}/{a_lonlat};{b_lonlat}"
             params = {
                 "alternatives": "false",
@@ -2524,7 +2580,7 @@ def create_app():
             new_status = "Complete"
             pickup.status = new_status
             pickup.pickup_complete_info = now_pacific().strftime("%Y-%m-%d %-I:%M%p").lower()
-            update_driver_location(pickup.address, pickup.city)
+            update_driver_location(pickup.address, pickup.city, pickup.geocoded_addr)
 
         # ------------------------------------------------------------------ #
         # 2) Flag the route cache intelligently
@@ -2532,11 +2588,14 @@ def create_app():
         cached = RouteSolution.query.filter_by(date=pickup.request_date).first()
         if cached:
             cached.needs_refresh = (new_status == "Requested")  # True = added stop
+        note_booking_changed()                # the slot gained or lost a Requested pickup
 
         db.session.commit()
         current_app.logger.info("Pickup %s toggled to '%s'", pickup_id, new_status)
+        updates = _publish_route_update(pickup)
 
-        return jsonify({"message": "Status updated successfully", "new_status": new_status})
+        return jsonify({"message": "Status updated successfully", "new_status": new_status,
+                        "updates": updates})
 
 
 
@@ -2567,16 +2626,20 @@ def create_app():
         cached = RouteSolution.query.filter_by(date=pickup.request_date).first()
         if cached:
             cached.needs_refresh = False   # removing a stop never forces a reroute
+        note_booking_changed()
 
         db.session.commit()
         current_app.logger.info("Pickup %s marked 'Incomplete'.", pickup_id)
+        updates = _publish_route_update(pickup)
 
-        return jsonify({"message": "Status updated successfully", "new_status": pickup.status})
+        return jsonify({"message": "Status updated successfully", "new_status": pickup.status,
+                        "updates": updates})
 
 
-    def update_driver_location(address, city):
+    def update_driver_location(address, city, geocoded_addr=None):
         """
-        Update the driver's location to the provided address/city.
+        Update the driver's location to the provided address/city (and its
+        geocode, so routing needn't geocode it again).
         If no DriverLocation row exists yet, create one.
         """
         current_app.logger.info("Pickup complete, updating driver location.")
@@ -2592,6 +2655,7 @@ def create_app():
 
             driver_loc.address = address
             driver_loc.city = city
+        driver_loc.geocoded_addr = _clean_coord(geocoded_addr)
 
         db.session.commit()
         current_app.logger.info("Driver location updated successfully.")
@@ -2599,6 +2663,7 @@ def create_app():
     @app.route('/contact-form-entry', methods=['POST'])
     @limiter.limit("10 per hour")
     def contact_form_entry():
+        from langdetect import detect, DetectorFactory   # ~1 s of profile loading; only needed here
         DetectorFactory.seed = 0  # Ensure consistent results
 
         form = ContactForm(formdata=request.form)  # explicit formdata
@@ -2776,6 +2841,13 @@ def create_app():
 
 
     backfill_mod.register(app)
+    export_mod.register(app)
+    mopf_mod.register(app)
+    service_area_mod.register(app)
+    startup_profile_mod.register(app)
+    images_mod.register(app)
+    assets_mod.register(app)
+    limiter.exempt(assets_mod.serve_asset)     # static files; never rate-limited
 
     return app
 
@@ -0,0 +1,60 @@
+"""Per-request cost of admin authentication: full JWT verification vs. session cache.
+
+Usage::
+
+    python -m benchmarks.bench_admin_auth [--iterations 2000]
+
+Signs a Cognito-shaped ID token with a throw-away RSA key and times
+``verify_cognito_jwt`` (what login_required used to do on every request)
+against ``session_claims`` (cache hit after the first request).
+No network, env vars or external services needed.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from authlib.jose import JsonWebKey, jwt
+from flask import Flask
+
+import helpers.auth as auth
+
+
+def make_app_and_token() -> tuple[Flask, str]:
+    app = Flask("bench-auth")
+    app.config.update(COGNITO_REGION="us-west-1", COGNITO_USER_POOL_ID="pool",
+                      COGNITO_CLIENT_ID="client")
+    key = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": "k1"})
+    auth._KEYS = {"k1": key}
+    auth._JWKS_TS = time.time()
+    now = int(time.time())
+    claims = {"iss": auth._issuer(app.config), "aud": "client", "token_use": "id",
+              "sub": "admin", "email": "admin@example.com", "iat": now, "exp": now + 3600}
+    return app, jwt.encode({"alg": "RS256"}, claims, key).decode()
+
+
+def time_per_call(fn, iterations: int) -> float:
+    fn()                                   # warm-up / prime caches
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - t0) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    app, token = make_app_and_token()
+    session: dict = {}
+    with app.app_context():
+        full = time_per_call(lambda: auth.verify_cognito_jwt(token), args.iterations)
+        cached = time_per_call(lambda: auth.session_claims(session, token), args.iterations)
+
+    print(f"verify_cognito_jwt : {full * 1e6:9.1f} µs/request")
+    print(f"session_claims hit : {cached * 1e6:9.1f} µs/request  ({full / cached:,.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
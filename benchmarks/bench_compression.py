@@ -0,0 +1,118 @@
+"""Bytes saved and CPU per response with CompressionMiddleware, on our real templates.
+
+Usage::
+
+    python -m benchmarks.bench_compression [--rows 150] [--repeat 200]
+
+Renders the public pages (landing, textile_waste, about, drop_boxes, contact)
+through the same minimal app as ``bench_page_cache``, plus ``admin_pickups``,
+the ``filtered_requests`` table partial and ``live_route`` filled with
+``--rows`` synthetic pickups, and the same pickups as a JSON list. Each body
+is then replayed through the middleware with gzip and with brotli, reporting
+the compressed size and the CPU time the middleware adds per response.
+No database, Redis or env vars needed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from flask import render_template
+
+from benchmarks.bench_page_cache import PAGES, make_app
+from helpers.compression import CompressionMiddleware
+from helpers.forms import (CleanPickupsForm, ContactForm, DebugAdminRoutes, DeletePickupForm,
+                           PickupStatusForm, RefreshRoute)
+
+
+def fake_pickups(n: int) -> list:
+    today = date(2025, 6, 2)
+    return [SimpleNamespace(
+        id=i, request_id=f"{i:06d}", status=("Requested", "Complete", "Incomplete")[i % 3],
+        date_filed=today - timedelta(days=i % 40), request_date=today + timedelta(days=i % 9),
+        email=f"donor{i}@example.com", phone_number=f"(925) 555-{i % 10000:04d}",
+        address=f"{100 + i * 7} {('Main St', 'Hopyard Rd', 'Santa Rita Rd')[i % 3]}",
+        address2="Apt 4" if i % 5 == 0 else None, city=("Pleasanton", "Dublin", "Livermore")[i % 3],
+        zipcode=f"945{60 + i % 30}", notes="Bags by the garage" if i % 4 == 0 else None,
+        admin_notes=None, gated=bool(i % 6 == 0), awareness="Friend", fname=f"First{i}",
+        lname=f"Last{i}", pickup_complete_info=None,
+    ) for i in range(n)]
+
+
+def render_samples(rows: int) -> dict[str, tuple[str, bytes]]:
+    """name -> (content type, body)."""
+    app = make_app(cached=False)
+    # Admin templates link to every admin endpoint; the bench app doesn't have them.
+    app.url_build_error_handlers.append(lambda error, endpoint, values: "#")
+    pickups = fake_pickups(rows)
+    html = "text/html; charset=utf-8"
+    samples = {}
+
+    with app.test_request_context("/admin"):
+        for path, template in PAGES.items():
+            samples[template] = (html, render_template(template).encode())
+        samples["contact.html"] = (html, render_template("contact.html",
+                                                          contact_form=ContactForm()).encode())
+        samples["admin_pickups.html"] = (html, render_template(
+            "admin/admin_pickups.html", requests=pickups,
+            delete_form=DeletePickupForm(), cleanup_form=CleanPickupsForm()).encode())
+        samples["filtered_requests"] = (html, render_template(
+            "admin/partials/_pickup_requests_table.html", requests=pickups,
+            delete_form=DeletePickupForm()).encode())
+        samples["live_route.html"] = (html, render_template(
+            "admin/live_route.html", date="June 2, 2025",
+            pickups_requested=pickups[: rows // 2], pickups_completed=pickups[rows // 2:],
+            driver_location="5389 Mallard Dr., Pleasanton, CA 94566",
+            route=[p.address for p in pickups[: rows // 2]],
+            pickup_status_form=PickupStatusForm(), debug_form=DebugAdminRoutes(),
+            refresh_form=RefreshRoute(), total_time_str="3 hr 10 min",
+            total_distance_str="41.2 mi").encode())
+    samples["pickups.json"] = ("application/json", json.dumps(
+        [vars(p) for p in pickups], default=str).encode())
+    return samples
+
+
+def replay(content_type: str, body: bytes, encoding: str | None, repeat: int) -> tuple[int, float]:
+    """(bytes on the wire, CPU seconds per response) through the middleware."""
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", content_type),
+                                  ("Content-Length", str(len(body)))])
+        return [body]
+
+    wrapped = CompressionMiddleware(app)
+    environ = {"REQUEST_METHOD": "GET",
+               "HTTP_ACCEPT_ENCODING": encoding or "identity"}
+    size = 0
+    t0 = time.process_time()
+    for _ in range(repeat):
+        size = sum(len(chunk) for chunk in wrapped(environ, lambda *a: None))
+    return size, (time.process_time() - t0) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    totals = {None: 0, "gzip": 0, "br": 0}
+    print(f"{'response':22} {'raw':>9} {'gzip':>9} {'µs':>6} {'br':>9} {'µs':>6}")
+    for name, (content_type, body) in render_samples(args.rows).items():
+        raw, _ = replay(content_type, body, None, 1)
+        gz, gz_cpu = replay(content_type, body, "gzip", args.repeat)
+        br, br_cpu = replay(content_type, body, "br", args.repeat)
+        for key, size in ((None, raw), ("gzip", gz), ("br", br)):
+            totals[key] += size
+        print(f"{name:22} {raw / 1024:8.1f}K {gz / 1024:8.1f}K {gz_cpu * 1e6:6.0f} "
+              f"{br / 1024:8.1f}K {br_cpu * 1e6:6.0f}")
+    print(f"{'total':22} {totals[None] / 1024:8.1f}K "
+          f"{totals['gzip'] / 1024:8.1f}K {'':6} {totals['br'] / 1024:8.1f}K   "
+          f"(gzip saves {1 - totals['gzip'] / totals[None]:.0%}, "
+          f"br {1 - totals['br'] / totals[None]:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark `flask import-backfill` ORM path vs. --bulk on a synthetic CSV.
+
+Usage::
+
+    python -m benchmarks.bench_import_backfill [--rows 100000] [--skip-orm]
+
+Runs against a throw-away SQLite file; no env vars or external services needed.
+Prints wall time and the number of SQL statements each path issued.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from flask import Flask
+from sqlalchemy import event
+
+import helpers.import_backfill as backfill_mod
+from models import db, PickupRequest
+
+_CITIES = [("Pleasanton", "94566"), ("Dublin", "94568"), ("Livermore", "94550"),
+           ("San Ramon", "94583"), ("Danville", "94526")]
+_HEADER = ["Last Name", "First Name", "Address 1", "Address 2", "City", "Zip",
+           "Email", "Phone", "Last Pick-Up / Drop-Off", "Awareness"]
+
+
+def write_csv(path: Path, rows: int, seed: int = 7) -> None:
+    rnd = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        w = csv.writer(fh)
+        w.writerow(_HEADER)
+        for i in range(rows):
+            city, zip_ = rnd.choice(_CITIES)
+            when = f"{rnd.randint(1, 12):02}/{rnd.randint(1, 28):02}/{rnd.randint(19, 24)}"
+            w.writerow(["Doe", "Jane", f"{i} Main St", "", city, zip_, "", "",
+                        when if i % 50 else "inquiry", "Nextdoor"])
+
+
+def make_app(db_path: Path) -> Flask:
+    app = Flask("bench-import")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(app)
+    backfill_mod.register(app)
+    return app
+
+
+def run(app: Flask, csv_path: Path, bulk: bool) -> tuple[float, int, int]:
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        statements = 0
+
+        def _count(*_a, **_kw):
+            nonlocal statements
+            statements += 1
+
+        event.listen(db.engine, "before_cursor_execute", _count)
+        args = ["import-backfill", "--path", str(csv_path)] + (["--bulk"] if bulk else [])
+        t0 = time.perf_counter()
+        result = app.test_cli_runner().invoke(args=args)
+        elapsed = time.perf_counter() - t0
+        event.remove(db.engine, "before_cursor_execute", _count)
+        if result.exception:
+            raise result.exception
+        return elapsed, statements, PickupRequest.query.count()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--skip-orm", action="store_true", help="Only time the --bulk path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "backfill.csv"
+        write_csv(csv_path, args.rows)
+        app = make_app(tmp / "bench.db")
+
+        modes = [True] if args.skip_orm else [False, True]
+        for bulk in modes:
+            elapsed, statements, inserted = run(app, csv_path, bulk)
+            print(f"{'bulk' if bulk else 'orm ':>4}: {inserted:>7} rows in {elapsed:7.2f} s "
+                  f"({inserted / elapsed:9.0f} rows/s), {statements} SQL statements")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Requests/second for the marketing pages: render_template vs. render_cached.
+
+Usage::
+
+    python -m benchmarks.bench_page_cache [--requests 300]
+
+Serves the real templates (landing, textile_waste, about, drop_boxes, contact)
+from a minimal app with Talisman's CSP nonce and CSRF protection, through the
+full WSGI stack via the test client, and reports requests/second with each
+rendering path plus the 304 path for a revalidating browser, and the time
+spent in the view alone (the part the cache removes).
+No database, Redis or env vars needed.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from flask import Flask, render_template
+from flask_talisman import Talisman
+from flask_wtf import CSRFProtect
+
+import helpers.assets as assets
+import helpers.page_cache as page_cache
+from helpers.forms import ContactForm
+from helpers.images import picture
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "/": "landing.html",
+    "/textile-waste": "textile_waste.html",
+    "/about": "about.html",
+    "/drop-boxes": "drop_boxes.html",
+}
+
+
+def make_app(cached: bool) -> Flask:
+    app = Flask("bench-pages", template_folder=str(ROOT / "templates"),
+                static_folder=str(ROOT / "static"))
+    app.config.update(SECRET_KEY="bench", RECAPTCHA_PUBLIC_KEY="bench",
+                      PAGE_CACHE_ENABLED=cached)
+    app.add_template_global(picture)
+    assets.register(app)
+    CSRFProtect(app)
+    page_cache.init_app(app)
+    Talisman(app, content_security_policy={"script-src": "'self'"},
+             content_security_policy_nonce_in=["script-src"], force_https=False)
+    render = page_cache.render_cached if cached else render_template
+
+    for path, template in PAGES.items():
+        app.add_url_rule(path, template, lambda t=template: render(t))
+    app.add_url_rule("/contact", "contact",
+                     lambda: render("contact.html", contact_form=ContactForm()))
+    app.add_url_rule("/contact-form-entry", "contact_form_entry", lambda: "", methods=["POST"])
+    app.add_url_rule("/mopf-submit", "mopf_submit", lambda: "", methods=["POST"])
+    return app
+
+
+def requests_per_second(client, paths, n: int, headers=None) -> float:
+    for path in paths:
+        client.get(path, headers=headers)        # warm-up / fill the cache
+    t0 = time.perf_counter()
+    for i in range(n):
+        client.get(paths[i % len(paths)], headers=headers)
+    return n / (time.perf_counter() - t0)
+
+
+def view_seconds(app: Flask, paths, n: int) -> float:
+    """Mean time in the view alone (render + substitution), no WSGI/hooks."""
+    contexts = [app.test_request_context(p) for p in paths]
+    for ctx in contexts:
+        with ctx:
+            app.view_functions[ctx.request.endpoint]()
+    t0 = time.perf_counter()
+    for i in range(n):
+        with contexts[i % len(contexts)] as ctx:
+            app.view_functions[ctx.request.endpoint]()
+    return (time.perf_counter() - t0) / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    paths = [*PAGES, "/contact"]
+
+    page_cache.clear()
+    plain_app, cached_app = make_app(False), make_app(True)
+    plain = requests_per_second(plain_app.test_client(), paths, args.requests)
+    cached = requests_per_second(cached_app.test_client(), paths, args.requests)
+    plain_view = view_seconds(plain_app, paths, args.requests)
+    cached_view = view_seconds(cached_app, paths, args.requests)
+
+    client = cached_app.test_client()
+    etag = client.get("/about").headers["ETag"]
+    revalidate = requests_per_second(client, ["/about"], args.requests,
+                                     headers={"If-None-Match": etag})
+
+    print(f"render_template      : {plain:8.0f} req/s")
+    print(f"render_cached        : {cached:8.0f} req/s  ({cached / plain:.1f}x)")
+    print(f"render_cached (304)  : {revalidate:8.0f} req/s  ({revalidate / plain:.1f}x)")
+    print(f"view only            : {plain_view * 1e6:8.0f} µs -> {cached_view * 1e6:.0f} µs "
+          f"({plain_view / cached_view:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Benchmark PickupRequest inserts under concurrent writers: legacy vs. optimistic IDs.
+
+Usage::
+
+    python -m benchmarks.bench_request_ids [--writers 8] [--inserts 250] [--seed-rows 20000]
+
+``legacy`` re-creates the old allocator (one SELECT per candidate inside the
+before_insert flush); ``optimistic`` is the current :func:`models.add_request`
+path, which relies on the UNIQUE constraint and issues zero lookup queries.
+Runs against a throw-away SQLite file; no env vars or external services needed.
+On SQLite the legacy read-then-write pattern also loses inserts to "database is
+locked" (a reader cannot upgrade its lock while another writer holds it); those
+are reported as failed rather than aborting the run.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from flask import Flask
+from sqlalchemy import event, insert
+from sqlalchemy.exc import OperationalError
+
+import models
+from models import PickupRequest, add_request, db
+
+_PICKUP = dict(address="1 Main St", city="Dublin", zipcode="94568", awareness="Flyer")
+
+
+def _legacy_request_id(length: int = 8) -> str:
+    """The pre-optimistic allocator: query the table for every candidate."""
+    for _ in range(20):
+        code = "".join(models.secrets.choice(models._BASE62) for _ in range(length))
+        if not PickupRequest.query.filter_by(request_id=code).first():
+            return code
+    raise RuntimeError("Could not generate a unique request_id")
+
+
+def make_app(db_path: Path) -> Flask:
+    app = Flask("bench-request-ids")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{db_path}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        SQLALCHEMY_ENGINE_OPTIONS={"connect_args": {"timeout": 30}},
+    )
+    db.init_app(app)
+    return app
+
+
+def run(app: Flask, writers: int, inserts: int, seed_rows: int) -> tuple[float, int, int, int]:
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(
+            insert(PickupRequest.__table__),
+            [dict(_PICKUP, request_id=models.new_request_id()) for _ in range(seed_rows)],
+        )
+        db.session.commit()
+
+        statements = 0
+        lock = threading.Lock()
+
+        def _count(*_a, **_kw):
+            nonlocal statements
+            with lock:
+                statements += 1
+
+        event.listen(db.engine, "before_cursor_execute", _count)
+
+    failed = 0
+
+    def _writer() -> None:
+        nonlocal failed
+        with app.app_context():
+            for _ in range(inserts):
+                try:
+                    add_request(**_PICKUP)
+                except OperationalError:
+                    db.session.rollback()
+                    with lock:
+                        failed += 1
+            db.session.remove()
+
+    threads = [threading.Thread(target=_writer) for _ in range(writers)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    with app.app_context():
+        event.remove(db.engine, "before_cursor_execute", _count)
+        total = PickupRequest.query.count() - seed_rows
+    return elapsed, statements, total, failed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--inserts", type=int, default=250, help="Inserts per writer")
+    parser.add_argument("--seed-rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    optimistic = models.new_request_id
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(Path(tmp) / "bench.db")
+        for mode, allocator in (("legacy", _legacy_request_id), ("optimistic", optimistic)):
+            models.new_request_id = allocator
+            try:
+                elapsed, statements, inserted, failed = run(
+                    app, args.writers, args.inserts, args.seed_rows)
+            finally:
+                models.new_request_id = optimistic
+            print(f"{mode:>10}: {inserted:>6} rows by {args.writers} writers in {elapsed:6.2f} s "
+                  f"({inserted / elapsed:7.0f} rows/s), {statements / max(inserted, 1):.1f} SQL statements/row, "
+                  f"{failed} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Redis operations per page view: stock Flask-Session vs. the cached interface.
+
+Usage::
+
+    python -m benchmarks.bench_session_store [--views 20]
+
+Replays one visitor's browse – a first page view that starts a session
+(CSRF token / form timer), then ``--views`` plain page views – against an
+in-memory stand-in for Redis that counts commands and round trips.
+No Redis server needed.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import timedelta
+
+import redis
+from flask import Flask, session
+from flask_session.redis import RedisSessionInterface
+
+from helpers.session_store import CachedRedisSessionInterface
+
+
+class CountingRedis(redis.Redis):
+    """Dict-backed GET/SET/TTL/EXPIRE/DELETE that counts commands and round trips."""
+
+    def __init__(self):                    # no connection pool on purpose
+        self.data: dict = {}               # key -> (value, expires_at)
+        self.commands = 0
+        self.round_trips = 0
+
+    def _call(self, fn, *args):
+        self.commands += 1
+        return fn(*args)
+
+    def _get(self, name):
+        return self.data.get(name, (None,))[0]
+
+    def _ttl(self, name):
+        return int(self.data[name][1] - time.time()) if name in self.data else -2
+
+    def _set(self, name, value, ex):
+        self.data[name] = (value, time.time() + ex)
+
+    def _expire(self, name, time_):
+        if name in self.data:
+            self.data[name] = (self.data[name][0], time.time() + time_)
+
+    def get(self, name):
+        self.round_trips += 1
+        return self._call(self._get, name)
+
+    def set(self, name, value, ex=None, **_):
+        self.round_trips += 1
+        self._call(self._set, name, value, ex)
+
+    def expire(self, name, time_):
+        self.round_trips += 1
+        self._call(self._expire, name, time_)
+
+    def delete(self, *names):
+        self.round_trips += 1
+        for name in names:
+            self._call(self.data.pop, name, None)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return _CountingPipeline(self)
+
+
+class _CountingPipeline:
+    def __init__(self, client: CountingRedis):
+        self.client, self.queued = client, []
+
+    def get(self, name):
+        self.queued.append((self.client._get, name))
+
+    def ttl(self, name):
+        self.queued.append((self.client._ttl, name))
+
+    def set(self, name, value, ex=None, **_):
+        self.queued.append((self.client._set, name, value, ex))
+
+    def expire(self, name, time_):
+        self.queued.append((self.client._expire, name, time_))
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [self.client._call(*args) for args in self.queued]
+
+
+def make_app(interface_cls, client: CountingRedis) -> Flask:
+    app = Flask("bench-session")
+    app.config.update(SECRET_KEY="bench", PERMANENT_SESSION_LIFETIME=timedelta(days=1))
+    app.session_interface = interface_cls(app, client=client, permanent=True, use_signer=True)
+
+    @app.route("/start")
+    def start():
+        session["form_started_at"] = time.time()
+        return "form"
+
+    @app.route("/page")
+    def page():
+        exp = session.get("expires_at")       # what session_auto_timeout does
+        return "page" if not exp else "expired"
+
+    return app
+
+
+def replay(interface_cls, views: int) -> tuple[int, int]:
+    client = CountingRedis()
+    browser = make_app(interface_cls, client).test_client()
+    browser.get("/page")                       # anonymous, no cookie yet
+    browser.get("/start")
+    for _ in range(views):
+        browser.get("/page")
+    return client.commands, client.round_trips
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--views", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = args.views + 2
+    for label, cls in (("stock", RedisSessionInterface), ("cached", CachedRedisSessionInterface)):
+        commands, trips = replay(cls, args.views)
+        print(f"{label:<7} {commands:4d} commands {trips:4d} round trips "
+              f"({trips / pages:.2f} per page view over {pages} views)")
+
+
+if __name__ == "__main__":
+    main()
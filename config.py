@@ -6,10 +6,6 @@ from pathlib import Path
 from datetime import timedelta
 from typing import Type
 
-import redis
-
-from upstash_redis import Redis as UpstashRedis
-
 BASE_DIR = Path(__file__).parent
 
 
@@ -30,6 +26,10 @@ class BaseConfig:
     SESSION_USE_SIGNER = True
     PERMANENT_SESSION_LIFETIME = timedelta(days=1)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    COMPRESS_MIN_SIZE = int(require("COMPRESS_MIN_SIZE", 1024))   # bytes; smaller bodies go out as-is
+    ROUTE_EVENTS_MAX_STREAMS = int(require("ROUTE_EVENTS_MAX_STREAMS", 4))   # SSE streams per process
+    DRIVER_PING_RETENTION_HOURS = int(require("DRIVER_PING_RETENTION_HOURS", 72))
+    DRIVER_STOP_DWELL_SECONDS = int(require("DRIVER_STOP_DWELL_SECONDS", 0))   # added per stop to ETAs
 
     # ───── Mail ────────────────────────────────────────────────────────
     MAIL_SERVER   = require("MAIL_SERVER", "smtp.ionos.com")
@@ -62,6 +62,10 @@ class BaseConfig:
     GOOGLE_API_KEY=require("GOOGLE_API_KEY")
     GOOGLE_BACKEND_API_KEY=require("GOOGLE_BACKEND_API_KEY")
 
+    # ───── Booking ───────────────────────────
+    # Max Requested pickups per date+slot before the slot is hidden (0 = no limit).
+    PICKUP_SLOT_CAPACITY = int(require("PICKUP_SLOT_CAPACITY", 0))
+
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
     LOGGER_LEVEL = "DEBUG"
@@ -0,0 +1,37 @@
+"""gunicorn settings: preloaded app, per-worker resources set up after fork.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+import os
+import time
+
+from helpers.prefork import MANAGED_ENV
+
+# create_app() must not start threads in the master; workers start their own.
+os.environ[MANAGED_ENV] = "1"
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "3"))
+# Threaded workers: a /live-route/events stream holds one thread, not a whole
+# worker. Keep ROUTE_EVENTS_MAX_STREAMS well below `threads`.
+#
+# Up to `threads` requests now run at once in each worker, so any per-process
+# state that requests mutate (module-level caches, counters, rate-limit
+# windows) must hold a lock around read-modify-write – see the *_lock next to
+# each in helpers/. DB sessions are thread-scoped by Flask-SQLAlchemy.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+preload_app = True
+
+
+def post_fork(server, worker):
+    worker.forked_at = time.monotonic()
+    import wsgi                       # already imported in the master (preload)
+    from helpers.prefork import after_fork
+    after_fork(wsgi.app)
+
+
+def post_worker_init(worker):
+    import wsgi
+    from helpers.prefork import worker_ready
+    worker_ready(wsgi.app, getattr(worker, "forked_at", None))
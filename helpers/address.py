@@ -24,12 +24,110 @@ def verifyZip(zip_list, zip_code):
 import hashlib
 import json
 import logging
+import threading
+import time
+
 import requests
+from cachetools import TTLCache
 from flask import current_app
+from requests.adapters import HTTPAdapter
+
+from helpers.api_urls import address_validation_url, google_maps_url
 
 class AddressError(Exception):   # keeps your ValidationError semantics
     pass
 
+_UNAVAILABLE_MSG = ("Our address verification service is temporarily unavailable "
+                    "— please contact us.")
+
+# Google's answer for an address is stable for far longer than a customer
+# spends fixing the rest of the form; cache it (not the verdict, which also
+# depends on the city/ZIP the user typed).
+_RESULT_TTL = 6 * 60 * 60
+_result_cache: TTLCache = TTLCache(maxsize=2048, ttl=_RESULT_TTL)
+_cache_lock = threading.Lock()
+
+# After a 5xx/429/timeout we stop calling Google for a short while and fail
+# fast instead of making every submit wait out the 3 s timeout again.
+_OUTAGE_TTL = 60
+_outage_until = 0.0
+
+_http = requests.Session()
+_http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+
+def _anonymise(text: str) -> str:
+    """8-char stable hash for traceability without leaking PII."""
+    return hashlib.sha256(text.encode()).hexdigest()[:8]
+
+
+def _cache_key(full_addr: str, place_id: str | None) -> tuple[str, str]:
+    # Full digest for the key: the 8-char log hash is too short to be unique.
+    return hashlib.sha256(full_addr.encode()).hexdigest(), place_id or ""
+
+
+def _mark_outage(req_id: str, reason) -> None:
+    global _outage_until
+    _outage_until = time.monotonic() + _OUTAGE_TTL
+    current_app.logger.warning("addr_api_fail[%s]: %s – failing fast for %ss",
+                               req_id, reason, _OUTAGE_TTL)
+
+
+def _is_unavailable(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+def _fetch(full_addr: str, place_id: str | None, key: str, req_id: str) -> tuple[str, dict | list]:
+    """
+    Ask Google about *full_addr*. Returns ("place", address_components) from
+    Place Details or ("validation", result) from Address Validation.
+    Raises AddressError when the API is unavailable.
+    """
+    # ───────── 1) Place Details — only if a place_id was provided ─────
+    if place_id:
+        try:
+            resp = _http.get(
+                google_maps_url("/maps/api/place/details/json"),
+                params={
+                    "place_id": place_id,
+                    "fields": "address_components",
+                    "key": key,
+                },
+                timeout=3,
+            )
+            if resp.ok and resp.json().get("status") == "OK":
+                return "place", resp.json()["result"]["address_components"]
+        except requests.RequestException:
+            pass
+        # otherwise fall through
+
+    # ───────── 2) Address Validation fallback ─────────────────────────
+    payload = {
+        "address":         {"regionCode": "US", "addressLines": [full_addr]},
+        "enableUspsCass":  True,
+    }
+    try:
+        resp = _http.post(
+            address_validation_url("/v1:validateAddress"),
+            params={"key": key},
+            json=payload,
+            timeout=3,
+        )
+    except requests.RequestException as e:
+        _mark_outage(req_id, type(e).__name__)
+        raise AddressError(_UNAVAILABLE_MSG) from e
+
+    if not resp.ok:
+        # API unavailable: do NOT attempt to judge the address
+        if _is_unavailable(resp.status_code):
+            _mark_outage(req_id, f"HTTP {resp.status_code}")
+        else:
+            current_app.logger.warning("addr_api_fail[%s]: HTTP %s", req_id, resp.status_code)
+        raise AddressError(_UNAVAILABLE_MSG)
+
+    return "validation", resp.json().get("result", {})
+
+
 def verifyAddress(full_addr: str,
                    place_id: str | None,
                    user_city: str,
@@ -38,14 +136,12 @@ def verifyAddress(full_addr: str,
     Returns (is_valid, message).
     • Never logs PII (full address, city, ZIP).
     • Surfaces a clear message when the Address Validation API is unavailable.
+    • Reuses Google's answer for the same address/place_id for _RESULT_TTL and
+      fails fast for _OUTAGE_TTL after the API reports it is unavailable.
     """
     log = current_app.logger
     key = current_app.config["GOOGLE_BACKEND_API_KEY"]
 
-    def _anonymise(text: str) -> str:
-        """8-char stable hash for traceability without leaking PII."""
-        return hashlib.sha256(text.encode()).hexdigest()[:8]
-
     req_id = _anonymise(full_addr)
     log.info("verify_address[%s]: place=%s", req_id, bool(place_id))
 
@@ -71,45 +167,27 @@ def verifyAddress(full_addr: str,
             msg.append("ZIP")
         return False, f"The {', '.join(msg)} doesn’t match Google’s data."
 
-    # ───────── 1) Place Details — only if a place_id was provided ─────
-    if place_id:
-        resp = requests.get(
-            "https://maps.googleapis.com/maps/api/place/details/json",
-            params={
-                "place_id": place_id,
-                "fields": "address_components",
-                "key": key,
-            },
-            timeout=3,
-        )
-        if resp.ok and resp.json().get("status") == "OK":
-            ok, msg = _match(resp.json()["result"]["address_components"])
-            log.info("place_vrdct[%s]: %s", req_id, ok)
-            return ok, msg
-        # otherwise fall through
-
-    # ───────── 2) Address Validation fallback ─────────────────────────
-    payload = {
-        "address":         {"regionCode": "US", "addressLines": [full_addr]},
-        "enableUspsCass":  True,
-    }
-    resp = requests.post(
-        "https://addressvalidation.googleapis.com/v1:validateAddress",
-        params={"key": key},
-        json=payload,
-        timeout=3,
-    )
-
-    if not resp.ok:
-        # API unavailable: do NOT attempt to judge the address
-        log.warning("addr_api_fail[%s]: HTTP %s", req_id, resp.status_code)
-        raise AddressError(
-            "Our address verification service is temporarily unavailable "
-            "— please contact us."
-        )
-
-    rj       = resp.json()
-    result   = rj.get("result", {})
+    cache_key = _cache_key(full_addr, place_id)
+    with _cache_lock:
+        cached = _result_cache.get(cache_key)
+
+    if cached is None:
+        if time.monotonic() < _outage_until:
+            log.info("addr_api_skip[%s]: recent outage", req_id)
+            raise AddressError(_UNAVAILABLE_MSG)
+        cached = _fetch(full_addr, place_id, key, req_id)
+        with _cache_lock:
+            _result_cache[cache_key] = cached
+    else:
+        log.info("addr_cache_hit[%s]", req_id)
+
+    source, data = cached
+    if source == "place":
+        ok, msg = _match(data)
+        log.info("place_vrdct[%s]: %s", req_id, ok)
+        return ok, msg
+
+    result   = data
     verdict  = result.get("verdict", {})
 
     # Required high-confidence flags
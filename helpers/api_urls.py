@@ -0,0 +1,33 @@
+"""Base URLs of the Mapbox and Google Maps APIs, overridable per environment.
+
+    MAPBOX_API_URL                 default https://api.mapbox.com
+    GOOGLE_MAPS_API_URL            default https://maps.googleapis.com
+    GOOGLE_ADDRESS_VALIDATION_URL  default https://addressvalidation.googleapis.com
+
+Read on every call, not at import, so tests and benchmarks can point a running
+process at ``helpers.geo_standin`` by setting the env vars.
+"""
+import os
+
+_DEFAULTS = {
+    "MAPBOX_API_URL": "https://api.mapbox.com",
+    "GOOGLE_MAPS_API_URL": "https://maps.googleapis.com",
+    "GOOGLE_ADDRESS_VALIDATION_URL": "https://addressvalidation.googleapis.com",
+}
+
+
+def _base(name: str) -> str:
+    return (os.getenv(name) or _DEFAULTS[name]).rstrip("/")
+
+
+def mapbox_url(path: str) -> str:
+    """``mapbox_url("/directions/v5")`` -> ``https://api.mapbox.com/directions/v5``."""
+    return _base("MAPBOX_API_URL") + path
+
+
+def google_maps_url(path: str) -> str:
+    return _base("GOOGLE_MAPS_API_URL") + path
+
+
+def address_validation_url(path: str) -> str:
+    return _base("GOOGLE_ADDRESS_VALIDATION_URL") + path
@@ -0,0 +1,224 @@
+"""Fingerprinted, minified, precompressed CSS/JS.
+
+Build step – run by ``bin/post_compile`` on every deploy, and needing
+neither the app nor its settings::
+
+    python -m helpers.assets build        # or `flask assets build`
+
+Every bundle in :data:`BUNDLES` – and every other ``.css``/``.js`` file under
+``static/css`` and ``static/js``, as a bundle of one – is concatenated,
+minified (rcssmin/rjsmin), written to ``static/dist/`` as
+``<name>.<hash>.<ext>`` with ``.gz`` and ``.br`` siblings, and recorded in
+``static/dist/manifest.json``.
+
+Templates ask for ``{{ asset_url('request.css') }}`` or
+``{{ asset_url('js/landing.js') }}``. Once built that is the hashed file,
+served by the ``assets`` route with whichever precompressed sibling the
+client accepts and a one-year immutable ``Cache-Control``. Unbuilt (local
+development) the same URL serves the unminified sources concatenated on the
+fly, uncached – so templates don't care whether the build ran. Outside debug
+mode a missing manifest is logged at startup: that fallback is slow.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+
+import click
+from flask import Response, abort, request, send_from_directory, url_for
+
+from helpers.lazy import lazy_import
+
+brotli = lazy_import("brotli")
+rcssmin = lazy_import("rcssmin")
+rjsmin = lazy_import("rjsmin")
+
+ROOT = Path(__file__).resolve().parent.parent
+STATIC_DIR = ROOT / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST = DIST_DIR / "manifest.json"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+#: Multi-file bundles, in load order. Any single file under static/css or
+#: static/js can also be requested by its path (e.g. "js/landing.js").
+BUNDLES: dict[str, list[str]] = {
+    "site.js": ["js/navbar.js", "js/site.js"],
+    "admin.js": ["js/navbar.js", "js/admin/site.js"],
+    "admin.css": ["css/adminBase_styles.css", "css/admin_styles.css"],
+    "request.css": ["css/request_styles.css", "css/landing_styles.css"],
+    "edit_request.css": ["css/editRequest_styles.css", "css/landing_styles.css"],
+    "contact.css": ["css/landing_styles.css", "css/contact_styles.css"],
+    "confirmation.css": ["css/landing_styles.css", "css/confirmation_styles.css"],
+    "error.css": ["css/landing_styles.css", "css/error_styles.css"],
+    "mopf.css": ["css/mopf.css", "css/styles.css"],
+}
+
+_MIMETYPES = {".css": "text/css", ".js": "text/javascript"}
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)(?!data:|https?:|/|#)([^'")]+)\1\s*\)""")
+_CSS_IMPORT = re.compile(r"@import\s+[^;]+;")
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Bundling
+# ──────────────────────────────────────────────────────────────────────────
+def _sources(name: str) -> list[str]:
+    if name in BUNDLES:
+        return BUNDLES[name]
+    path = (STATIC_DIR / name).resolve()
+    if (name.startswith(("css/", "js/")) and path.suffix in _MIMETYPES
+            and path.is_relative_to(STATIC_DIR) and path.is_file()):
+        return [name]
+    raise KeyError(name)
+
+
+def _absolutize_css_urls(css: str, source: str) -> str:
+    """Relative url()s resolve against the *served* path, so pin them to /static."""
+    base = Path(source).parent
+
+    def fix(m):
+        target = os.path.normpath(base / m.group(2)).replace(os.sep, "/")
+        return f"url({m.group(1)}/static/{target}{m.group(1)})"
+    return _CSS_URL.sub(fix, css)
+
+
+def concat(name: str) -> str:
+    """Unminified bundle text: sources in order, @imports hoisted (CSS)."""
+    parts = [(STATIC_DIR / src).read_text(encoding="utf-8") for src in _sources(name)]
+    if name.endswith(".css"):
+        parts = [_absolutize_css_urls(css, src) for css, src in zip(parts, _sources(name))]
+        text = "\n".join(parts)
+        imports = _CSS_IMPORT.findall(text)    # must precede every other rule
+        return "\n".join(dict.fromkeys(imports)) + "\n" + _CSS_IMPORT.sub("", text)
+    return "\n;\n".join(parts)
+
+
+def minify(name: str, text: str) -> str:
+    return rcssmin.cssmin(text) if name.endswith(".css") else rjsmin.jsmin(text)
+
+
+def all_bundle_names() -> list[str]:
+    singles = [
+        p.relative_to(STATIC_DIR).as_posix()
+        for folder in ("css", "js")
+        for p in sorted((STATIC_DIR / folder).rglob("*"))
+        if p.suffix in _MIMETYPES
+    ]
+    return [*BUNDLES, *singles]
+
+
+def _hashed_name(name: str, data: bytes) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+def build(log=print) -> dict:
+    """Write every bundle + .gz/.br to static/dist; returns the manifest."""
+    DIST_DIR.mkdir(exist_ok=True)
+    manifest = {}
+    for name in all_bundle_names():
+        data = minify(name, concat(name)).encode("utf-8")
+        out = DIST_DIR / _hashed_name(name, data)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        if not out.exists():                   # content-addressed: same name, same bytes
+            out.write_bytes(data)
+            out.with_name(out.name + ".gz").write_bytes(gzip.compress(data, 9, mtime=0))
+            out.with_name(out.name + ".br").write_bytes(brotli.compress(data, quality=11))
+            log(f"{name} -> {out.relative_to(DIST_DIR)} ({len(data) / 1024:.1f} KiB)")
+        manifest[name] = out.relative_to(DIST_DIR).as_posix()
+
+    keep = set(manifest.values())
+    for path in DIST_DIR.rglob("*"):
+        rel = path.relative_to(DIST_DIR).as_posix()
+        if path.is_file() and path != MANIFEST and rel.removesuffix(".gz").removesuffix(".br") not in keep:
+            path.unlink()
+
+    tmp = MANIFEST.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(tmp, MANIFEST)
+    _manifest_cache.clear()
+    return manifest
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Manifest, template helper and serving
+# ──────────────────────────────────────────────────────────────────────────
+_manifest_cache: dict = {}
+_manifest_lock = threading.Lock()
+
+
+def load_manifest() -> dict:
+    if "data" not in _manifest_cache:
+        try:
+            data = json.loads(MANIFEST.read_text())
+        except (OSError, ValueError):
+            data = {}
+        with _manifest_lock:
+            _manifest_cache["data"] = data
+    return _manifest_cache["data"]
+
+
+def asset_url(name: str, **kwargs) -> str:
+    """URL of bundle *name*: the fingerprinted build if present, else the live bundle."""
+    return url_for("assets", filename=load_manifest().get(name, name), **kwargs)
+
+
+def _precompressed(filename: str) -> tuple[str, str | None]:
+    """Pick the best sibling of *filename* that exists and the client accepts."""
+    accepted = request.accept_encodings
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if accepted[encoding] and (DIST_DIR / (filename + suffix)).is_file():
+            return filename + suffix, encoding
+    return filename, None
+
+
+def serve_asset(filename: str):
+    if filename in load_manifest().values():
+        chosen, encoding = _precompressed(filename)
+        resp = send_from_directory(DIST_DIR, chosen, mimetype=_MIMETYPES[Path(filename).suffix],
+                                   max_age=IMMUTABLE_MAX_AGE)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+        resp.vary.add("Accept-Encoding")
+        resp.cache_control.public = True
+        resp.cache_control.immutable = True
+        return resp
+
+    try:                                        # not built: live, uncached
+        text = concat(filename)
+    except KeyError:
+        abort(404)
+    resp = Response(text, mimetype=_MIMETYPES[Path(filename).suffix])
+    resp.cache_control.no_cache = True
+    return resp
+
+
+@click.group("assets")
+def assets_cli():
+    """Build fingerprinted CSS/JS bundles."""
+
+
+@assets_cli.command("build")
+def build_command():
+    """Minify, fingerprint and precompress static/css + static/js into static/dist."""
+    manifest = build(log=click.echo)
+    click.echo(f"{len(manifest)} bundles in {DIST_DIR.relative_to(ROOT)}")
+
+
+def register(app):
+    """CLI command, ``asset_url()`` template global and the /assets route."""
+    app.cli.add_command(assets_cli)
+    app.add_template_global(asset_url)
+    app.add_url_rule("/assets/<path:filename>", "assets", serve_asset)
+    if not app.debug and not app.testing and not MANIFEST.is_file():
+        app.logger.warning("assets: %s missing – serving unminified, uncached bundles; "
+                           "run `python -m helpers.assets build` at build time",
+                           MANIFEST)
+
+
+if __name__ == "__main__":
+    assets_cli(prog_name="python -m helpers.assets")
@@ -1,36 +1,72 @@
 # auth.py  (keep it in its own module)
-import time, requests
+"""
+Cognito ID-token verification for the admin pages.
+
+* Keys: the user pool's JWKS is held as a ``kid → key`` dict and refreshed by
+  a background thread before it goes stale, so no admin request waits on the
+  HTTP fetch. A token signed with an unknown ``kid`` (key rotation) triggers
+  at most one synchronous refresh per ``_UNKNOWN_KID_COOLDOWN``.
+* Claims: :func:`session_claims` remembers the verified claims in the
+  (server-side) session under the token's SHA-256 until the token's ``exp``,
+  so repeat requests with the same token skip RSA verification entirely.
+"""
+import hashlib
+import threading
+import time
+
+import requests
 from authlib.jose import jwt, JsonWebKey
 from authlib.jose.errors import JoseError
 from flask import current_app
 
-_JWKS: JsonWebKey = None
-_JWKS_TS = 0          # unix epoch of last fetch
-_CACHE_TTL = 60 * 60  # refresh keys every hour
-
-def _get_jwks() -> JsonWebKey:
-    global _JWKS, _JWKS_TS
-    if _JWKS is None or time.time() - _JWKS_TS > _CACHE_TTL:
-        issuer = (
-            f"https://cognito-idp.{current_app.config['COGNITO_REGION']}"
-            f".amazonaws.com/{current_app.config['COGNITO_USER_POOL_ID']}"
-        )
-        jwks_uri = f"{issuer}/.well-known/jwks.json"
-        _JWKS = JsonWebKey.import_key_set(requests.get(jwks_uri, timeout=5).json())
+_CACHE_TTL = 60 * 60            # keys are considered fresh for an hour
+_REFRESH_EVERY = 45 * 60        # background refresh interval (< _CACHE_TTL)
+_UNKNOWN_KID_COOLDOWN = 60      # min seconds between kid-miss refreshes
+
+_KEYS: dict[str, object] = {}   # kid -> authlib key
+_JWKS_TS = 0.0                  # unix epoch of last successful fetch
+_jwks_lock = threading.Lock()
+_SESSION_KEY = "auth_claims"
+
+
+def _issuer(config) -> str:
+    return (
+        f"https://cognito-idp.{config['COGNITO_REGION']}"
+        f".amazonaws.com/{config['COGNITO_USER_POOL_ID']}"
+    )
+
+
+def refresh_jwks(config=None) -> None:
+    """Fetch the pool's JWKS and swap in a fresh kid → key index."""
+    global _KEYS, _JWKS_TS
+    config = config or current_app.config
+    jwks_uri = f"{_issuer(config)}/.well-known/jwks.json"
+    key_set = JsonWebKey.import_key_set(requests.get(jwks_uri, timeout=5).json())
+    keys = {k.kid: k for k in key_set.keys}
+    with _jwks_lock:
+        _KEYS = keys
         _JWKS_TS = time.time()
-    return _JWKS
+
+
+def _get_key(kid: str | None):
+    """Key for *kid*, refreshing synchronously only if we have none/stale/miss."""
+    now = time.time()
+    stale = not _KEYS or now - _JWKS_TS > _CACHE_TTL
+    missing = kid not in _KEYS and now - _JWKS_TS > _UNKNOWN_KID_COOLDOWN
+    if stale or missing:
+        refresh_jwks()
+    try:
+        return _KEYS[kid]
+    except KeyError:
+        raise JoseError(f"unknown signing key {kid!r}") from None
 
 
 def verify_cognito_jwt(token: str) -> dict:
     """Return the decoded claims *only* if the token is still valid."""
-    jwks = _get_jwks()
-    claims = jwt.decode(token, jwks)          # signature + alg/kid check
+    claims = jwt.decode(token, lambda header, payload: _get_key(header.get("kid")))
     # Verify standard claims (exp / iat / nbf) and custom ones we care about
     claims.validate()                         # checks exp / iat / nbf
-    expected_iss = (
-        f"https://cognito-idp.{current_app.config['COGNITO_REGION']}"
-        f".amazonaws.com/{current_app.config['COGNITO_USER_POOL_ID']}"
-    )
+    expected_iss = _issuer(current_app.config)
     if claims["iss"] != expected_iss:
         raise JoseError("bad issuer")
     if claims["aud"] != current_app.config["COGNITO_CLIENT_ID"]:
@@ -38,3 +74,63 @@ def verify_cognito_jwt(token: str) -> dict:
     if claims["token_use"] != "id":
         raise JoseError("not an ID-token")
     return claims
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def remember_claims(session, token: str, claims: dict) -> dict:
+    """Store the bits of *claims* the app uses, bound to *token*, until exp."""
+    cached = {
+        "h": _token_hash(token),
+        "exp": int(claims["exp"]),
+        "sub": claims["sub"],
+        "email": claims.get("email"),
+        "cognito:groups": list(claims.get("cognito:groups", [])),
+    }
+    session[_SESSION_KEY] = cached
+    return cached
+
+
+def session_claims(session, token: str) -> dict:
+    """
+    Verified claims for *token*: from the session if this exact token was
+    verified before and hasn't expired, otherwise via verify_cognito_jwt().
+    Raises JoseError like verify_cognito_jwt().
+    """
+    cached = session.get(_SESSION_KEY)
+    if cached and cached.get("h") == _token_hash(token) and time.time() < cached.get("exp", 0):
+        return cached
+    return remember_claims(session, token, verify_cognito_jwt(token))
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Background JWKS refresh
+# ──────────────────────────────────────────────────────────────────────────
+_stop_event = threading.Event()
+_threads = []
+
+
+def _refresh_loop(app) -> None:
+    while not _stop_event.is_set():
+        try:
+            refresh_jwks(app.config)
+        except Exception as e:               # keep the old keys; retry sooner
+            app.logger.warning("JWKS refresh failed: %s", e)
+            _stop_event.wait(60)
+            continue
+        _stop_event.wait(_REFRESH_EVERY)
+
+
+def start_jwks_refresher(app) -> None:
+    if _threads:
+        return  # already started
+
+    t = threading.Thread(target=_refresh_loop, args=(app,), daemon=True)
+    _threads.append(t)
+    t.start()
+
+
+def stop_jwks_refresher():
+    _stop_event.set()
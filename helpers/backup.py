@@ -1,34 +1,61 @@
 # gcs_db_backup.py
-"""Backup the PickupRequest table to Google Cloud Storage as a CSV.
+"""Back up every database table to Google Cloud Storage (or a local folder).
 
-* Creates a Flask app and pushes an application context **before** accessing the DB
-  or the app logger.
-* Works both locally (`python gcs_db_backup.py`) and in a Render Cron Job.
-* Logs to **STDOUT** (Render captures it) *and* to an optional `backup.log`
-  file beside the script—handy when you run it ad‑hoc on a dev machine.
+* Each table is streamed to its own compressed CSV object (gzip by default,
+  zstd when the optional ``zstandard`` package is installed); tables are
+  written in parallel, one DB connection per worker thread.
+* Every run writes a ``manifest.json`` with row counts, byte sizes and SHA-256
+  checksums of each object, plus the watermark reached per table.
+* ``--incremental`` runs dump, per table:
+
+  - tables with an ``updated_at`` watermark: rows changed since the previous
+    run, plus the primary keys still present, so edits *and* deletes replay;
+  - append-only tables: rows past the previous run's highest primary key;
+  - everything else (small tables edited in place): a full copy.
+
+  A full snapshot is taken automatically when there is nothing to build on,
+  or once the chain reaches ``--full-every`` incrementals.
+* ``restore`` replays a full snapshot plus every incremental after it,
+  verifying checksums before anything touches the DB. Rows a table's
+  ``_ROW_FILTERS`` keeps out of the dump (backfilled pickups) are left as
+  they are.
+* Works both locally and in a Render Cron Job. Logs to **STDOUT** (Render
+  captures it) *and* to an optional `backup.log` file beside the script.
+
+Usage::
+
+    python -m helpers.backup dump [--incremental] [--store gs://bucket | /some/dir]
+    python -m helpers.backup restore [--manifest 20250101_020000] [--store …]
 
 Environment variables
 ---------------------
 GOOGLE_APPLICATION_CREDENTIALS   → service‑account JSON path
 GCS_BUCKET                       → bucket name (defaults to ekolinq_backup)
 GCS_KMS_KEY                      → *(optional)* CMEK key
+BACKUP_STORE                     → *(optional)* overrides the store, e.g. a local path
 LOG_TO_FILE                      → if set to 1, also write `backup.log`
 """
 
 from __future__ import annotations
 
+import argparse
 import csv
 import datetime as _dt
+import gzip
+import hashlib
+import io
+import json
 import logging
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterable
 
-from google.cloud import storage
-from sqlalchemy import or_
+from sqlalchemy import Table, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.engine import Engine
 
-from app import create_app          # Flask app factory
-from models import db, PickupRequest
+from models import db
 
 # ─── Logging setup ───────────────────────────────────────────────────────────
 
@@ -49,8 +76,91 @@ logger = logging.getLogger(LOGGER_NAME)
 
 SKIP_NOTE = "Imported via import-backfill CLI"
 DEFAULT_BUCKET = "ekolinq_backup"
-DUMP_PREFIX = "pickup_requests_"
+DUMP_PREFIX = "backups/"
+LATEST_POINTER = f"{DUMP_PREFIX}LATEST"
 BATCH_SIZE = 500
+MAX_WORKERS = 4
+FULL_EVERY = 7            # incrementals allowed before forcing a new full snapshot
+NULL = r"\N"              # CSV marker for SQL NULL (same as Postgres COPY)
+
+#: Tables whose writers all go through the ORM, so this column moves on every
+#: change (``onupdate``); incrementals dump rows past it and list live keys.
+_UPDATED_AT_COLUMNS = {
+    "pickup_requests": "updated_at",
+    "donation_records": "updated_at",
+    "driver_location": "updated_at",
+}
+
+#: Tables the app only ever inserts into; incrementals dump rows past the last PK.
+_APPEND_ONLY = {"contact_form_entries", "site_rating"}
+
+#: Re-read this much before an ``updated_at`` watermark, for rows committed late
+#: with an earlier timestamp (re-applying a row is harmless).
+_WATERMARK_OVERLAP = _dt.timedelta(minutes=10)
+
+#: Per-table row filters (backfilled pickups are re-importable, never backed up).
+_ROW_FILTERS = {
+    "pickup_requests": lambda t: or_(t.c.admin_notes.is_(None), t.c.admin_notes != SKIP_NOTE),
+}
+
+_EXTENSIONS = {"gzip": ".csv.gz", "zstd": ".csv.zst"}
+
+# ─── Stores ──────────────────────────────────────────────────────────────────
+
+class LocalStore:
+    """Directory-backed stand-in for a GCS bucket (tests, ad-hoc dev runs)."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.url = str(self.root)
+
+    def _path(self, name: str) -> Path:
+        return self.root / name
+
+    def open_write(self, name: str) -> BinaryIO:
+        path = self._path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, "wb")
+
+    def open_read(self, name: str) -> BinaryIO:
+        return open(self._path(name), "rb")
+
+    def exists(self, name: str) -> bool:
+        return self._path(name).exists()
+
+
+class GCSStore:
+    """Objects in a GCS bucket, written through resumable uploads."""
+
+    def __init__(self, bucket_name: str):
+        from google.cloud import storage   # heavy import; only needed here
+
+        self.bucket = storage.Client().bucket(bucket_name)
+        self.url = f"gs://{bucket_name}"
+
+    def _blob(self, name: str):
+        blob = self.bucket.blob(name)
+        if kms_key := os.getenv("GCS_KMS_KEY"):
+            blob.kms_key_name = kms_key
+            logger.debug("Using CMEK key: %s", kms_key)
+        return blob
+
+    def open_write(self, name: str) -> BinaryIO:
+        return self._blob(name).open("wb")
+
+    def open_read(self, name: str) -> BinaryIO:
+        return self.bucket.blob(name).open("rb")
+
+    def exists(self, name: str) -> bool:
+        return self.bucket.blob(name).exists()
+
+
+def open_store(spec: str | None = None) -> LocalStore | GCSStore:
+    """``gs://bucket`` → :class:`GCSStore`; anything else is a local directory."""
+    spec = spec or os.getenv("BACKUP_STORE") or f"gs://{os.getenv('GCS_BUCKET', DEFAULT_BUCKET)}"
+    if spec.startswith("gs://"):
+        return GCSStore(spec[len("gs://"):].strip("/"))
+    return LocalStore(spec.removeprefix("file://"))
 
 # ─── Helpers ────────────────────────────────────────────────────────────────
 
@@ -58,61 +168,437 @@ def _timestamp() -> str:
     return _dt.datetime.now().strftime("%Y%m%d_%H%M%S")
 
 
-def _open_blob(bucket: storage.Bucket, object_name: str) -> storage.Blob:
-    blob = bucket.blob(object_name)
-    if kms_key := os.getenv("GCS_KMS_KEY"):
-        blob.kms_key_name = kms_key
-        logger.debug("Using CMEK key: %s", kms_key)
-    return blob
+class _HashingWriter(io.RawIOBase):
+    """Pass-through binary writer that tracks SHA-256 and size of what it saw."""
 
+    def __init__(self, raw: BinaryIO):
+        self.raw = raw
+        self.sha256 = hashlib.sha256()
+        self.size = 0
 
-# ─── Main routine ────────────────────────────────────────────────────────────
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.sha256.update(b)
+        self.size += len(b)
+        self.raw.write(b)
+        return len(b)
+
+
+def _compress_writer(fp: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=fp, mode="wb", mtime=0)
+    if codec == "zstd":
+        import zstandard   # optional dependency
+        return zstandard.ZstdCompressor().stream_writer(fp, closefd=False)
+    raise ValueError(f"Unknown codec {codec!r}")
+
+
+def _decompress_reader(fp: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=fp, mode="rb")
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(fp)
+    raise ValueError(f"Unknown codec {codec!r}")
+
+
+def _encode(value: Any) -> str:
+    if value is None:
+        return NULL
+    if isinstance(value, (_dt.datetime, _dt.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _decode(raw: str, column) -> Any:
+    if raw == NULL:
+        return None
+    try:
+        py_type = column.type.python_type
+    except NotImplementedError:
+        return raw
+    if py_type is bool:
+        return raw in ("True", "true", "1")
+    if py_type is int:
+        return int(raw)
+    if py_type is float:
+        return float(raw)
+    if py_type is _dt.datetime:
+        return _dt.datetime.fromisoformat(raw)
+    if py_type is _dt.date:
+        return _dt.date.fromisoformat(raw)
+    return raw
+
+
+def _watermark_column(table: Table):
+    """Column incrementals resume from, or None if the table is always copied whole."""
+    col_name = _UPDATED_AT_COLUMNS.get(table.name)
+    if col_name is not None:
+        return table.c[col_name]
+    if table.name in _APPEND_ONLY:
+        return list(table.primary_key.columns)[0]
+    return None
+
+
+def _in_scope(stmt, table: Table):
+    """Limit *stmt* to the rows backups cover (see ``_ROW_FILTERS``)."""
+    if table.name in _ROW_FILTERS:
+        stmt = stmt.where(_ROW_FILTERS[table.name](table))
+    return stmt
+
+
+def _read_manifest(store, backup_id: str) -> dict:
+    with store.open_read(f"{DUMP_PREFIX}{backup_id}/manifest.json") as fp:
+        return json.loads(fp.read().decode("utf-8"))
+
+
+def _latest_id(store) -> str | None:
+    if not store.exists(LATEST_POINTER):
+        return None
+    with store.open_read(LATEST_POINTER) as fp:
+        return fp.read().decode("utf-8").strip() or None
+
+# ─── Dump ────────────────────────────────────────────────────────────────────
+
+def _dump_table(
+    engine: Engine,
+    table: Table,
+    store,
+    object_name: str,
+    codec: str,
+    since: Any = None,
+) -> dict:
+    """Stream one table into *object_name*; return its manifest entry.
+
+    With *since* only rows past that watermark are written (``"delta"``);
+    otherwise the whole table (``"snapshot"``).
+    """
+    wm_col = _watermark_column(table)
+    pk = list(table.primary_key.columns)[0]
+    stmt = _in_scope(select(table).order_by(*table.primary_key.columns), table)
+    if since is not None:
+        start = _decode(since, wm_col)
+        if isinstance(start, _dt.datetime):
+            start -= _WATERMARK_OVERLAP
+        stmt = stmt.where(wm_col > start)
+
+    columns = [c.name for c in table.columns]
+    wm_idx = columns.index(wm_col.name) if wm_col is not None else None
+    row_count = 0
+    max_value = None
+    live_ids = None
+
+    with engine.connect() as conn, store.open_write(object_name) as raw:
+        hashed = _HashingWriter(raw)
+        with _compress_writer(hashed, codec) as zfp:
+            text = io.TextIOWrapper(zfp, encoding="utf-8", newline="")
+            writer = csv.writer(text)
+            writer.writerow(columns)
+
+            result = conn.execution_options(stream_results=True, yield_per=BATCH_SIZE).execute(stmt)
+            for row in result:
+                writer.writerow([_encode(v) for v in row])
+                row_count += 1
+                value = row[wm_idx] if wm_idx is not None else None
+                if value is not None and (max_value is None or value > max_value):
+                    max_value = value
+            text.flush()
+            text.detach()
+
+        if since is not None and table.name in _UPDATED_AT_COLUMNS:
+            live_ids = list(conn.execute(_in_scope(select(pk).order_by(pk), table)).scalars())
+
+    entry = {
+        "object": object_name,
+        "mode": "delta" if since is not None else "snapshot",
+        "rows": row_count,
+        "bytes": hashed.size,
+        "sha256": hashed.sha256.hexdigest(),
+        "watermark": None,
+    }
+    if wm_col is not None:
+        value = _encode(max_value) if max_value is not None else since
+        entry["watermark"] = {"column": wm_col.name, "value": value}
+    if live_ids is not None:
+        entry["ids"] = live_ids
+    return entry
+
+
+def run_backup(
+    store,
+    *,
+    incremental: bool = False,
+    codec: str = "gzip",
+    full_every: int = FULL_EVERY,
+    max_workers: int = MAX_WORKERS,
+) -> dict:
+    """Dump every table to *store*; return (and persist) the manifest.
 
-def dump_to_gcs() -> None:
-    """Push the PickupRequest table into GCS as a CSV."""
+    Must run inside an application context (uses ``db.engine``/``db.metadata``).
+    """
+    if codec not in _EXTENSIONS:
+        raise ValueError(f"Unknown codec {codec!r}; expected one of {sorted(_EXTENSIONS)}")
 
-    bucket_name = os.getenv("GCS_BUCKET", DEFAULT_BUCKET)
-    object_name = f"{DUMP_PREFIX}{_timestamp()}.csv"
+    parent = None
+    if incremental and (latest := _latest_id(store)):
+        parent = _read_manifest(store, latest)
+        if parent.get("chain_length", 0) >= full_every:
+            logger.info("Chain reached %d incrementals; taking a full snapshot.", full_every)
+            parent = None
 
-    logger.info("Starting backup → gs://%s/%s", bucket_name, object_name)
+    backup_id = _timestamp()
+    kind = "incremental" if parent else "full"
+    prefix = f"{DUMP_PREFIX}{backup_id}/"
+    logger.info("Starting %s backup → %s/%s", kind, store.url, prefix)
+
+    engine = db.engine
+    tables = list(db.metadata.sorted_tables)
+
+    def _job(table: Table) -> tuple[str, dict]:
+        since = None
+        wm_col = _watermark_column(table)
+        previous = (parent["tables"].get(table.name) or {}).get("watermark") if parent else None
+        if wm_col is not None and previous and previous["column"] == wm_col.name:
+            since = previous["value"]
+        entry = _dump_table(
+            engine, table, store, f"{prefix}{table.name}{_EXTENSIONS[codec]}", codec, since
+        )
+        logger.info("  %s: %d row(s), %d bytes", table.name, entry["rows"], entry["bytes"])
+        return table.name, entry
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        entries = dict(pool.map(_job, tables))
+
+    manifest = {
+        "id": backup_id,
+        "kind": kind,
+        "codec": codec,
+        "parent": parent["id"] if parent else None,
+        "base": (parent.get("base") or parent["id"]) if parent else None,
+        "chain_length": (parent.get("chain_length", 0) + 1) if parent else 0,
+        "created_at": _dt.datetime.now().isoformat(timespec="seconds"),
+        "tables": entries,
+    }
+    with store.open_write(f"{prefix}manifest.json") as fp:
+        fp.write(json.dumps(manifest, indent=2).encode("utf-8"))
+    with store.open_write(LATEST_POINTER) as fp:
+        fp.write(backup_id.encode("utf-8"))
+
+    logger.info(
+        "Backup complete: %s/%s (%s, rows=%d)",
+        store.url, prefix, kind, sum(e["rows"] for e in entries.values()),
+    )
+    return manifest
+
+# ─── Restore ─────────────────────────────────────────────────────────────────
+
+def _chain(store, backup_id: str) -> list[dict]:
+    """Manifests from the base full snapshot up to *backup_id*, oldest first."""
+    chain = [_read_manifest(store, backup_id)]
+    while chain[-1]["parent"]:
+        chain.append(_read_manifest(store, chain[-1]["parent"]))
+    chain.reverse()
+    if chain[0]["kind"] != "full":
+        raise RuntimeError(f"Backup chain for {backup_id} does not start with a full snapshot")
+    return chain
+
+
+def _verify(store, manifest: dict) -> None:
+    for name, entry in manifest["tables"].items():
+        digest = hashlib.sha256()
+        with store.open_read(entry["object"]) as fp:
+            shutil.copyfileobj(fp, _DigestSink(digest))
+        if digest.hexdigest() != entry["sha256"]:
+            raise RuntimeError(f"Checksum mismatch for {entry['object']} ({name})")
+
+
+class _DigestSink:
+    def __init__(self, digest):
+        self.digest = digest
+
+    def write(self, b) -> int:
+        self.digest.update(b)
+        return len(b)
+
+
+def _read_rows(store, entry: dict, codec: str) -> Iterable[list[str]]:
+    with store.open_read(entry["object"]) as raw, _decompress_reader(raw, codec) as zfp:
+        reader = csv.reader(io.TextIOWrapper(zfp, encoding="utf-8", newline=""))
+        yield from reader
+
+
+def run_restore(store, backup_id: str | None = None) -> list[str]:
+    """Restore the chain ending at *backup_id* (default: latest) into ``db``.
+
+    Snapshot entries replace a table's contents; delta entries upsert by
+    primary key, then delete rows missing from their list of live keys. Only
+    rows within ``_ROW_FILTERS`` are replaced or deleted. Everything happens
+    in one transaction. Returns the ids applied.
+    """
+    backup_id = backup_id or _latest_id(store)
+    if not backup_id:
+        raise RuntimeError(f"No backups found in {store.url}")
+
+    chain = _chain(store, backup_id)
+    for manifest in chain:
+        _verify(store, manifest)
+
+    tables = {t.name: t for t in db.metadata.sorted_tables}
+    with db.engine.begin() as conn:
+        for manifest in chain:
+            logger.info("Applying %s backup %s", manifest["kind"], manifest["id"])
+            entries = manifest["tables"]
+
+            # Children first, so FKs hold while snapshot tables are emptied
+            for table in reversed(db.metadata.sorted_tables):
+                entry = entries.get(table.name)
+                if entry is not None and _entry_mode(manifest, entry) == "snapshot":
+                    conn.execute(_in_scope(delete(table), table))
+
+            for name, table in tables.items():
+                entry = entries.get(name)
+                if entry is None or entry["rows"] == 0:
+                    continue
+                rows = _read_rows(store, entry, manifest["codec"])
+                header = next(rows)
+                cols = [table.c[h] for h in header]
+                pk = list(table.primary_key.columns)[0]
+                upsert = _entry_mode(manifest, entry) == "delta"
+
+                batch: list[dict] = []
+
+                def _flush() -> None:
+                    if upsert:
+                        _upsert(conn, table, pk, cols, batch)
+                    else:
+                        conn.execute(insert(table), batch)
+                    batch.clear()
+
+                for raw_row in rows:
+                    batch.append({c.name: _decode(v, c) for c, v in zip(cols, raw_row)})
+                    if len(batch) >= BATCH_SIZE:
+                        _flush()
+                if batch:
+                    _flush()
+                logger.info("  %s: %d row(s)", name, entry["rows"])
+
+            for table in reversed(db.metadata.sorted_tables):
+                entry = entries.get(table.name)
+                if entry is not None and "ids" in entry:
+                    _delete_missing(conn, table, entry["ids"])
+
+        _reset_sequences(conn, tables.values())
+
+    return [m["id"] for m in chain]
+
+
+def _entry_mode(manifest: dict, entry: dict) -> str:
+    """``"snapshot"`` or ``"delta"`` (manifests from before per-table modes follow their kind)."""
+    return entry.get("mode") or ("snapshot" if manifest["kind"] == "full" else "delta")
+
+
+def _delete_missing(conn, table: Table, live_ids: list) -> None:
+    """Delete in-scope rows whose primary key is not in *live_ids* (deleted since the last run)."""
+    pk = list(table.primary_key.columns)[0]
+    live = set(live_ids)
+    gone = [i for i in conn.execute(_in_scope(select(pk), table)).scalars() if i not in live]
+    for start in range(0, len(gone), BATCH_SIZE):
+        conn.execute(delete(table).where(pk.in_(gone[start:start + BATCH_SIZE])))
+    if gone:
+        logger.info("  %s: %d deleted row(s)", table.name, len(gone))
+
+
+def _upsert(conn, table: Table, pk, cols, batch: list[dict]) -> None:
+    """Update rows whose PK already exists, insert the rest (keeps FK children intact)."""
+    existing = set(conn.execute(select(pk).where(pk.in_([r[pk.name] for r in batch]))).scalars())
+    updates = [
+        {"b_pk": r[pk.name], **{f"b_{k}": v for k, v in r.items()}}
+        for r in batch if r[pk.name] in existing
+    ]
+    inserts = [r for r in batch if r[pk.name] not in existing]
+    if updates:
+        stmt = (
+            update(table)
+            .where(pk == bindparam("b_pk"))
+            .values({c.name: bindparam(f"b_{c.name}") for c in cols if c is not pk})
+        )
+        conn.execute(stmt, updates)
+    if inserts:
+        conn.execute(insert(table), inserts)
+
+
+def _reset_sequences(conn, tables: Iterable[Table]) -> None:
+    """After explicit-id inserts, move Postgres serial sequences past max(id)."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in tables:
+        pk = list(table.primary_key.columns)[0]
+        max_id = conn.execute(select(func.max(pk))).scalar()
+        if max_id is not None:
+            conn.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk.name}'), {int(max_id)})"
+            )
+
+# ─── Main routine ────────────────────────────────────────────────────────────
+
+def dump_to_gcs(
+    incremental: bool = False,
+    store_spec: str | None = None,
+    codec: str = "gzip",
+    full_every: int = FULL_EVERY,
+) -> None:
+    """Back up every table into the configured store (GCS by default)."""
+    from app import create_app          # Flask app factory
 
     app = create_app()
     with app.app_context():
         try:
-            client = storage.Client()
-            bucket = client.bucket(bucket_name)
-            blob = _open_blob(bucket, object_name)
-
-            columns = [c.name for c in PickupRequest.__table__.columns]
-            row_count = 0
-
-            with blob.open("w", newline="") as fp:
-                writer = csv.writer(fp)
-                writer.writerow(columns)
-
-                query = (
-                    PickupRequest.query
-                    .filter(
-                        or_(
-                            PickupRequest.admin_notes.is_(None),
-                            PickupRequest.admin_notes != SKIP_NOTE,
-                        )
-                    )
-                    .yield_per(BATCH_SIZE)
-                )
-
-                for row in query:
-                    writer.writerow([getattr(row, col) for col in columns])
-                    row_count += 1
-
-            db.session.commit()
-            logger.info(
-                "Backup complete: gs://%s/%s (rows=%d)", bucket_name, object_name, row_count
-            )
+            run_backup(open_store(store_spec), incremental=incremental, codec=codec,
+                       full_every=full_every)
         except Exception as exc:   # noqa: BLE001
             logger.exception("Backup FAILED: %s", exc)
             raise
 
 
+def restore_from_gcs(backup_id: str | None = None, store_spec: str | None = None) -> None:
+    """Restore a backup chain from the configured store into the app's DB."""
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        try:
+            applied = run_restore(open_store(store_spec), backup_id)
+            logger.info("Restore complete: applied %s", ", ".join(applied))
+        except Exception as exc:   # noqa: BLE001
+            logger.exception("Restore FAILED: %s", exc)
+            raise
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m helpers.backup", description=__doc__.split("\n")[0])
+    sub = parser.add_subparsers(dest="command")
+
+    p_dump = sub.add_parser("dump", help="Write a full or incremental backup.")
+    p_dump.add_argument("--incremental", action="store_true")
+    p_dump.add_argument("--codec", choices=sorted(_EXTENSIONS), default="gzip")
+    p_dump.add_argument("--full-every", type=int, default=FULL_EVERY,
+                        help="Force a full snapshot after this many incrementals")
+    p_dump.add_argument("--store", help="gs://bucket or a local directory")
+
+    p_restore = sub.add_parser("restore", help="Restore a backup chain into the DB.")
+    p_restore.add_argument("--manifest", help="Backup id to restore up to (default: latest)")
+    p_restore.add_argument("--store", help="gs://bucket or a local directory")
+
+    args = parser.parse_args(argv)
+    if args.command == "restore":
+        restore_from_gcs(args.manifest, args.store)
+    elif args.command == "dump":
+        dump_to_gcs(args.incremental, args.store, args.codec, args.full_every)
+    else:
+        dump_to_gcs()           # bare invocation keeps the old cron behaviour
+
+
 if __name__ == "__main__":
-    dump_to_gcs()
+    main()
@@ -0,0 +1,165 @@
+"""Driver GPS breadcrumbs and per-stop ETAs.
+
+The driver's page posts batches of phone fixes to ``/driver/pings``.
+:func:`parse_pings` validates a batch, :func:`record_pings` appends it to
+``driver_ping`` with one INSERT (pruning rows older than the retention window
+at most every ``PRUNE_EVERY`` seconds per process) and moves DriverLocation
+to the newest fix.
+
+:func:`stop_etas` then estimates the arrival at every stop still ahead from
+the cached route alone – the RouteStop legs taken from the solver's matrix,
+plus a straight-line estimate from the fix to the next stop – so a batch costs
+a few indexed queries and O(remaining stops) arithmetic: no geocoding, no
+Matrix call, no re-solve.
+"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Sequence
+
+from sqlalchemy import insert
+
+from models import DriverLocation, DriverPing, RouteStop, db
+
+MAX_BATCH = 500
+MAX_CLOCK_SKEW = timedelta(minutes=5)      # fixes stamped further ahead are dropped
+PRUNE_EVERY = 300.0
+DETOUR_FACTOR = 1.3                        # road vs straight-line distance
+FALLBACK_SPEED_MPS = 11.0                  # ~25 mph, when a leg can't be scaled
+_EARTH_RADIUS_M = 6_371_000
+
+
+@dataclass(frozen=True)
+class Ping:
+    recorded_at: datetime          # naive UTC
+    lon: float
+    lat: float
+    accuracy_m: int | None = None
+
+    @property
+    def geo(self) -> str:
+        return f"{self.lon:.6f},{self.lat:.6f}"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def parse_pings(payload: dict, *, max_age: timedelta, now: datetime | None = None) -> list[Ping]:
+    """
+    ``{"pings": [{"lon": …, "lat": …, "t": <epoch ms>, "accuracy": <m>}, …]}``
+    → Pings, oldest first. Fixes older than *max_age* or from the future are
+    skipped (a phone flushing an old queue); malformed ones raise ValueError.
+    """
+    raw = payload.get("pings") if isinstance(payload, dict) else None
+    if not isinstance(raw, list):
+        raise ValueError("expected a 'pings' list")
+    if len(raw) > MAX_BATCH:
+        raise ValueError(f"at most {MAX_BATCH} pings per batch")
+
+    now = now or _utcnow()
+    pings = []
+    for item in raw:
+        try:
+            lon, lat = float(item["lon"]), float(item["lat"])
+            at = datetime.fromtimestamp(float(item["t"]) / 1000, timezone.utc).replace(tzinfo=None)
+            accuracy = item.get("accuracy")
+            accuracy = min(int(accuracy), 32_767) if accuracy is not None else None
+        except (KeyError, TypeError, ValueError, OverflowError, OSError):
+            raise ValueError(f"malformed ping: {item!r}"[:200]) from None
+        if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+            raise ValueError(f"coordinates out of range: {lon},{lat}")
+        if now - max_age <= at <= now + MAX_CLOCK_SKEW:
+            pings.append(Ping(at, lon, lat, accuracy))
+    pings.sort(key=lambda p: p.recorded_at)
+    return pings
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Storage
+# ──────────────────────────────────────────────────────────────────────────
+_pruned_at = 0.0
+_prune_lock = threading.Lock()
+
+
+def prune(retention: timedelta, now: datetime | None = None) -> int:
+    """Delete breadcrumbs older than *retention*; returns the row count. Caller commits."""
+    cutoff = (now or _utcnow()) - retention
+    return DriverPing.query.filter(DriverPing.recorded_at < cutoff).delete(synchronize_session=False)
+
+
+def _maybe_prune(retention: timedelta) -> None:
+    global _pruned_at
+    with _prune_lock:
+        if time.monotonic() - _pruned_at < PRUNE_EVERY:
+            return
+        _pruned_at = time.monotonic()
+    prune(retention)
+
+
+def record_pings(pings: Sequence[Ping], retention: timedelta) -> Ping:
+    """Append *pings* (non-empty, oldest first) and point DriverLocation at the newest. Caller commits."""
+    db.session.execute(insert(DriverPing), [
+        {"recorded_at": p.recorded_at, "lon_e6": round(p.lon * 1e6), "lat_e6": round(p.lat * 1e6),
+         "accuracy_m": p.accuracy_m}
+        for p in pings
+    ])
+    latest = pings[-1]
+    loc = DriverLocation.query.first()
+    if loc is None:
+        loc = DriverLocation()
+        db.session.add(loc)
+    loc.geocoded_addr = latest.geo
+    _maybe_prune(retention)
+    return latest
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# ETAs
+# ──────────────────────────────────────────────────────────────────────────
+def _lonlat(geo: str | None) -> tuple[float, float] | None:
+    try:
+        lon, lat = (float(v) for v in (geo or "").split(","))
+    except ValueError:
+        return None
+    return lon, lat
+
+
+def haversine_m(a: tuple[float, float], b: tuple[float, float]) -> float:
+    """Great-circle metres between two (lon, lat) points."""
+    lon1, lat1, lon2, lat2 = map(math.radians, (*a, *b))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * _EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+def seconds_to_next(done: RouteStop, nxt: RouteStop, position: tuple[float, float]) -> int:
+    """
+    Time from *position* to *nxt*: the cached leg ``done → nxt`` scaled by
+    how much of its straight-line distance is left, or a flat speed when
+    either end isn't a coordinate.
+    """
+    target = _lonlat(nxt.geo)
+    if target is None:
+        return nxt.leg_seconds
+    left = haversine_m(position, target)
+    origin = _lonlat(done.geo)
+    whole = haversine_m(origin, target) if origin else 0.0
+    if whole > 50 and nxt.leg_seconds:
+        return round(nxt.leg_seconds * min(left / whole, 3.0))
+    return round(left * DETOUR_FACTOR / FALLBACK_SPEED_MPS)
+
+
+def stop_etas(done: RouteStop, ahead: Sequence[RouteStop], position: tuple[float, float], *,
+              dwell_seconds: int = 0) -> list[int]:
+    """Seconds from now to each stop in *ahead* (see live_route.remaining_stops)."""
+    if not ahead:
+        return []
+    t = seconds_to_next(done, ahead[0], position)
+    etas = [t]
+    for stop in ahead[1:]:
+        t += dwell_seconds + stop.leg_seconds
+        etas.append(t)
+    return etas
@@ -0,0 +1,218 @@
+"""gzip / brotli compression of dynamic responses, as WSGI middleware.
+
+Wired in ``create_app()`` next to ``ProxyFix``::
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, min_size=app.config["COMPRESS_MIN_SIZE"])
+
+Rules, per response:
+
+* only for compressible types (``text/*``, JSON, JavaScript, XML, SVG) and
+  never for ``text/event-stream`` (compression buffers events);
+* never when the app already set ``Content-Encoding`` – the precompressed
+  ``/assets`` files – or ``Cache-Control: no-transform``;
+* never for HEAD, 1xx/204/206/304, or bodies under ``min_size`` bytes
+  (a ~1 KiB body saves less than the header overhead and CPU cost);
+* brotli when the client accepts it, else gzip, honouring ``q=0``;
+* bodies of known length up to ``BUFFER_LIMIT`` are compressed in one go and
+  get an exact ``Content-Length``; anything bigger, or of unknown length, is
+  compressed chunk by chunk as the app yields it;
+* ``Vary: Accept-Encoding`` on every compressible response, compressed or
+  not, so shared caches keep the variants apart; strong ETags become weak.
+"""
+from __future__ import annotations
+
+import zlib
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+from helpers.lazy import lazy_import
+
+brotli = lazy_import("brotli")
+
+DEFAULT_MIN_SIZE = 1024
+BUFFER_LIMIT = 256 * 1024
+
+_COMPRESSIBLE_PREFIXES = ("text/",)
+_COMPRESSIBLE_TYPES = {
+    "application/json", "application/javascript", "application/xml",
+    "application/rss+xml", "application/atom+xml", "application/manifest+json",
+    "image/svg+xml",
+}
+_NEVER = {"text/event-stream"}
+_SKIP_STATUS = {204, 206, 304}
+
+
+def is_compressible(content_type: str | None) -> bool:
+    mimetype = (content_type or "").split(";", 1)[0].strip().lower()
+    if not mimetype or mimetype in _NEVER:
+        return False
+    return (mimetype.startswith(_COMPRESSIBLE_PREFIXES) or mimetype in _COMPRESSIBLE_TYPES
+            or mimetype.endswith(("+json", "+xml")))
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """``"br"``, ``"gzip"`` or None for an Accept-Encoding header value."""
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_header(accept_encoding)
+    # accepted[x] is the quality of the best match (incl. "*"), 0 if refused;
+    # highest quality wins, brotli on a tie.
+    quality, encoding = max((accepted["br"], "br"), (accepted["gzip"], "gzip"),
+                            key=lambda pair: pair[0])
+    return encoding if quality else None
+
+
+class _Compressor:
+    """Incremental gzip or brotli with the same compress()/flush() surface."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=brotli_quality, lgwin=22)
+            self._compress, self._finish = self._c.process, self._c.finish
+        else:
+            self._c = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)    # 31 -> gzip container
+            self._compress, self._finish = self._c.compress, self._c.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class CompressionMiddleware:
+    """Compress the wrapped app's responses; see the module docstring."""
+
+    def __init__(self, app, min_size: int = DEFAULT_MIN_SIZE, gzip_level: int = 6,
+                 brotli_quality: int = 4, buffer_limit: int = BUFFER_LIMIT):
+        self.app = app
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.buffer_limit = buffer_limit
+
+    def __call__(self, environ, start_response):
+        encoding = choose_encoding(environ.get("HTTP_ACCEPT_ENCODING"))
+        if environ.get("REQUEST_METHOD") == "HEAD":
+            encoding = None
+        captured = {}
+
+        def capture(status, headers, exc_info=None):
+            # Defer the real start_response until we know whether to compress.
+            captured.update(status=status, headers=headers, exc_info=exc_info)
+            return _unsupported_write
+
+        body = self.app(environ, capture)
+        try:
+            chunks = iter(body)
+            first = next(chunks, b"")    # start_response is only guaranteed after this
+        except BaseException:
+            _close(body)
+            raise
+
+        status, headers = captured["status"], Headers(captured["headers"])
+        plan = self._plan(encoding, int(status.split(" ", 1)[0]), headers)
+        if plan is None:
+            start_response(status, headers.to_wsgi_list(), captured["exc_info"])
+            return _Chained(first, chunks, body)
+
+        # Below the threshold? Known length answers that directly; otherwise
+        # read just enough of the body to find out.
+        length = headers.get("Content-Length", type=int)
+        head = [first] if first else []
+        if length is None:
+            seen = len(first)
+            while seen < self.min_size:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    length = seen
+                    break
+                if chunk:
+                    head.append(chunk)
+                    seen += len(chunk)
+        if length is not None and length < self.min_size:
+            start_response(status, headers.to_wsgi_list(), captured["exc_info"])
+            return _Chained(b"".join(head), chunks, body)
+
+        compressor = _Compressor(plan, self.gzip_level, self.brotli_quality)
+        headers["Content-Encoding"] = plan
+        _weaken_etag(headers)
+
+        if length is not None and length <= self.buffer_limit:
+            try:
+                data = compressor.compress(b"".join(head) + b"".join(chunks)) + compressor.finish()
+            finally:
+                _close(body)
+            headers["Content-Length"] = str(len(data))
+            start_response(status, headers.to_wsgi_list(), captured["exc_info"])
+            return [data]
+
+        headers.pop("Content-Length", None)
+        start_response(status, headers.to_wsgi_list(), captured["exc_info"])
+        return _Streamed(compressor, head, chunks, body)
+
+    def _plan(self, encoding, status_code, headers: Headers) -> str | None:
+        """Encoding to apply, or None; adds Vary to every compressible response."""
+        if not is_compressible(headers.get("Content-Type")):
+            return None
+        if "Content-Encoding" not in headers:
+            vary = {v.strip().lower() for v in headers.get("Vary", "").split(",") if v.strip()}
+            if "accept-encoding" not in vary and "*" not in vary:
+                headers["Vary"] = ", ".join(filter(None, [headers.get("Vary"), "Accept-Encoding"]))
+        if (encoding is None or status_code < 200 or status_code in _SKIP_STATUS
+                or "Content-Encoding" in headers
+                or "no-transform" in headers.get("Cache-Control", "").lower()):
+            return None
+        return encoding
+
+
+def _weaken_etag(headers: Headers) -> None:
+    # A strong ETag promises byte-identical bodies across encodings; we break that.
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = "W/" + etag
+
+
+def _close(body) -> None:
+    close = getattr(body, "close", None)
+    if close is not None:
+        close()
+
+
+def _unsupported_write(data):
+    raise RuntimeError("CompressionMiddleware does not support the start_response write() callable")
+
+
+class _Chained:
+    """Already-consumed head + the rest of the app's iterator, closing the original."""
+
+    def __init__(self, head: bytes, rest, body):
+        self._head, self._rest, self._body = head, rest, body
+
+    def __iter__(self):
+        if self._head:
+            yield self._head
+        yield from self._rest
+
+    def close(self):
+        _close(self._body)
+
+
+class _Streamed(_Chained):
+    """Compress chunk by chunk, skipping empty output so nothing stalls on b""."""
+
+    def __init__(self, compressor: _Compressor, head: list, rest, body):
+        super().__init__(b"", rest, body)
+        self._compressor, self._pending = compressor, head
+
+    def __iter__(self):
+        for chunk in self._pending:
+            out = self._compressor.compress(chunk)
+            if out:
+                yield out
+        for chunk in self._rest:
+            out = self._compressor.compress(chunk)
+            if out:
+                yield out
+        yield self._compressor.finish()
@@ -1,4 +1,12 @@
-from flask import request
+import logging
+
+from flask import g, has_app_context, request
+from flask_limiter import Limiter
+from limits.storage import RedisStorage
+from limits.strategies import FixedWindowRateLimiter
+
+_log = logging.getLogger(__name__)
+
 
 def code_email_key() -> str:
     """
@@ -15,4 +23,77 @@ def code_email_key() -> str:
         code  = data.get('request_id', code)
         email = data.get('requester_email', email)
 
-    return f"{code}:{email}"
\ No newline at end of file
+    return f"{code}:{email}"
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# One Redis round trip for all of a request's rate limits
+# ──────────────────────────────────────────────────────────────────────────
+class PrefetchingFixedWindowRateLimiter(FixedWindowRateLimiter):
+    """Fixed window strategy that consumes counts prefetched for this request."""
+
+    def hit(self, item, *identifiers, cost: int = 1) -> bool:
+        prefetched = g.get("_ratelimit_prefetched") if has_app_context() else None
+        key = item.key_for(*identifiers)
+        if prefetched and key in prefetched:
+            return prefetched.pop(key) <= item.amount
+        return super().hit(item, *identifiers, cost=cost)
+
+
+class PipelinedLimiter(Limiter):
+    """
+    Flask-Limiter checks a request's limits one by one – one Redis round trip
+    each (default + route + every shared scope). With Redis storage and the
+    fixed-window strategy, this subclass first sends all of those increments
+    in a single pipeline, using limits' own INCR+EXPIRE script, and lets
+    Flask-Limiter's normal evaluation read the results.
+
+    Difference from the serial path: when one limit is breached, the request
+    still counts against the request's other limits (Flask-Limiter would have
+    stopped at the first breach). Anything unusual – conditional deductions,
+    fallback storage, other strategies – takes the stock path.
+    """
+
+    def init_app(self, app) -> None:
+        super().init_app(app)
+        if type(self._limiter) is FixedWindowRateLimiter:
+            self._limiter = PrefetchingFixedWindowRateLimiter(self._storage)
+
+    def _check_request_limit(self, callable_name=None, in_middleware=True) -> None:
+        if (
+            self.enabled
+            and not self._storage_dead
+            and isinstance(self._storage, RedisStorage)
+            and isinstance(self._limiter, PrefetchingFixedWindowRateLimiter)
+        ):
+            try:
+                self._prefetch_hits(callable_name, in_middleware)
+            except Exception as e:          # stock path will retry / fall back
+                _log.warning("rate-limit prefetch failed: %s", e)
+                g.pop("_ratelimit_prefetched", None)
+        super()._check_request_limit(callable_name, in_middleware)
+
+    def _prefetch_hits(self, callable_name, in_middleware) -> None:
+        endpoint = self.identify_request()
+        limits = self._Limiter__filter_limits(endpoint, request.blueprint,
+                                              callable_name, in_middleware)
+        batch = {}
+        for lim in limits:
+            if lim.is_exempt or lim.method_exempt or lim.deduct_when:
+                continue
+            args = [lim.key_func(), lim.scope_for(endpoint, request.method)]
+            if not all(args):
+                continue
+            if self._key_prefix:
+                args = [self._key_prefix, *args]
+            batch[lim.limit.key_for(*args)] = (lim.limit.get_expiry(), lim.cost)
+
+        if len(batch) < 2:
+            return
+
+        storage = self._storage
+        pipe = storage.get_connection().pipeline(transaction=False)
+        for key, (expiry, cost) in batch.items():
+            storage.lua_incr_expire(keys=[storage.prefixed_key(key)],
+                                    args=[expiry, cost], client=pipe)
+        g._ratelimit_prefetched = dict(zip(batch, (int(c) for c in pipe.execute())))
@@ -1,14 +1,22 @@
+from __future__ import annotations
+
 import datetime
+import hashlib
 import re
 import os
 
-import gspread
+import click
 from flask import current_app
+from flask.cli import with_appcontext
 from sqlalchemy import or_, desc
-from gspread.exceptions import WorksheetNotFound
 
-from models import PickupRequest, db
+from models import PickupRequest, ExportedRow, db
 from helpers.google_creds import get_google_credentials
+from helpers.lazy import lazy_import
+
+# Only the export CLI/jobs need these; keep them out of worker boot.
+gspread = lazy_import("gspread")
+gspread_utils = lazy_import("gspread.utils")
 
 ###############################################################################
 # Mapping helpers
@@ -33,6 +41,12 @@ _TIMESTAMP_COL = "Exported At"
 #: Admin note that should *never* be exported.
 _ADMIN_SKIP_NOTE = "Imported via import-backfill CLI"
 
+#: Rows pulled from the DB (and written to the sheet) per chunk.
+_CHUNK_SIZE = 500
+
+#: Max ranges sent in one ``values.batchUpdate`` call in delta mode.
+_MAX_RANGES_PER_BATCH = 500
+
 # ----------------------------------------------------------------------------
 # Utility helpers
 # ----------------------------------------------------------------------------
@@ -49,109 +63,302 @@ def _header_to_attr(header: str) -> str | None:
         return None
     return _EXPLICIT_FIELD_MAP.get(header, _snake_case(header))
 
+
+def _open_requests_spreadsheet() -> gspread.Spreadsheet:
+    """Open the environment-tagged 'Website Requests' spreadsheet."""
+    creds   = get_google_credentials()
+    client  = gspread.authorize(creds)
+    cfg     = os.getenv("FLASK_CONFIG", "development").lower()
+    env_tag = "[PRODUCTION]" if cfg == "production" else "[DEVELOPMENT]"
+    return client.open(f"{env_tag} [DO NOT EDIT] EkoLinq Website Requests")
+
+
+def _export_query():
+    """Every exportable PickupRequest (backfilled rows excluded)."""
+    return PickupRequest.query.filter(
+        or_(
+            PickupRequest.admin_notes.is_(None),
+            PickupRequest.admin_notes != _ADMIN_SKIP_NOTE,
+        )
+    )
+
+
+_NOT_EXPORTED = {"id", "updated_at"}     # updated_at: backup watermark (helpers.backup)
+
+
+def _header_row() -> list[str]:
+    """Dynamic headers from the DB schema (minus _NOT_EXPORTED) + timestamp column."""
+    cols = [c.name for c in PickupRequest.__table__.columns if c.name not in _NOT_EXPORTED]
+    reverse_map = {v: k for k, v in _EXPLICIT_FIELD_MAP.items()}
+    header_row = [
+        reverse_map.get(col, col.replace("_", " ").title())
+        for col in cols
+    ]
+    header_row.append(_TIMESTAMP_COL)
+    return header_row
+
+
+def _row_values(req: PickupRequest, attr_order: list[str | None], timestamp: str) -> list[str]:
+    """Render one PickupRequest as a sheet row, in header order."""
+    row = []
+    for attr in attr_order:
+        if attr is None:
+            row.append(timestamp)
+        else:
+            val = getattr(req, attr, "")
+            row.append(str(val) if val is not None else "")
+    return row
+
+
+def _row_hash(row: list[str], attr_order: list[str | None]) -> str:
+    """Content hash of a rendered row, ignoring the export timestamp."""
+    data = "\x1f".join(v for v, attr in zip(row, attr_order) if attr is not None)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _ensure_rows(ws: gspread.Worksheet, last_row: int) -> None:
+    """Grow the worksheet grid so *last_row* is addressable."""
+    if last_row > ws.row_count:
+        ws.add_rows(last_row - ws.row_count)
+
 ###############################################################################
 # Main export function
 ###############################################################################
 
-def weekly_export() -> None:
-    """Export all PickupRequest rows to Google Sheets via ghost-sheet swap.
+def weekly_export(mode: str = "full", chunk_size: int = _CHUNK_SIZE) -> None:
+    """Export PickupRequest rows to the 'Requests' tab of the Google Sheet.
+
+    ``mode="full"`` (default) rebuilds the tab via ghost-sheet swap:
 
     * Keeps most recent snapshot in 'Requests' tab.
     * Keeps previous snapshot in 'Requests_Temp' tab.
     * Dynamically generates headers from DB columns, using explicit map for renames.
-    * Writes entire dump in a single atomic RPC (`values.batchUpdate`).
+    * Streams rows with ``yield_per`` and writes them ``chunk_size`` rows per call.
     * Orders rows by date_filed desc (newest first).
+
+    ``mode="delta"`` leaves the tab in place and only sends rows whose content
+    hash differs from what :class:`ExportedRow` says we last wrote; see
+    :func:`_delta_export`.
     """
+    if mode == "delta":
+        return _delta_export(chunk_size)
+    if mode != "full":
+        raise ValueError(f"Unknown export mode {mode!r}; expected 'full' or 'delta'.")
+
     logger = current_app.logger
-    logger.info("[export] Starting weekly export job…")
+    logger.info("[export] Starting weekly export job (full rebuild)…")
 
-    # — auth & select spreadsheet —
-    creds   = get_google_credentials()
-    client  = gspread.authorize(creds)
-    cfg     = os.getenv("FLASK_CONFIG", "development").lower()
-    env_tag = "[PRODUCTION]" if cfg == "production" else "[DEVELOPMENT]"
-    ss      = client.open(f"{env_tag} [DO NOT EDIT] EkoLinq Website Requests")
+    ss = _open_requests_spreadsheet()
 
     # — Step 1: Rotate main into temp —
     try:
         stale = ss.worksheet("Requests_Temp")
         ss.del_worksheet(stale)
-    except WorksheetNotFound:
+    except gspread.exceptions.WorksheetNotFound:
         pass
 
     try:
         main_ws = ss.worksheet("Requests")
         main_ws.update_title("Requests_Temp")
-    except WorksheetNotFound:
+    except gspread.exceptions.WorksheetNotFound:
         pass
 
     # — Step 2: Create fresh 'Requests' tab —
+    header_row = _header_row()
     try:
         new_ws = ss.worksheet("Requests")
         new_ws.clear()
-    except WorksheetNotFound:
-        # infer size from DB
-        total = (
-            PickupRequest.query
-            .filter(
-                or_(
-                    PickupRequest.admin_notes.is_(None),
-                    PickupRequest.admin_notes != _ADMIN_SKIP_NOTE,
-                )
-            )
-            .count()
-        )
-        # +1 for timestamp column
-        cols = len(PickupRequest.__table__.columns)  
-        new_ws = ss.add_worksheet(title="Requests", rows=str(total + 1), cols=str(cols + 1))
+    except gspread.exceptions.WorksheetNotFound:
+        # infer size from DB (+1 for the header row)
+        total = _export_query().count()
+        new_ws = ss.add_worksheet(title="Requests", rows=str(total + 1), cols=str(len(header_row)))
 
-    # — Step 3: Dynamic headers from DB schema (excluding 'id') —
-    cols = [c.name for c in PickupRequest.__table__.columns if c.name != "id"]
-    reverse_map = {v: k for k, v in _EXPLICIT_FIELD_MAP.items()}
-    header_row = [
-        reverse_map.get(col, col.replace("_", " ").title())
-        for col in cols
-    ]
-    header_row.append(_TIMESTAMP_COL)
+    # — Step 3: Header row —
     attr_order = [_header_to_attr(h) for h in header_row]
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    new_ws.update("A1", [header_row], value_input_option="RAW")
 
-    # — Step 4: Fetch all rows ordered by date_filed desc —
-    all_reqs = (
-        PickupRequest.query
-        .filter(
-            or_(
-                PickupRequest.admin_notes.is_(None),
-                PickupRequest.admin_notes != _ADMIN_SKIP_NOTE,
-            )
-        )
-        .order_by(desc(PickupRequest.date_filed))
-        .all()
+    # The sheet is being rebuilt from scratch, so is the row-state table.
+    db.session.query(ExportedRow).delete(synchronize_session=False)
+
+    # — Step 4: Stream rows ordered by date_filed desc, one write per chunk —
+    query = (
+        _export_query()
+        .order_by(desc(PickupRequest.date_filed), PickupRequest.id)
+        .yield_per(chunk_size)
     )
 
-    # Build matrix: header + rows
-    values = [header_row]
-    for req in all_reqs:
+    next_row = 2
+    chunk: list[list[str]] = []
+    states: list[dict] = []
+    exported = 0
+
+    def _flush() -> None:
+        nonlocal next_row, exported
+        if not chunk:
+            return
+        _ensure_rows(new_ws, next_row + len(chunk) - 1)
+        new_ws.update(f"A{next_row}", chunk, value_input_option="RAW")
+        db.session.bulk_insert_mappings(ExportedRow, states)
+        next_row += len(chunk)
+        exported += len(chunk)
+        chunk.clear()
+        states.clear()
+
+    now = datetime.datetime.now()
+    for req in query:
         if (req.admin_notes or "").strip() == _ADMIN_SKIP_NOTE:
             continue
-        row = []
-        for attr in attr_order:
-            if attr is None:
-                row.append(timestamp)
-            else:
-                val = getattr(req, attr, "")
-                row.append(str(val) if val is not None else "")
-        values.append(row)
-
-    # — Step 5: Write dump in one atomic RPC —
-    new_ws.update("A1", values, value_input_option="RAW")
-
-    # — Step 6: Cleanup stray worksheets —
+        row = _row_values(req, attr_order, timestamp)
+        chunk.append(row)
+        states.append({
+            "request_id": req.request_id,
+            "sheet_row": next_row + len(chunk) - 1,
+            "row_hash": _row_hash(row, attr_order),
+            "exported_at": now,
+        })
+        if len(chunk) >= chunk_size:
+            _flush()
+    _flush()
+
+    # — Step 5: Cleanup stray worksheets —
     for ws in ss.worksheets():
         if ws.title not in ("Requests", "Requests_Temp"):
             ss.del_worksheet(ws)
 
     db.session.commit()
     logger.info(
-        "[export] Weekly export complete — 'Requests' holds current dump; 'Requests_Temp' holds prior dump."
+        "[export] Weekly export complete (%d rows) — 'Requests' holds current dump; "
+        "'Requests_Temp' holds prior dump.", exported
+    )
+
+
+def _delta_export(chunk_size: int = _CHUNK_SIZE) -> None:
+    """Send only new/changed rows to the existing 'Requests' tab.
+
+    * Rows are hashed (timestamp excluded) and compared with :class:`ExportedRow`.
+    * Changed rows are rewritten in place; new rows are appended below the last
+      known row, so delta-exported rows are *not* kept in date_filed order.
+    * Rows that disappeared from the DB are blanked out in the sheet.
+    * Writes go out as ``values.batchUpdate`` calls of at most
+      ``_MAX_RANGES_PER_BATCH`` ranges.
+
+    Falls back to a full rebuild when the tab (or any row state) is missing.
+    """
+    logger = current_app.logger
+    logger.info("[export] Starting delta export job…")
+
+    ss = _open_requests_spreadsheet()
+    try:
+        ws = ss.worksheet("Requests")
+    except gspread.exceptions.WorksheetNotFound:
+        logger.info("[export] No 'Requests' tab yet; falling back to full rebuild.")
+        return weekly_export(mode="full", chunk_size=chunk_size)
+
+    state = {s.request_id: s for s in ExportedRow.query.all()}
+    if not state:
+        logger.info("[export] No export row state yet; falling back to full rebuild.")
+        return weekly_export(mode="full", chunk_size=chunk_size)
+
+    header_row = _header_row()
+    attr_order = [_header_to_attr(h) for h in header_row]
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = datetime.datetime.now()
+
+    next_row = max(s.sheet_row for s in state.values()) + 1
+    pending: list[dict] = [
+        {"range": gspread_utils.absolute_range_name(ws.title, "A1"), "values": [header_row]}
+    ]
+    changed = added = removed = 0
+
+    def _flush() -> None:
+        if not pending:
+            return
+        _ensure_rows(ws, next_row - 1)
+        ss.values_batch_update({"valueInputOption": "RAW", "data": list(pending)})
+        pending.clear()
+
+    seen: set[str] = set()
+    query = (
+        _export_query()
+        .order_by(PickupRequest.id)
+        .yield_per(chunk_size)
+    )
+    for req in query:
+        if (req.admin_notes or "").strip() == _ADMIN_SKIP_NOTE:
+            continue
+        seen.add(req.request_id)
+        row = _row_values(req, attr_order, timestamp)
+        digest = _row_hash(row, attr_order)
+
+        prev = state.get(req.request_id)
+        if prev is not None and prev.row_hash == digest:
+            continue
+        if prev is None:
+            prev = ExportedRow(request_id=req.request_id, sheet_row=next_row)
+            db.session.add(prev)
+            next_row += 1
+            added += 1
+        else:
+            changed += 1
+        prev.row_hash = digest
+        prev.exported_at = now
+
+        pending.append({
+            "range": gspread_utils.absolute_range_name(ws.title, f"A{prev.sheet_row}"),
+            "values": [row],
+        })
+        if len(pending) >= _MAX_RANGES_PER_BATCH:
+            _flush()
+
+    blank = [""] * len(header_row)
+    for request_id, prev in state.items():
+        if request_id in seen:
+            continue
+        pending.append({
+            "range": gspread_utils.absolute_range_name(ws.title, f"A{prev.sheet_row}"),
+            "values": [blank],
+        })
+        db.session.delete(prev)
+        removed += 1
+        if len(pending) >= _MAX_RANGES_PER_BATCH:
+            _flush()
+    _flush()
+
+    # Row state is committed only once the sheet is fully written; a failed
+    # run leaves it untouched, so the next run re-sends the same ranges.
+    db.session.commit()
+    logger.info(
+        "[export] Delta export complete — %d changed, %d added, %d removed.",
+        changed, added, removed,
     )
+
+
+###############################################################################
+# CLI
+###############################################################################
+
+@click.command("export-requests")
+@click.option(
+    "--mode",
+    type=click.Choice(["full", "delta"]),
+    default="delta",
+    show_default=True,
+    help="'delta' sends only new/changed rows; 'full' rebuilds the tab.",
+)
+@click.option(
+    "--chunk-size",
+    default=_CHUNK_SIZE,
+    show_default=True,
+    help="Rows fetched from the DB (and written in full mode) per batch.",
+)
+@with_appcontext
+def export_requests(mode: str, chunk_size: int) -> None:
+    """Export pickup requests to the 'Requests' Google Sheet."""
+    weekly_export(mode=mode, chunk_size=chunk_size)
+    click.echo(f"✔ Export finished ({mode}).")
+
+
+def register(app):
+    """Attach the CLI command to *app*. Call this from create_app()."""
+    app.cli.add_command(export_requests)
@@ -0,0 +1,381 @@
+"""Local stand-in for the Mapbox and Google Maps APIs, for tests and benchmarks.
+
+Serves the endpoints our code calls with deterministic answers:
+
+* Mapbox Geocoding   ``GET /geocoding/v5/mapbox.places/<query>.json``
+* Mapbox Matrix      ``GET /directions-matrix/v1/<profile>/<lon,lat;...>``
+* Mapbox Directions  ``GET /directions/v5/<profile>/<lon,lat;...>``
+* Google Distance Matrix ``GET /maps/api/distancematrix/json``
+* Google Place Details   ``GET /maps/api/place/details/json``
+* Google Address Validation ``POST /v1:validateAddress``
+
+Addresses geocode to a stable point in the Tri-Valley derived from a hash of
+the text; distances are haversine × ``ROAD_FACTOR`` and durations assume
+``SPEED_MPS``, so the same inputs always give the same matrix. Place IDs are
+unknown (``NOT_FOUND``) unless registered with :meth:`GeoStandin.add_place`.
+
+Faults can be injected on a running server – ``latency`` (seconds per
+request), ``error_rate`` (HTTP 500) and ``throttle_rate`` (HTTP 429 with
+``Retry-After``) – drawn from a seeded RNG so a run is reproducible.
+
+In tests use the ``geo_standin`` fixture (helpers/tests/conftest.py), which
+points ``helpers.api_urls`` at the server. By hand::
+
+    python -m helpers.geo_standin --port 8089 --latency 0.05 --throttle-rate 0.1
+
+and export the printed env vars before starting the app or a benchmark.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote_plus, urlsplit
+
+# Bounding box the hashed geocodes fall in (Dublin/Pleasanton/Livermore/San Ramon).
+BBOX = (-122.05, 37.62, -121.70, 37.82)        # min lon, min lat, max lon, max lat
+ROAD_FACTOR = 1.3                              # road distance / straight line
+SPEED_MPS = 13.4                               # ~30 mph average
+MAPBOX_MAX_COORDS = 25                         # 10 for *-traffic profiles
+EARTH_RADIUS_M = 6_371_000
+
+_ADDRESS = re.compile(r"^\s*(?P<street>[^,]+),\s*(?P<city>[^,]+?),?\s*"
+                      r"(?:CA|California)\b\.?\s*(?P<zip>\d{5})?", re.IGNORECASE)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Deterministic geography
+# ──────────────────────────────────────────────────────────────────────────
+def geocode(text: str) -> tuple[float, float]:
+    """(lon, lat) for *text*: parsed if it already is "lon,lat", else hashed into BBOX."""
+    try:
+        lon, lat, *_ = text.split(",")
+        return float(lon), float(lat)
+    except ValueError:
+        pass
+    digest = hashlib.sha256(" ".join(text.lower().split()).encode()).digest()
+    fx = int.from_bytes(digest[:4], "big") / 2**32
+    fy = int.from_bytes(digest[4:8], "big") / 2**32
+    return (round(BBOX[0] + fx * (BBOX[2] - BBOX[0]), 6),
+            round(BBOX[1] + fy * (BBOX[3] - BBOX[1]), 6))
+
+
+def haversine_m(a: tuple[float, float], b: tuple[float, float]) -> float:
+    lon1, lat1, lon2, lat2 = map(math.radians, (*a, *b))
+    h = (math.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
+
+
+def leg(a: tuple[float, float], b: tuple[float, float]) -> tuple[float, float]:
+    """(road meters, seconds) between two points."""
+    meters = round(haversine_m(a, b) * ROAD_FACTOR, 1)
+    return meters, round(meters / SPEED_MPS, 1)
+
+
+def parse_address(line: str) -> dict | None:
+    """{"street", "city", "zip"} from "street, City, CA 94566"; None if unparseable."""
+    m = _ADDRESS.match(line)
+    if not m:
+        return None
+    return {"street": m["street"].strip(), "city": m["city"].strip(), "zip": m["zip"]}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Endpoints: (status, body) from the parsed request
+# ──────────────────────────────────────────────────────────────────────────
+def _coords(segment: str) -> list[tuple[float, float]]:
+    return [geocode(c) for c in unquote_plus(segment).split(";")]
+
+
+def _indices(value: str | None, n: int) -> list[int]:
+    return list(range(n)) if value in (None, "all") else [int(i) for i in value.split(";")]
+
+
+def mapbox_geocoding(query: str, params: dict) -> tuple[int, dict]:
+    query = unquote_plus(query).removesuffix(".json")
+    lon, lat = geocode(query)
+    parsed = parse_address(query)
+    place_name = (query if parsed else
+                  f"{int(abs(lon * 1e4)) % 9000 + 100} Standin Way, Pleasanton, California 94566")
+    return 200, {"type": "FeatureCollection", "query": query.split(), "features": [{
+        "id": "address." + hashlib.sha1(query.encode()).hexdigest()[:12],
+        "type": "Feature", "place_type": ["address"], "relevance": 1,
+        "place_name": place_name, "center": [lon, lat],
+        "geometry": {"type": "Point", "coordinates": [lon, lat]},
+    }]}
+
+
+def mapbox_matrix(profile: str, coords: str, params: dict) -> tuple[int, dict]:
+    points = _coords(coords)
+    cap = 10 if profile.endswith("traffic") else MAPBOX_MAX_COORDS
+    if len(points) > cap:
+        return 422, {"code": "InvalidInput",
+                     "message": f"Too many coordinates; maximum number of coordinates is {cap}."}
+    sources = _indices(params.get("sources"), len(points))
+    destinations = _indices(params.get("destinations"), len(points))
+    legs = [[leg(points[i], points[j]) for j in destinations] for i in sources]
+    body = {"code": "Ok",
+            "sources": [{"location": list(points[i])} for i in sources],
+            "destinations": [{"location": list(points[j])} for j in destinations]}
+    annotations = params.get("annotations", "duration").split(",")
+    if "duration" in annotations:
+        body["durations"] = [[d for _, d in row] for row in legs]
+    if "distance" in annotations:
+        body["distances"] = [[m for m, _ in row] for row in legs]
+    return 200, body
+
+
+def mapbox_directions(profile: str, coords: str, params: dict) -> tuple[int, dict]:
+    points = _coords(coords)
+    if len(points) < 2:
+        return 422, {"code": "InvalidInput", "message": "At least two coordinates required."}
+    legs = [leg(a, b) for a, b in zip(points, points[1:])]
+    return 200, {"code": "Ok", "routes": [{
+        "distance": round(sum(m for m, _ in legs), 1),
+        "duration": round(sum(d for _, d in legs), 1),
+        "weight_name": "auto", "weight": round(sum(d for _, d in legs), 1),
+        "legs": [{"distance": m, "duration": d, "steps": [], "summary": ""} for m, d in legs],
+    }], "waypoints": [{"name": "", "location": list(p)} for p in points]}
+
+
+def _google_point(text: str) -> tuple[float, float]:
+    # Google writes coordinates "lat,lng" – the other way round from Mapbox.
+    try:
+        lat, lng = (float(v) for v in text.split(","))
+        return lng, lat
+    except ValueError:
+        return geocode(text)
+
+
+def google_distance_matrix(params: dict) -> tuple[int, dict]:
+    origins = params.get("origins", "").split("|")
+    destinations = params.get("destinations", "").split("|")
+
+    def element(a, b):
+        meters, seconds = leg(_google_point(a), _google_point(b))
+        return {"status": "OK",
+                "distance": {"value": int(meters), "text": f"{meters / 1609.344:.1f} mi"},
+                "duration": {"value": int(seconds), "text": f"{round(seconds / 60)} mins"},
+                "duration_in_traffic": {"value": int(seconds), "text": f"{round(seconds / 60)} mins"}}
+    return 200, {"status": "OK", "origin_addresses": origins,
+                 "destination_addresses": destinations,
+                 "rows": [{"elements": [element(a, b) for b in destinations]} for a in origins]}
+
+
+def _address_components(parsed: dict) -> list[dict]:
+    return [{"long_name": parsed["street"], "short_name": parsed["street"], "types": ["route"]},
+            {"long_name": parsed["city"], "short_name": parsed["city"],
+             "types": ["locality", "political"]},
+            {"long_name": "California", "short_name": "CA",
+             "types": ["administrative_area_level_1", "political"]},
+            {"long_name": parsed["zip"], "short_name": parsed["zip"], "types": ["postal_code"]}]
+
+
+def google_place_details(params: dict, places: dict) -> tuple[int, dict]:
+    parsed = places.get(params.get("place_id"))
+    if parsed is None:
+        return 200, {"status": "NOT_FOUND", "html_attributions": []}
+    return 200, {"status": "OK", "html_attributions": [],
+                 "result": {"address_components": _address_components(parsed)}}
+
+
+def google_validate_address(payload: dict) -> tuple[int, dict]:
+    line = ", ".join(payload.get("address", {}).get("addressLines", []))
+    parsed = parse_address(line)
+    complete = bool(parsed and parsed["zip"])
+    components = [] if parsed is None else [
+        {"componentName": {"text": parsed["street"]}, "componentType": "route",
+         "confirmationLevel": "CONFIRMED"},
+        {"componentName": {"text": parsed["city"]}, "componentType": "locality",
+         "confirmationLevel": "CONFIRMED"},
+        {"componentName": {"text": "CA"}, "componentType": "administrative_area_level_1",
+         "confirmationLevel": "CONFIRMED"},
+    ] + ([{"componentName": {"text": parsed["zip"]}, "componentType": "postal_code",
+           "confirmationLevel": "CONFIRMED"}] if parsed["zip"] else [])
+    lon, lat = geocode(line)
+    return 200, {"result": {
+        "verdict": {"inputGranularity": "PREMISE",
+                    "validationGranularity": "PREMISE" if complete else "OTHER",
+                    "addressComplete": complete,
+                    "hasUnconfirmedComponents": not complete},
+        "address": {"formattedAddress": line, "addressComponents": components},
+        "geocode": {"location": {"latitude": lat, "longitude": lon}},
+    }, "responseId": hashlib.sha1(line.encode()).hexdigest()}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# HTTP server
+# ──────────────────────────────────────────────────────────────────────────
+_MAPBOX_ROUTES = [
+    (re.compile(r"^/geocoding/v5/mapbox\.places/(?P<query>[^/]+)$"), "geocoding", mapbox_geocoding),
+    (re.compile(r"^/directions-matrix/v1/(?P<profile>mapbox/[\w-]+)/(?P<coords>[^/]+)$"),
+     "matrix", mapbox_matrix),
+    (re.compile(r"^/directions/v5/(?P<profile>mapbox/[\w-]+)/(?P<coords>[^/]+)$"),
+     "directions", mapbox_directions),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "GeoStandin"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_args):                 # keep test output clean
+        pass
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        endpoint, handler = self._route(url.path, params, raw)
+        if endpoint is None:
+            return self._send(404, {"message": "Not Found"})
+
+        fault = self.server.roll_fault(endpoint)
+        if fault == 429:
+            return self._send(429, {"message": "Too Many Requests"}, {"Retry-After": "1"})
+        if fault == 500:
+            return self._send(500, {"message": "Internal Server Error"})
+        if endpoint in ("geocoding", "matrix", "directions") and not params.get("access_token"):
+            return self._send(401, {"message": "Not Authorized - No Token"})
+        if endpoint in ("distancematrix", "place_details", "validate_address") and not params.get("key"):
+            return self._send(403, {"status": "REQUEST_DENIED",
+                                    "error_message": "The provided API key is invalid."})
+        self._send(*handler())
+
+    def _route(self, path: str, params: dict, raw: bytes):
+        if self.command == "GET":
+            for pattern, endpoint, fn in _MAPBOX_ROUTES:
+                m = pattern.match(path)
+                if m:
+                    return endpoint, lambda fn=fn, m=m: fn(*m.groups(), params)
+            if path == "/maps/api/distancematrix/json":
+                return "distancematrix", lambda: google_distance_matrix(params)
+            if path == "/maps/api/place/details/json":
+                return "place_details", lambda: google_place_details(params, self.server.places)
+        elif self.command == "POST" and path == "/v1:validateAddress":
+            return "validate_address", lambda: google_validate_address(json.loads(raw or b"{}"))
+        return None, None
+
+    def _send(self, status: int, body: dict, headers: dict | None = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class GeoStandin(ThreadingHTTPServer):
+    """Threaded stand-in server; ``with GeoStandin() as s: s.url``."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, latency: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, seed: int = 0):
+        super().__init__((host, port), _Handler)
+        self.places: dict[str, dict] = {}
+        self.hits: Counter = Counter()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.configure(latency=latency, error_rate=error_rate,
+                       throttle_rate=throttle_rate, seed=seed)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict[str, str]:
+        """Env vars that point helpers.api_urls (and a dummy token/key) here."""
+        return {"MAPBOX_API_URL": self.url, "GOOGLE_MAPS_API_URL": self.url,
+                "GOOGLE_ADDRESS_VALIDATION_URL": self.url,
+                "MAPBOX_ACCESS_TOKEN": "standin", "GOOGLE_BACKEND_API_KEY": "standin"}
+
+    def configure(self, *, latency: float = 0.0, error_rate: float = 0.0,
+                  throttle_rate: float = 0.0, seed: int = 0) -> None:
+        """Replace the fault settings and reseed; also clears ``hits``."""
+        with self._lock:
+            self.latency, self.error_rate, self.throttle_rate = latency, error_rate, throttle_rate
+            self._rng = random.Random(seed)
+            self.hits.clear()
+
+    def add_place(self, place_id: str, address: str) -> None:
+        """Make Place Details answer *place_id* with the components of *address*."""
+        parsed = parse_address(address)
+        if parsed is None or not parsed["zip"]:
+            raise ValueError(f"expected 'street, City, CA 12345', got {address!r}")
+        self.places[place_id] = parsed
+
+    def roll_fault(self, endpoint: str) -> int | None:
+        with self._lock:
+            self.hits[endpoint] += 1
+            roll = self._rng.random()
+            latency = self.latency
+        if latency:
+            time.sleep(latency)
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def start(self) -> "GeoStandin":
+        self._thread = threading.Thread(target=self.serve_forever, name="geo-standin",
+                                        kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "GeoStandin":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction answered 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = GeoStandin(args.host, args.port, latency=args.latency, error_rate=args.error_rate,
+                        throttle_rate=args.throttle_rate, seed=args.seed)
+    for name, value in server.env().items():
+        print(f"export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 # google_creds.py
+from __future__ import annotations
+
 import base64, json, os, tempfile
-from google.oauth2.service_account import Credentials
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:   # google-auth is imported on first use, not at boot
+    from google.oauth2.service_account import Credentials
 
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
@@ -12,4 +17,6 @@ def get_google_credentials() -> Credentials:
         os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON",
                   "etc/secrets/service_account.json")
     )
+    from google.oauth2.service_account import Credentials
+
     return Credentials.from_service_account_file(json_path, scopes=SCOPES)
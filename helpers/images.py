@@ -0,0 +1,234 @@
+"""Responsive, content-hashed variants of ``static/images``.
+
+Build step – run by ``bin/post_compile`` at build time (a cold build takes
+minutes, so never at dyno start); incremental, only new/changed originals
+are re-encoded. Needs neither the app nor its settings::
+
+    python -m helpers.images build [--force] [--widths 480,960,1600]
+
+For every PNG/JPEG/WebP in ``static/images`` this writes AVIF (when Pillow
+has an AVIF encoder) and WebP variants at each width up to the original's,
+plus a same-format fallback, all metadata-stripped, into
+``static/images/opt/`` as ``<stem>.<width>.<hash>.<ext>``, and records them
+in ``static/images/opt/manifest.json``. Because file names change whenever
+bytes change, ``register()`` serves ``opt/`` with a one-year immutable
+``Cache-Control``.
+
+Templates use ``{{ picture("Boxes1.jpeg", "Donation boxes", sizes="50vw") }}``,
+which emits a ``<picture>`` with ``srcset`` per format and falls back to a
+plain ``<img>`` of the original if the image hasn't been built.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import threading
+from pathlib import Path
+
+import click
+from flask import request, url_for
+from markupsafe import Markup, escape
+
+from helpers.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+ImageOps = lazy_import("PIL.ImageOps")
+features = lazy_import("PIL.features")
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT / "static" / "images"
+OUT_DIR = SRC_DIR / "opt"
+MANIFEST = OUT_DIR / "manifest.json"
+
+DEFAULT_WIDTHS = (480, 960, 1600)
+SOURCE_EXTS = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP"}
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+_SAVE_OPTIONS = {
+    "AVIF": {"quality": 55, "speed": 6},
+    "WEBP": {"quality": 80, "method": 6},
+    "JPEG": {"quality": 82, "optimize": True, "progressive": True},
+    "PNG": {"optimize": True},
+}
+_MIME = {"AVIF": "image/avif", "WEBP": "image/webp"}
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Build
+# ──────────────────────────────────────────────────────────────────────────
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _encode(img, fmt: str) -> bytes:
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, fmt, **_SAVE_OPTIONS[fmt])      # no exif/icc passed -> stripped
+    return buf.getvalue()
+
+
+def _variant_widths(width: int, widths) -> list[int]:
+    return sorted({w for w in widths if w < width} | {min(width, max(widths))})
+
+
+def _build_one(src: Path, widths, formats) -> dict:
+    with Image.open(src) as opened:
+        img = ImageOps.exif_transpose(opened)     # bake in orientation, then drop EXIF
+        img.load()
+    fallback = SOURCE_EXTS[src.suffix.lower()]
+    entry = {"sha256": _sha256(src), "width": img.width, "height": img.height,
+             "fallback": None, "sources": {}}
+
+    variant_widths = _variant_widths(img.width, widths)
+    for w in variant_widths:
+        resized = img if w == img.width else img.resize(
+            (w, round(img.height * w / img.width)), Image.Resampling.LANCZOS)
+        largest = w == variant_widths[-1]
+        for fmt in dict.fromkeys((*formats, fallback) if largest else formats):
+            name = _write_variant(src.stem, w, fmt, _encode(resized, fmt))
+            if fmt in formats:
+                entry["sources"].setdefault(fmt.lower(), []).append({"w": w, "file": name})
+            if largest and fmt == fallback:
+                entry["fallback"] = name
+    return entry
+
+
+def _write_variant(stem: str, width: int, fmt: str, data: bytes) -> str:
+    name = f"{stem}.{width}.{hashlib.sha256(data).hexdigest()[:10]}.{fmt.lower()}"
+    (OUT_DIR / name).write_bytes(data)
+    return name
+
+
+def _files_of(entry: dict) -> set[str]:
+    files = {entry["fallback"]}
+    for variants in entry["sources"].values():
+        files.update(v["file"] for v in variants)
+    return files
+
+
+def build(widths=DEFAULT_WIDTHS, force: bool = False, log=print) -> dict:
+    """(Re)build variants for changed originals; returns the new manifest."""
+    OUT_DIR.mkdir(exist_ok=True)
+    formats = tuple(f for f in ("AVIF", "WEBP") if f != "AVIF" or features.check("avif"))
+    old = load_manifest(fresh=True)
+    manifest = {}
+
+    for src in sorted(SRC_DIR.iterdir()):
+        if not src.is_file() or src.suffix.lower() not in SOURCE_EXTS:
+            continue
+        prev = old.get(src.name)
+        if (not force and prev and prev["sha256"] == _sha256(src)
+                and all((OUT_DIR / f).exists() for f in _files_of(prev))):
+            manifest[src.name] = prev
+            continue
+        log(f"encoding {src.name}")
+        manifest[src.name] = _build_one(src, widths, formats)
+
+    keep = set().union(*(_files_of(e) for e in manifest.values())) if manifest else set()
+    for stale in OUT_DIR.iterdir():
+        if stale.name != MANIFEST.name and stale.name not in keep:
+            stale.unlink()
+
+    tmp = MANIFEST.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    os.replace(tmp, MANIFEST)
+    _manifest_cache.clear()
+    return manifest
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Manifest + template helper
+# ──────────────────────────────────────────────────────────────────────────
+_manifest_cache: dict = {}
+_manifest_lock = threading.Lock()
+
+
+def load_manifest(fresh: bool = False) -> dict:
+    """The build manifest ({} if images were never built); read once per process."""
+    if fresh or "data" not in _manifest_cache:
+        try:
+            data = json.loads(MANIFEST.read_text())
+        except (OSError, ValueError):
+            data = {}
+        with _manifest_lock:
+            _manifest_cache["data"] = data
+    return _manifest_cache["data"]
+
+
+def _static_url(filename: str) -> str:
+    return url_for("static", filename=filename)
+
+
+def picture(name: str, alt: str = "", sizes: str = "100vw", **attrs) -> Markup:
+    """``<picture>`` markup for static/images/<name>; plain ``<img>`` if not built."""
+    entry = load_manifest().get(name)
+    # class_ -> class, aria_hidden -> aria-hidden
+    attrs = {k.rstrip("_").replace("_", "-"): v for k, v in attrs.items()}
+    attrs.setdefault("loading", "lazy")
+    attrs.setdefault("decoding", "async")
+
+    if entry is None:
+        img_attrs = {"src": _static_url(f"images/{name}"), "alt": alt, **attrs}
+        return Markup(f"<img {_attr_str(img_attrs)}>")
+
+    sources = [
+        f'<source type="{_MIME[fmt.upper()]}" sizes="{escape(sizes)}" srcset="'
+        + ", ".join(f"{_static_url('images/opt/' + v['file'])} {v['w']}w" for v in variants)
+        + '">'
+        for fmt, variants in sorted(entry["sources"].items())    # avif before webp
+    ]
+    img_attrs = {"src": _static_url(f"images/opt/{entry['fallback']}"), "alt": alt}
+    if "width" not in attrs and "height" not in attrs:     # reserve the layout box
+        img_attrs.update(width=entry["width"], height=entry["height"])
+    img_attrs.update(attrs)
+    return Markup("<picture>" + "".join(sources) + f"<img {_attr_str(img_attrs)}></picture>")
+
+
+def _attr_str(attrs: dict) -> str:
+    return " ".join(f'{k}="{escape(v)}"' for k, v in attrs.items() if v is not None)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# CLI / app wiring
+# ──────────────────────────────────────────────────────────────────────────
+@click.group("images")
+def images_cli():
+    """Build responsive image variants."""
+
+
+@images_cli.command("build")
+@click.option("--force", is_flag=True, help="Re-encode every image, not just changed ones.")
+@click.option("--widths", default=",".join(map(str, DEFAULT_WIDTHS)), show_default=True)
+def build_command(force: bool, widths: str):
+    """Encode AVIF/WebP variants and write static/images/opt/manifest.json."""
+    manifest = build(tuple(int(w) for w in widths.split(",")), force=force, log=click.echo)
+    total = sum(f.stat().st_size for f in OUT_DIR.iterdir())
+    click.echo(f"{len(manifest)} images, {total / 1e6:.1f} MB in {OUT_DIR.relative_to(ROOT)}")
+
+
+def register(app):
+    """CLI command, ``picture()`` template global and immutable caching for opt/."""
+    app.cli.add_command(images_cli)
+    app.add_template_global(picture)
+    if not app.debug and not app.testing and not MANIFEST.is_file():
+        app.logger.warning("images: %s missing – picture() falls back to the original "
+                           "images; run `python -m helpers.images build` at build time",
+                           MANIFEST)
+
+    @app.after_request
+    def _immutable_image_variants(response):
+        filename = (request.view_args or {}).get("filename", "")
+        if (request.endpoint == "static" and response.status_code in (200, 304)
+                and filename.startswith("images/opt/") and filename != "images/opt/manifest.json"):
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        return response
+
+
+if __name__ == "__main__":
+    images_cli(prog_name="python -m helpers.images")
@@ -0,0 +1,47 @@
+"""Defer heavy imports until first attribute access.
+
+    gspread = lazy_import("gspread")      # nothing imported yet
+    gspread.authorize(creds)              # imports gspread here, once
+
+Use it for dependencies that only a few routes/CLI commands need (Google
+Sheets, Cloud Storage, OR-Tools …) so worker boot doesn't pay for them.
+Type annotations that name a lazy module must be strings (or the module must
+use ``from __future__ import annotations``), otherwise they force the import.
+"""
+import importlib
+import threading
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for module *name*; the import runs on first use."""
+    return LazyModule(name)
@@ -0,0 +1,115 @@
+"""Read-side helpers for the driver's ``/live-route`` page.
+
+A :class:`~models.RouteSolution` keeps the route exactly as the solver
+returned it, as ordered :class:`~models.RouteStop` rows (:func:`save_route`).
+What is left of it is *derived* on each view from those rows and the pickups
+still ``Requested`` – :func:`roll_forward` reads the stops with one indexed
+SELECT and never writes – so a page view is read-only and the only writes are
+the status changes themselves.
+
+:func:`state_etag` hashes whatever the page shows, so a polling driver gets
+a 304 until a stop, the route totals or the driver's last stop changes –
+GPS pings alone don't change the page.
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+from models import RouteStop, db
+
+
+@dataclass(frozen=True)
+class RemainingRoute:
+    addresses: tuple[str, ...]        # current start, remaining stops, depot
+    legs_seconds: tuple[int, ...]
+    legs_meters: tuple[int, ...]
+    seconds: int
+    meters: int
+
+
+def save_route(solution, addresses: Sequence[str], legs_seconds: Sequence[int],
+               legs_meters: Sequence[int], pickups: Iterable[tuple[int, str]], *,
+               total_seconds: int | None = None, total_meters: int | None = None) -> None:
+    """
+    Replace *solution*'s stops with the solver's route (caller commits).
+
+    *pickups* are ``(pickup_id, address key)`` pairs for the stops routed;
+    each intermediate address is matched to one of them so later reads go by
+    pickup id. Totals default to the sums of the legs.
+    """
+    unmatched: dict[str, list[int]] = {}
+    for pickup_id, key in pickups:
+        unmatched.setdefault(key, []).append(pickup_id)
+
+    solution.stops.clear()
+    db.session.flush()          # old rows go before new ones reuse (solution_id, seq)
+
+    cum_s = cum_m = 0
+    last = len(addresses) - 1
+    for seq, geo in enumerate(addresses):
+        leg_s = int(legs_seconds[seq - 1]) if 0 < seq <= len(legs_seconds) else 0
+        leg_m = int(legs_meters[seq - 1]) if 0 < seq <= len(legs_meters) else 0
+        cum_s += leg_s
+        cum_m += leg_m
+        ids = unmatched.get(geo) if 0 < seq < last else None
+        solution.stops.append(RouteStop(
+            seq=seq, geo=geo, pickup_id=ids.pop(0) if ids else None,
+            leg_seconds=leg_s, leg_meters=leg_m, cum_seconds=cum_s, cum_meters=cum_m,
+        ))
+    solution.total_seconds = cum_s if total_seconds is None else int(total_seconds)
+    solution.total_distance_meters = cum_m if total_meters is None else int(total_meters)
+
+
+def remaining_stops(stops: Sequence[RouteStop], pending: Iterable[int]) -> tuple[RouteStop, list[RouteStop]]:
+    """
+    ``(last stop passed, stops still ahead)`` for a non-empty route: skip
+    stops at the FRONT whose pickup is no longer in *pending* (ids of the
+    day's Requested pickups). The end depot is always ahead.
+
+    Stops done out of order stay ahead until the ones before them are done,
+    as the driver still passes them.
+    """
+    pending = set(pending)
+    k = 1
+    while k < len(stops) - 1 and stops[k].pickup_id not in pending:
+        k += 1
+    return stops[k - 1], list(stops[k:])
+
+
+def roll_forward(solution, pending: Iterable[int], depot: str,
+                 driver_location: str | None = None) -> RemainingRoute:
+    """
+    What is left of *solution* (see :func:`remaining_stops`), with the legs
+    already driven subtracted. The start is shown as *driver_location* when
+    known. If the depot moved since the solve, the end stop is shown at
+    *depot* and its old leg kept as the estimate until the route is re-solved.
+    """
+    stops = solution.stops
+    if not stops:
+        return RemainingRoute((), (), (), 0, 0)
+
+    done, rest = remaining_stops(stops, pending)
+
+    # rest always ends with the end depot, so this keeps one leg per hop
+    addresses = [driver_location or stops[0].geo] + [s.geo for s in rest[:-1]] + [depot]
+
+    total_m = solution.total_distance_meters or stops[-1].cum_meters
+    return RemainingRoute(
+        addresses=tuple(addresses),
+        legs_seconds=tuple(s.leg_seconds for s in rest),
+        legs_meters=tuple(s.leg_meters for s in rest),
+        seconds=max(0, (solution.total_seconds or 0) - done.cum_seconds),
+        meters=max(0, total_m - done.cum_meters),
+    )
+
+
+def row_state(row) -> tuple:
+    """Every column value of a model instance, for :func:`state_etag`."""
+    return tuple(getattr(row, c.key) for c in row.__table__.columns)
+
+
+def state_etag(*parts: Any) -> str:
+    """Stable hash of *parts* (anything ``json.dumps(default=str)`` can take)."""
+    blob = json.dumps(parts, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:32]
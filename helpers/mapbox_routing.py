@@ -20,25 +20,30 @@ Public API remains compatible with existing callers:
 from __future__ import annotations
 
 import os
+import threading
 import time
 import re
-from collections import defaultdict
-from typing import List, Tuple, Dict
+from typing import TYPE_CHECKING, List, Tuple, Dict
 from urllib.parse import quote_plus
 
 import requests
 from flask import current_app
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from helpers.api_urls import mapbox_url
+
+if TYPE_CHECKING:   # OR-Tools is imported by the solver, not at app boot
+    from ortools.constraint_solver import pywrapcp
 
 ###############################################################################
 # Constants & utilities
 ###############################################################################
 
 MB_PROFILE_DEFAULT = "mapbox/driving"  # 10 coords/call if using *-traffic profiles
-MB_ENDPOINT = "https://api.mapbox.com/directions-matrix/v1"
+MB_ENDPOINT = "/directions-matrix/v1"   # under MAPBOX_API_URL, see helpers/api_urls.py
 FALLBACK_LARGE = 999_999  # penalty for unreachable legs (seconds or meters)
 _REQ_WINDOW_SEC = 60
-_req_ts: defaultdict[str, List[float]] = defaultdict(list)
+_req_ts: List[float] = []                # start times of recent Matrix calls, oldest first
+_req_lock = threading.Lock()             # gthread workers call _ratelimit() concurrently
 _MB_RPM = int(os.getenv("MAPBOX_MATRIX_RPM", "300"))  # Mapbox spec: 300 req/min
 
 
@@ -133,20 +138,26 @@ def _t(label: str):
 
 
 def _ratelimit() -> None:
-    """Sleep just enough to stay below the per-minute cap."""
-    now = time.time()
+    """
+    Sleep just enough to stay below the per-minute cap. The slot is reserved
+    under the lock (a future start time when the window is full) and the
+    sleep happens outside it, so concurrent callers queue up in order.
+    """
     limit = _MB_RPM
-    window = _req_ts["global"]
-    window[:] = [t for t in window if now - t < _REQ_WINDOW_SEC]
-    if len(window) >= limit:
-        sleep_for = _REQ_WINDOW_SEC - (now - window[0]) + 0.05
+    with _req_lock:
+        now = time.time()
+        _req_ts[:] = [t for t in _req_ts if now - t < _REQ_WINDOW_SEC]
+        sleep_for = 0.0
+        if len(_req_ts) >= limit:
+            sleep_for = max(0.0, _REQ_WINDOW_SEC - (now - _req_ts[-limit]) + 0.05)
+        _req_ts.append(now + sleep_for)
+    if sleep_for:
         current_app.logger.warning(
             "Matrix rate-limit hit: sleeping %.1f s to stay under %d rpm",
             sleep_for,
             limit,
         )
         time.sleep(sleep_for)
-    window.append(now)
 
 
 def _coords_like(s: str) -> bool:
@@ -163,7 +174,7 @@ def _maybe_geocode(addr: str, token: str) -> str:
     if _coords_like(addr):
         return addr  # already "lon,lat"
     done = _t(f"Geocoding address '{addr[:40]}…'")
-    url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{quote_plus(addr)}.json"
+    url = mapbox_url(f"/geocoding/v5/mapbox.places/{quote_plus(addr)}.json")
     params = {"limit": 1, "access_token": token}
     r = requests.get(url, params=params, timeout=10)
     r.raise_for_status()
@@ -248,7 +259,7 @@ def fetch_matrices_mapbox(
         coord_str = ";".join(uniq_coords)
         params = {"annotations": "duration,distance", "access_token": token}
         _ratelimit()
-        res = _matrix_get(f"{MB_ENDPOINT}/{profile}/{coord_str}", params)
+        res = _matrix_get(mapbox_url(f"{MB_ENDPOINT}/{profile}/{coord_str}"), params)
         u_dur = _to_int_matrix(res["durations"])
         u_dist = _to_int_matrix(res["distances"])
     else:
@@ -282,7 +293,7 @@ def fetch_matrices_mapbox(
                     "access_token": token,
                 }
                 _ratelimit()
-                res = _matrix_get(f"{MB_ENDPOINT}/{profile}/{coord_str}", params)
+                res = _matrix_get(mapbox_url(f"{MB_ENDPOINT}/{profile}/{coord_str}"), params)
                 _fill(union_idx, res["durations"], res["distances"])
 
     # 4) Expand back to full N×N matrices
@@ -332,9 +343,13 @@ def _solve_tsp_order(
     *,
     start_index: int,
     end_index: int | None,
-    time_limit_sec: int,
+    time_limit_sec: float,
     roundtrip: bool,
+    first_solution: str = "LOCAL_CHEAPEST_INSERTION",
+    metaheuristic: str = "GUIDED_LOCAL_SEARCH",
 ) -> Tuple[List[int], pywrapcp.Assignment | None]:
+    from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
     n = len(cost_matrix)
     if roundtrip:
         manager = pywrapcp.RoutingIndexManager(n, 1, start_index)
@@ -345,8 +360,11 @@ def _solve_tsp_order(
     routing = pywrapcp.RoutingModel(manager)
 
     def transit(i: int, j: int) -> int:
-        # Defensive bounds: never throw into IndexToNode
-        size = routing.Size()
+        # Defensive bounds: never throw into IndexToNode. The vehicle's end
+        # index is >= routing.Size(), so bound by the manager's index count –
+        # otherwise every arc into the end costs the same and the return leg
+        # (or the leg into a fixed end) is ignored by the optimisation.
+        size = manager.GetNumberOfIndices()
         if i < 0 or j < 0 or i >= size or j >= size:
             return BIG_COST
         try:
@@ -360,9 +378,9 @@ def _solve_tsp_order(
     routing.SetArcCostEvaluatorOfAllVehicles(transit_cb)
 
     search = pywrapcp.DefaultRoutingSearchParameters()
-    search.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.LOCAL_CHEAPEST_INSERTION
-    search.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
-    search.time_limit.seconds = max(1, int(time_limit_sec))
+    search.first_solution_strategy = getattr(routing_enums_pb2.FirstSolutionStrategy, first_solution)
+    search.local_search_metaheuristic = getattr(routing_enums_pb2.LocalSearchMetaheuristic, metaheuristic)
+    search.time_limit.FromMilliseconds(max(100, int(time_limit_sec * 1000)))
     # search.log_search = True  # optional
 
     sol = routing.SolveWithParameters(search)
@@ -493,6 +511,39 @@ def compute_optimized_route_with_metrics(
         sr, sc, s_nulls, s_nans, s_infs, s_min, s_max,
     )
 
+    res = solve_route(
+        durations,
+        distances,
+        roundtrip=is_same_depot,
+        optimize_for=optimize_for,
+        time_limit_sec=time_limit_sec,
+    )
+    res["ordered_addresses"] = [addresses[k] for k in res["order_indices"]]
+    return res
+
+
+def solve_route(
+    durations: List[List[int]],
+    distances: List[List[int]],
+    *,
+    roundtrip: bool,
+    optimize_for: str = "distance",
+    time_limit_sec: float = 7,
+    first_solution: str = "LOCAL_CHEAPEST_INSERTION",
+    metaheuristic: str = "GUIDED_LOCAL_SEARCH",
+    polish: bool = True,
+) -> Dict[str, object]:
+    """
+    Order the nodes of already-normalized square matrices. Node 0 is the start;
+    for a path (``roundtrip=False``) the last node is the end.
+
+    The defaults are what `compute_optimized_route_with_metrics` uses;
+    `first_solution` / `metaheuristic` name OR-Tools enum members, so
+    helpers/route_probe.py can benchmark alternatives on the same matrices.
+
+    Returns the same keys as `compute_optimized_route_with_metrics` minus
+    ``ordered_addresses``.
+    """
     # Choose which matrix drives optimization
     cost_matrix = distances if optimize_for == "distance" else durations
 
@@ -500,23 +551,22 @@ def compute_optimized_route_with_metrics(
     order, sol = _solve_tsp_order(
         cost_matrix,
         start_index=0,
-        end_index=(len(addresses) - 1 if not is_same_depot else None),
+        end_index=(len(cost_matrix) - 1 if not roundtrip else None),
         time_limit_sec=time_limit_sec,
-        roundtrip=is_same_depot,
+        roundtrip=roundtrip,
+        first_solution=first_solution,
+        metaheuristic=metaheuristic,
     )
     if not order:
         raise RuntimeError("TSP solver could not find a route within time limit")
 
     # Ensure explicit closure for roundtrip (depot appears at both ends)
-    if is_same_depot and order[0] != order[-1]:
+    if roundtrip and order[0] != order[-1]:
         order.append(order[0])
 
     # 2-opt polish on the chosen objective (distance preferred)
-    order = _two_opt_polish(
-        order,
-        distances if optimize_for == "distance" else durations,
-        roundtrip=is_same_depot,
-    )
+    if polish:
+        order = _two_opt_polish(order, cost_matrix, roundtrip=roundtrip)
 
     # Collect leg metrics in route order
     per_leg_seconds: List[int] = []
@@ -526,16 +576,11 @@ def compute_optimized_route_with_metrics(
         per_leg_seconds.append(durations[i][j])
         per_leg_meters.append(distances[i][j])
 
-    total_duration_seconds = sum(per_leg_seconds)
-    total_distance_meters = sum(per_leg_meters)
-
-    ordered_addresses = [addresses[k] for k in order]
     return {
-        "ordered_addresses": ordered_addresses,
         "per_leg_seconds": per_leg_seconds,
         "per_leg_meters": per_leg_meters,
-        "total_duration_seconds": total_duration_seconds,
-        "total_distance_meters": total_distance_meters,
+        "total_duration_seconds": sum(per_leg_seconds),
+        "total_distance_meters": sum(per_leg_meters),
         "order_indices": order,
     }
 
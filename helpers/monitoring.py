@@ -125,31 +125,43 @@ _404_state = {'count': 0, 'window_start': datetime.now(), 'alerted': False}
 _5xx_state = {'count': 0, 'window_start': datetime.now(), 'alerted': False}
 _slow_state = {'count': 0, 'window_start': datetime.now(), 'alerted': False}
 
+# Request threads of a gthread worker update these concurrently
+_state_lock = threading.Lock()
+
 def _reset_state(state):
     state['count'] = 0
     state['window_start'] = datetime.now()
     state['alerted'] = False
 
+def _count_event(state, window, threshold):
+    """Count one event; returns (count, window_start) the one time an alert is due, else None."""
+    now = datetime.now()
+    with _state_lock:
+        if now - state['window_start'] > window:
+            _reset_state(state)
+        state['count'] += 1
+        if state['count'] >= threshold and not state['alerted']:
+            state['alerted'] = True
+            return state['count'], state['window_start']
+    return None
+
 def _auto_reset_states():
     """Clears 'alerted' flag on stale state windows even without new events."""
     ev = threading.Event()
     while not _stop_event.is_set():
         now = datetime.now()
-        for state in (_404_state, _5xx_state, _slow_state, _440_state):
-            if state['alerted'] and now - state['window_start'] > _WINDOW + _ALERT_RESET_GRACE:
-                _reset_state(state)
+        with _state_lock:
+            for state in (_404_state, _5xx_state, _slow_state, _440_state):
+                if state['alerted'] and now - state['window_start'] > _WINDOW + _ALERT_RESET_GRACE:
+                    _reset_state(state)
         ev.wait(_WINDOW.total_seconds())
 
 def record_404():
-    now = datetime.now()
-    st = _404_state
-    if now - st['window_start'] > _WINDOW:
-        _reset_state(st)
-    st['count'] += 1
-    if st['count'] >= _404_THRESHOLD and not st['alerted']:
-        st['alerted'] = True
+    alert = _count_event(_404_state, _WINDOW, _404_THRESHOLD)
+    if alert:
+        count, window_start = alert
         body = (
-            f"{st['count']} 404 responses from {st['window_start'].isoformat()} to {now.isoformat()}\n"
+            f"{count} 404 responses from {window_start.isoformat()} to {datetime.now().isoformat()}\n"
             f"Example path: {request.path}\n"
             f"IP: {request.remote_addr}"
         )
@@ -170,18 +182,13 @@ _440_WINDOW    = timedelta(hours=1)
 _440_state     = {'count': 0, 'window_start': datetime.now(), 'alerted': False}
 
 def record_440():
-    now = datetime.now()
-    st = _440_state
-    # reset the window if it’s older than one hour
-    if now - st['window_start'] > _440_WINDOW:
-        _reset_state(st)
-    st['count'] += 1
-
-    if st['count'] >= _440_THRESHOLD and not st['alerted']:
-        st['alerted'] = True
+    # the window resets once it’s older than one hour
+    alert = _count_event(_440_state, _440_WINDOW, _440_THRESHOLD)
+    if alert:
+        count, window_start = alert
         body = (
-            f"{st['count']} session‑expired (440) responses between "
-            f"{st['window_start'].isoformat()} and {now.isoformat()}"
+            f"{count} session‑expired (440) responses between "
+            f"{window_start.isoformat()} and {datetime.now().isoformat()}"
         )
         send_error_report(
             error_type   = "440 spike",
@@ -196,15 +203,11 @@ def record_440():
         )
 
 def record_5xx():
-    now = datetime.now()
-    st = _5xx_state
-    if now - st['window_start'] > _WINDOW:
-        _reset_state(st)
-    st['count'] += 1
-    if st['count'] >= _5XX_THRESHOLD and not st['alerted']:
-        st['alerted'] = True
+    alert = _count_event(_5xx_state, _WINDOW, _5XX_THRESHOLD)
+    if alert:
+        count, window_start = alert
         body = (
-            f"{st['count']} 5xx responses from {st['window_start'].isoformat()} to {now.isoformat()}\n"
+            f"{count} 5xx responses from {window_start.isoformat()} to {datetime.now().isoformat()}\n"
             f"Example path: {request.path}\n"
             f"IP: {request.remote_addr}"
         )
@@ -223,16 +226,12 @@ def record_5xx():
 def record_slow(duration):
     if duration < _SLOW_DURATION_THRESHOLD:
         return
-    now = datetime.now()
-    st = _slow_state
-    if now - st['window_start'] > _WINDOW:
-        _reset_state(st)
-    st['count'] += 1
-    if st['count'] >= _SLOW_COUNT_THRESHOLD and not st['alerted']:
-        st['alerted'] = True
+    alert = _count_event(_slow_state, _WINDOW, _SLOW_COUNT_THRESHOLD)
+    if alert:
+        count, window_start = alert
         body = (
-            f"{st['count']} slow responses (>= {_SLOW_DURATION_THRESHOLD}s) "
-            f"from {st['window_start'].isoformat()} to {now.isoformat()}\n"
+            f"{count} slow responses (>= {_SLOW_DURATION_THRESHOLD}s) "
+            f"from {window_start.isoformat()} to {datetime.now().isoformat()}\n"
             f"Example: {duration:.2f}s at {request.path}\n"
             f"IP: {request.remote_addr}"
         )
@@ -1,11 +1,29 @@
+"""MOPF submissions → the 'MOPF Submissions' Google Sheet.
+
+Submissions are not written to the sheet on the request thread. /mopf-submit
+commits a DonationRecord (``sheet_synced_at IS NULL`` = still queued) and calls
+:func:`save_donation_submission`, which only wakes a background flusher. The
+flusher drains the queue in batches – one Sheets call per batch – using a
+cached client/worksheet handle that is re-opened every ``_SHEET_TTL`` seconds
+or after an API error. Anything not yet flushed survives restarts and is picked
+up by the next flush (or ``flask mopf-flush``).
+"""
+from __future__ import annotations
+
 import datetime
 import os
+import threading
+import time
 
-import gspread
+import click
 from flask import current_app
-from gspread.exceptions import WorksheetNotFound
+from flask.cli import with_appcontext
 
 from helpers.google_creds import get_google_credentials
+from helpers.lazy import lazy_import
+from models import DonationRecord, db
+
+gspread = lazy_import("gspread")   # loaded by the flusher, not at boot
 
 
 _MOPF_SHEET_TITLE = "MOPF Submissions"
@@ -22,6 +40,11 @@ _HEADERS = [
     "Submitted At",
 ]
 
+_SHEET_TTL = 15 * 60          # seconds before the cached worksheet is re-opened
+_BATCH_SIZE = 200             # rows per Sheets call
+_FLUSH_INTERVAL = 60          # seconds between idle sweeps of the queue
+_COALESCE_DELAY = 2           # seconds to wait after a wake-up so bursts share a batch
+
 
 def _open_env_spreadsheet() -> gspread.Spreadsheet:
     """Open the environment-tagged spreadsheet used elsewhere in the app."""
@@ -40,7 +63,7 @@ def _get_or_create_mopf_sheet(ss: gspread.Spreadsheet) -> gspread.Worksheet:
     """
     try:
         ws = ss.worksheet(_MOPF_SHEET_TITLE)
-    except WorksheetNotFound:
+    except gspread.exceptions.WorksheetNotFound:
         # Create with a modest default size; gspread auto-expands as needed.
         ws = ss.add_worksheet(title=_MOPF_SHEET_TITLE, rows="50", cols=str(len(_HEADERS)))
         ws.update("A1", [_HEADERS], value_input_option="RAW")
@@ -59,61 +82,163 @@ def _get_or_create_mopf_sheet(ss: gspread.Spreadsheet) -> gspread.Worksheet:
     return ws
 
 
-def save_donation_submission(
-    fname, lname, email, address, address2, city, zip_, donation_date, estimated_value
-):
+# ──────────────────────────────────────────────────────────────────────────
+# Cached worksheet handle
+# ──────────────────────────────────────────────────────────────────────────
+_sheet_lock = threading.Lock()
+_sheet_cache = {"ws": None, "opened_at": 0.0}
+
+
+def _get_worksheet() -> gspread.Worksheet:
+    """Cached worksheet; authorize/open/header-check only once per _SHEET_TTL."""
+    with _sheet_lock:
+        ws = _sheet_cache["ws"]
+        if ws is None or time.monotonic() - _sheet_cache["opened_at"] > _SHEET_TTL:
+            ws = _get_or_create_mopf_sheet(_open_env_spreadsheet())
+            _sheet_cache.update(ws=ws, opened_at=time.monotonic())
+        return ws
+
+
+def _invalidate_worksheet() -> None:
+    with _sheet_lock:
+        _sheet_cache.update(ws=None, opened_at=0.0)
+
+
+def _clean(value) -> str:
+    return "" if value is None else str(value).strip()
+
+
+def _row_values(record: DonationRecord) -> list[str]:
+    submitted = record.submitted_at or datetime.datetime.now()
+    return [
+        _clean(record.firstName),
+        _clean(record.lastName),
+        _clean(record.email),
+        _clean(record.address),
+        _clean(record.secondaryAddress),
+        _clean(record.city),
+        _clean(record.zip),
+        _clean(record.donation_date),
+        _clean(record.estimated_value),
+        submitted.strftime("%Y-%m-%d %H:%M:%S"),
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Queue flush
+# ──────────────────────────────────────────────────────────────────────────
+def flush_pending(batch_size: int = _BATCH_SIZE) -> int:
+    """
+    Write every queued DonationRecord to the sheet, *batch_size* rows per call,
+    and mark them synced. Returns the number of rows written.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers can
+    flush at once without double-writing. Newest submissions stay on top: each
+    batch goes in under the header row, newest first. On an API error the
+    batch stays queued and the cached worksheet is dropped.
     """
-    Append a donation submission to the 'MOPF Submissions' sheet (prepend under header).
+    logger = current_app.logger
+    written = 0
+
+    while True:
+        batch = (
+            DonationRecord.query
+            .filter(DonationRecord.sheet_synced_at.is_(None))
+            .order_by(DonationRecord.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not batch:
+            db.session.commit()
+            break
+
+        try:
+            ws = _get_worksheet()
+            ws.insert_rows([_row_values(r) for r in reversed(batch)],
+                           row=2, value_input_option="RAW")
+        except Exception as e:
+            db.session.rollback()
+            _invalidate_worksheet()
+            logger.exception("[MOPF] Failed to flush %d queued submission(s): %s", len(batch), e)
+            break
+
+        synced_at = datetime.datetime.now()
+        for record in batch:
+            record.sheet_synced_at = synced_at
+        db.session.commit()
+        written += len(batch)
+
+        if len(batch) < batch_size:
+            break
+
+    if written:
+        logger.debug("[MOPF] Flushed %d submission(s) to the sheet.", written)
+    return written
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Background flusher
+# ──────────────────────────────────────────────────────────────────────────
+_wake_event = threading.Event()
+_stop_event = threading.Event()
+_threads = []
+
+
+def _flush_loop(app, interval: float) -> None:
+    while not _stop_event.is_set():
+        if _wake_event.wait(interval):
+            _stop_event.wait(_COALESCE_DELAY)
+        _wake_event.clear()
+        with app.app_context():
+            try:
+                flush_pending()
+            except Exception:
+                app.logger.exception("[MOPF] Flusher iteration failed.")
+            finally:
+                db.session.remove()
+
+
+def start_mopf_flusher(app, interval: float = _FLUSH_INTERVAL) -> None:
+    if _threads:
+        return  # already started
+
+    t = threading.Thread(target=_flush_loop, args=(app, interval), daemon=True)
+    _threads.append(t)
+    t.start()
+
+
+def stop_mopf_flusher():
+    _stop_event.set()
+    _wake_event.set()
+
+
+def save_donation_submission(record: DonationRecord):
+    """
+    Queue a committed DonationRecord for the 'MOPF Submissions' sheet.
 
     Behavior:
     - Uses the same environment-specific spreadsheet as weekly_export().
-    - Ensures the 'MOPF Submissions' sheet exists with canonical headers.
-    - Inserts the new record at row 2 (top of the data, under the header).
-    - Returns a JSON-style dict indicating success/failure.
+    - The record itself is the durable queue entry (sheet_synced_at is NULL
+      until it reaches the sheet); this call only wakes the background flusher.
+    - Returns a JSON-style dict; the actual sheet write happens off-thread.
     """
-    logger = getattr(current_app, "logger", None)
+    _wake_event.set()
+    return {
+        "ok": True,
+        "sheet": _MOPF_SHEET_TITLE,
+        "queued": True,
+        "record_id": record.id,
+    }
 
-    try:
-        ss = _open_env_spreadsheet()
-        ws = _get_or_create_mopf_sheet(ss)
-
-        # Normalize values for consistent storage
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        zip_str = "" if zip_ is None else str(zip_).strip()
-        donation_date_str = "" if donation_date is None else str(donation_date).strip()
-        estimated_value_str = "" if estimated_value is None else str(estimated_value).strip()
-
-        row = [
-            "" if fname is None else str(fname).strip(),
-            "" if lname is None else str(lname).strip(),
-            "" if email is None else str(email).strip(),
-            "" if address is None else str(address).strip(),
-            "" if address2 is None else str(address2).strip(),
-            "" if city is None else str(city).strip(),
-            zip_str,
-            donation_date_str,
-            estimated_value_str,
-            timestamp,
-        ]
-
-        # Insert at the top of the data (row 2). If the sheet is brand-new, header is at row 1.
-        ws.insert_row(row, index=2, value_input_option="RAW")
-
-        if logger:
-            logger.debug("[MOPF] Saved donation submission.")
-
-        return {
-            "ok": True,
-            "sheet": _MOPF_SHEET_TITLE,
-            "inserted_at_row": 2,
-            "submitted_at": timestamp,
-        }
-
-    except Exception as e:
-        if logger:
-            logger.exception("[MOPF] Failed to save donation submission: %s", e)
-        # Keep response shape consistent; callers can jsonify and choose status codes.
-        return {
-            "ok": False,
-            "error": str(e),
-        }
+
+@click.command("mopf-flush")
+@with_appcontext
+def mopf_flush() -> None:
+    """Write any queued MOPF submissions to the Google Sheet now."""
+    click.echo(f"✔ Flushed {flush_pending()} MOPF submission(s).")
+
+
+def register(app):
+    """Attach the CLI command to *app*. Call this from create_app()."""
+    app.cli.add_command(mopf_flush)
@@ -0,0 +1,177 @@
+"""Render cache for the public marketing pages.
+
+Pages like ``/`` and ``/about`` only change on deploy, yet every hit renders
+the full Jinja tree. :func:`render_cached` renders a page once per process
+(per path) with placeholders where the per-response values go – Talisman's
+CSP nonce and, on pages with forms, the CSRF token – and on each hit just
+substitutes them into the stored HTML.
+
+The stored copy is shared by every visitor, so it is rendered against
+``SITE_URL`` rather than the request's Host header: absolute URLs in it
+(``request.url``, ``url_for(..., _external=True)``) always point at the
+real site, and a client can neither poison it nor add entries by sending
+made-up hosts.
+
+Pages without a CSRF token also get a weak ``ETag`` and ``Last-Modified`` so
+browsers revalidate with a conditional GET and get a bodiless 304. A 304 must
+not carry a fresh CSP header – the browser would pair the new nonce with the
+cached HTML's old one and block every script – so ``init_app`` strips it.
+
+Bypassed when the request has a query string or pending flash messages, and
+disabled in debug mode (templates reload there).
+
+Usage::
+
+    @app.route("/about")
+    @cacheable_page
+    def about():
+        return render_cached("about.html")
+
+``warm(app)`` renders every ``@cacheable_page`` view for ``SITE_URL`` at boot.
+"""
+import hashlib
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property, wraps
+
+from flask import Flask, current_app, g, make_response, render_template, request, session
+from flask_wtf.csrf import generate_csrf
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+
+_NONCE_MARK = "__ekolinq_csp_nonce__"
+_CSRF_MARK = "__ekolinq_csrf_token__"
+
+
+@dataclass(frozen=True)
+class _Page:
+    html: str
+    etag: str
+    rendered_at: datetime
+    has_csrf: bool
+
+    @cached_property
+    def validators(self) -> dict:
+        """Conditional-GET headers; none for per-session (CSRF) pages."""
+        if self.has_csrf:
+            return {}
+        return {"ETag": quote_etag(self.etag, weak=True),
+                "Last-Modified": http_date(self.rendered_at),
+                "Cache-Control": "no-cache"}          # always revalidate
+
+
+_pages: dict[tuple, _Page] = {}
+_lock = threading.Lock()
+
+
+def _enabled() -> bool:
+    return current_app.config.get("PAGE_CACHE_ENABLED", not current_app.debug)
+
+
+@contextmanager
+def _site_request():
+    """This request's path as seen at ``SITE_URL`` (the live request without one)."""
+    site_url = current_app.config.get("SITE_URL")
+    if not site_url:
+        yield
+        return
+    with current_app.test_request_context(request.path, base_url=site_url):
+        yield
+
+
+def _render_template_only(template: str, context: dict) -> _Page:
+    """Render with placeholders in place of the nonce and CSRF token."""
+    real_nonce = getattr(request, "csp_nonce", None)
+    real_csrf = g.pop("csrf_token", None)
+    g.csrf_token = _CSRF_MARK
+    try:
+        with _site_request():
+            request.csp_nonce = _NONCE_MARK
+            html = render_template(template, **context)
+    finally:
+        request.csp_nonce = real_nonce
+        g.pop("csrf_token", None)
+        if real_csrf is not None:
+            g.csrf_token = real_csrf
+    if real_csrf:
+        # A FlaskForm built in the view already holds this visitor's token.
+        html = html.replace(real_csrf, _CSRF_MARK)
+    return _Page(
+        html=html,
+        etag=hashlib.sha256(html.encode()).hexdigest()[:32],
+        rendered_at=datetime.now(timezone.utc).replace(microsecond=0),
+        has_csrf=_CSRF_MARK in html,
+    )
+
+
+def render_cached(template: str, *, vary: tuple = (), **context):
+    """
+    Drop-in for ``render_template`` on pages whose output depends only on the
+    URL (plus *vary*, e.g. today's date). Returns a Response.
+    """
+    if not _enabled() or request.query_string or session.get("_flashes"):
+        return make_response(render_template(template, **context))
+
+    key = (request.endpoint, request.path, template, *vary)
+    page = _pages.get(key)
+    if page is None:
+        page = _render_template_only(template, context)
+        with _lock:
+            _pages[key] = page
+
+    validators = page.validators
+    if validators and not is_resource_modified(
+            request.environ, etag=page.etag, last_modified=page.rendered_at):
+        return current_app.response_class(status=304, headers=validators)
+
+    html = page.html.replace(_NONCE_MARK, getattr(request, "csp_nonce", None) or "")
+    if page.has_csrf:
+        html = html.replace(_CSRF_MARK, generate_csrf())
+    resp = make_response(html)
+    resp.headers.update(validators)
+    return resp
+
+
+def cacheable_page(view):
+    """Mark *view* (which returns render_cached(...)) for :func:`warm`."""
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        return view(*args, **kwargs)
+    wrapped.page_cache = True
+    return wrapped
+
+
+def clear() -> None:
+    with _lock:
+        _pages.clear()
+
+
+def warm(app: Flask) -> int:
+    """Render every @cacheable_page view (no URL params) once; returns the count."""
+    base_url = app.config.get("SITE_URL") or "http://localhost/"
+    warmed = 0
+    for rule in app.url_map.iter_rules():
+        view = app.view_functions.get(rule.endpoint)
+        if not getattr(view, "page_cache", False) or rule.arguments:
+            continue
+        with app.test_request_context(rule.rule, base_url=base_url):
+            try:
+                view()
+                warmed += 1
+            except Exception as e:          # a broken page shouldn't block boot
+                app.logger.warning("page cache: could not warm %s: %s", rule.rule, e)
+    return warmed
+
+
+def init_app(app: Flask) -> None:
+    """
+    Register the 304 clean-up. Call *before* Talisman(app): after_request
+    hooks run in reverse order, so this one then sees Talisman's headers.
+    """
+    @app.after_request
+    def _strip_csp_from_304(response):
+        if response.status_code == 304:
+            response.headers.pop("Content-Security-Policy", None)
+            response.headers.pop("Content-Security-Policy-Report-Only", None)
+        return response
@@ -0,0 +1,125 @@
+"""Pre-fork warm-up and per-worker setup for gunicorn ``--preload``.
+
+With ``preload_app`` the master builds the app once and forks workers from it,
+so anything computed before the fork is shared copy-on-write: compiled Jinja
+templates, the rendered marketing pages, langdetect's language profiles, the
+service-area index and the booking calendar. Things that must *not* be
+shared – DB connections, Redis sockets, threads – are reset or started in each
+worker instead.
+
+gunicorn.conf.py wires these up:
+
+* ``warm(app)``          – in the master, right after create_app()
+* ``after_fork(app)``    – post_fork: drop inherited pools
+* ``worker_ready(app)``  – post_worker_init: start threads, log RSS/boot time
+"""
+import gc
+import os
+import time
+
+from flask import Flask
+
+from models import db
+
+#: Set by gunicorn.conf.py so create_app() leaves thread start-up to the workers.
+MANAGED_ENV = "GUNICORN_MANAGED_THREADS"
+
+
+def threads_managed_externally() -> bool:
+    return os.getenv(MANAGED_ENV) == "1"
+
+
+def warm(app: Flask) -> None:
+    """Build shared read-only state in the master before workers fork."""
+    t0 = time.perf_counter()
+    log = app.logger
+
+    env = app.jinja_env
+    names = [n for n in env.list_templates() if n.endswith((".html", ".xml", ".txt"))]
+    for name in names:
+        try:
+            env.get_template(name)
+        except Exception as e:               # a broken template shouldn't block boot
+            log.warning("prefork: could not compile %s: %s", name, e)
+
+    try:
+        from langdetect.detector_factory import init_factory
+        init_factory()
+    except ImportError:
+        pass
+
+    from helpers.page_cache import warm as warm_pages
+    pages = warm_pages(app)
+
+    with app.app_context():
+        try:
+            from helpers.scheduling import build_schedule
+            from helpers.service_area import service_areas
+            service_areas()
+            build_schedule(0)
+        except Exception as e:
+            log.warning("prefork: skipped DB-backed caches: %s", e)
+        finally:
+            db.session.remove()
+            # No connection may cross the fork; workers open their own.
+            db.engine.dispose()
+
+    # Move everything allocated so far out of the GC's reach so collections in
+    # the workers don't touch (and un-share) those pages.
+    gc.collect()
+    gc.freeze()
+
+    log.info("prefork: warmed %d templates, %d pages and caches in %.0f ms",
+             len(names), pages, (time.perf_counter() - t0) * 1000)
+
+
+def _reset_redis_pool(client) -> None:
+    pool = getattr(client, "connection_pool", None)
+    if pool is not None:
+        pool.reset()       # forget the parent's sockets without closing them
+
+
+def after_fork(app: Flask) -> None:
+    """Drop per-process resources inherited from the master."""
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    # Sessions and rate limits share this one pool (helpers.redis_pool).
+    _reset_redis_pool(app.extensions.get("redis"))
+
+
+def start_background_threads(app: Flask) -> None:
+    from helpers.auth import start_jwks_refresher
+    from helpers.monitoring import start_monitoring_threads
+    from helpers.mopf import start_mopf_flusher
+
+    start_monitoring_threads()
+    start_mopf_flusher(app)
+    start_jwks_refresher(app)
+
+
+def memory_usage() -> dict[str, float]:
+    """RSS/PSS/shared MiB for this process (Linux smaps_rollup; RSS elsewhere)."""
+    fields = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared", "Shared_Dirty": "shared"}
+    usage = {"rss": 0.0, "pss": 0.0, "shared": 0.0}
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            for line in fh:
+                key, _, rest = line.partition(":")
+                if key in fields:
+                    usage[fields[key]] += int(rest.split()[0]) / 1024
+    except OSError:
+        import resource
+        usage["rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return usage
+
+
+def worker_ready(app: Flask, forked_at: float | None) -> None:
+    """Start this worker's threads and log its boot time and memory."""
+    start_background_threads(app)
+    mem = memory_usage()
+    boot_ms = (time.monotonic() - forked_at) * 1000 if forked_at else float("nan")
+    app.logger.info(
+        "worker %d ready in %.0f ms: rss=%.1f MiB pss=%.1f MiB shared=%.1f MiB",
+        os.getpid(), boot_ms, mem["rss"], mem["pss"], mem["shared"],
+    )
@@ -0,0 +1,239 @@
+"""Per-request SQL query counts, timings and repeated-statement (N+1) detection.
+
+``init_app(app)`` hooks SQLAlchemy's ``before_cursor_execute`` /
+``after_cursor_execute`` engine events. While a request is running every
+statement is timed and fingerprinted (literals -> ``?``, ``IN (…)`` lists
+collapsed), and when the request ends:
+
+* a DEBUG log line gives the count and total time; a WARNING names any
+  fingerprint run ``REPEAT_THRESHOLD``+ times (a loop issuing one query per
+  row – the N+1 pattern) and views that went over their declared budget;
+* in development (``app.debug`` or ``QUERY_STATS_HEADERS``) the response
+  carries ``X-DB-Queries``, ``X-DB-Time-Ms`` and ``X-DB-Repeated``;
+* per-endpoint totals accumulate process-wide in :func:`stats`, served with
+  the Redis numbers on ``/admin/metrics``.
+
+Views declare a budget with ``@query_budget(n)``; tests check it with
+:func:`assert_query_budget`, or any block with :func:`assert_max_queries`.
+"""
+from __future__ import annotations
+
+import contextvars
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from flask import Flask, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REPEAT_THRESHOLD = 3
+
+_WS = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_BINDS = re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape with literals and parameter styles normalised to ``?``."""
+    s = _WS.sub(" ", statement).strip()
+    s = _STRING.sub("?", s)
+    s = _BINDS.sub("?", s)
+    s = _NUMBER.sub("?", s)
+    return _IN_LIST.sub("IN (?…)", s)
+
+
+@dataclass
+class QueryLog:
+    """Statements seen in one request (or one :func:`capture_queries` block)."""
+    count: int = 0
+    seconds: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> dict[str, int]:
+        """Fingerprints run at least *threshold* times, most frequent first."""
+        return {fp: n for fp, n in self.fingerprints.most_common() if n >= threshold}
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries, {self.seconds * 1000:.1f} ms"]
+        lines += [f"  {n}x {fp}" for fp, n in self.fingerprints.most_common()]
+        return "\n".join(lines)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Engine events
+# ──────────────────────────────────────────────────────────────────────────
+_request_log: contextvars.ContextVar = contextvars.ContextVar("query_log", default=None)
+_captures: list[QueryLog] = []          # assert_max_queries/capture_queries blocks
+_captures_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["_query_start"].pop()
+    elapsed = time.perf_counter() - started
+    log = _request_log.get()
+    if log is not None:
+        log.add(statement, elapsed)
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.add(statement, elapsed)
+
+
+def install() -> None:
+    """Listen on every Engine (idempotent); init_app() calls this."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Process-wide per-endpoint totals
+# ──────────────────────────────────────────────────────────────────────────
+_totals: dict[str, dict] = {}
+_totals_lock = threading.Lock()
+
+
+def _accumulate(endpoint: str, log: QueryLog, repeated: dict) -> None:
+    with _totals_lock:
+        t = _totals.setdefault(endpoint, {"requests": 0, "queries": 0, "seconds": 0.0,
+                                          "max_queries": 0, "repeated_requests": 0})
+        t["requests"] += 1
+        t["queries"] += log.count
+        t["seconds"] += log.seconds
+        t["max_queries"] = max(t["max_queries"], log.count)
+        t["repeated_requests"] += bool(repeated)
+
+
+def stats() -> dict:
+    """Per-endpoint totals since start-up, plus mean queries per request."""
+    with _totals_lock:
+        return {endpoint: {**t, "mean_queries": round(t["queries"] / t["requests"], 2)}
+                for endpoint, t in sorted(_totals.items())}
+
+
+def reset() -> None:
+    with _totals_lock:
+        _totals.clear()
+
+
+def request_log() -> QueryLog | None:
+    """Queries so far in the current request (None outside one)."""
+    return _request_log.get()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Budgets and test helpers
+# ──────────────────────────────────────────────────────────────────────────
+def query_budget(max_queries: int):
+    """Declare how many queries a view may run; exceeding it logs a WARNING."""
+    def decorator(view):
+        view.query_budget = max_queries      # functools.wraps carries it through outer decorators
+        return view
+    return decorator
+
+
+@contextmanager
+def capture_queries():
+    """Collect every statement run inside the block, on any engine or thread."""
+    install()
+    log = QueryLog()
+    with _captures_lock:
+        _captures.append(log)
+    try:
+        yield log
+    finally:
+        with _captures_lock:
+            _captures.remove(log)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, *, max_repeats: int | None = None):
+    """Fail if the block runs more than *max_queries* statements, or any one
+    fingerprint more than *max_repeats* times."""
+    with capture_queries() as log:
+        yield log
+    assert log.count <= max_queries, (
+        f"expected at most {max_queries} queries, ran {log.summary()}")
+    if max_repeats is not None:
+        worst = max(log.fingerprints.values(), default=0)
+        assert worst <= max_repeats, (
+            f"a statement ran {worst}x (max {max_repeats}): {log.summary()}")
+
+
+def assert_query_budget(client, path: str, *, budget: int | None = None,
+                        method: str = "GET", max_repeats: int | None = REPEAT_THRESHOLD - 1,
+                        **request_kwargs):
+    """Request *path* and check it against *budget* – by default the
+    ``@query_budget`` of the view that served it. Returns the response."""
+    with capture_queries() as log:
+        response = client.open(path, method=method, **request_kwargs)
+    app = client.application
+    if budget is None:
+        adapter = app.url_map.bind("localhost")
+        endpoint, _ = adapter.match(path.split("?", 1)[0], method=method)
+        budget = getattr(app.view_functions[endpoint], "query_budget", None)
+        assert budget is not None, f"{endpoint} declares no @query_budget"
+    assert log.count <= budget, f"{method} {path}: budget {budget}, ran {log.summary()}"
+    if max_repeats is not None:
+        worst = max(log.fingerprints.values(), default=0)
+        assert worst <= max_repeats, (
+            f"{method} {path}: a statement ran {worst}x (N+1?): {log.summary()}")
+    return response
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# App wiring
+# ──────────────────────────────────────────────────────────────────────────
+def init_app(app: Flask) -> None:
+    install()
+    show_headers = app.config.get("QUERY_STATS_HEADERS", app.debug)
+
+    @app.before_request
+    def _start_query_log():
+        _request_log.set(QueryLog())
+
+    @app.after_request
+    def _query_headers(response):
+        log = _request_log.get()
+        if show_headers and log is not None:
+            response.headers["X-DB-Queries"] = str(log.count)
+            response.headers["X-DB-Time-Ms"] = f"{log.seconds * 1000:.1f}"
+            response.headers["X-DB-Repeated"] = str(len(log.repeated()))
+        return response
+
+    @app.teardown_request
+    def _finish_query_log(_exc=None):
+        log = _request_log.get()
+        _request_log.set(None)
+        if log is None:
+            return
+
+        endpoint = request.endpoint or "<unmatched>"
+        repeated = log.repeated()
+        _accumulate(endpoint, log, repeated)
+        if log.count:
+            app.logger.debug("db: %s ran %d queries in %.1f ms",
+                             endpoint, log.count, log.seconds * 1000)
+        for fp, n in repeated.items():
+            app.logger.warning("db: %s ran the same statement %dx (N+1?): %s",
+                               endpoint, n, fp[:200])
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, "query_budget", None)
+        if budget is not None and log.count > budget:
+            app.logger.warning("db: %s ran %d queries, over its budget of %d",
+                               endpoint, log.count, budget)
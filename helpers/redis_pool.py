@@ -0,0 +1,132 @@
+"""One pooled Redis client per process, shared by sessions and rate limits.
+
+``init_app(app)`` builds a single ``redis.ConnectionPool`` from
+``UPSTASH_TLS_URL`` (TLS keep-alive, short timeouts, health checks) and hands
+it to Flask-Session (``SESSION_REDIS``) and Flask-Limiter
+(``RATELIMIT_STORAGE_OPTIONS["connection_pool"]``). Other code that needs
+Redis should use :func:`get_redis` rather than opening its own connection.
+
+Every socket round trip and the time spent waiting on Redis is counted, both
+per request (logged at DEBUG when the request ends) and process-wide
+(:func:`stats`). A pipeline counts as one round trip.
+"""
+import contextvars
+import threading
+import time
+
+import redis
+from flask import Flask, current_app
+from redis.connection import Connection, SSLConnection
+
+_POOL_DEFAULTS = {
+    "max_connections": 20,
+    "socket_timeout": 2.0,
+    "socket_connect_timeout": 2.0,
+    "socket_keepalive": True,
+    "health_check_interval": 30,
+    "retry_on_timeout": True,
+}
+
+# ──────────────────────────────────────────────────────────────────────────
+# Instrumentation
+# ──────────────────────────────────────────────────────────────────────────
+_request_stats: contextvars.ContextVar = contextvars.ContextVar("redis_request_stats", default=None)
+_totals = {"round_trips": 0, "seconds": 0.0}
+_totals_lock = threading.Lock()
+
+
+def _record(seconds: float, round_trip: bool) -> None:
+    per_request = _request_stats.get()
+    if per_request is not None:
+        per_request["seconds"] += seconds
+        per_request["round_trips"] += round_trip
+    with _totals_lock:
+        _totals["seconds"] += seconds
+        _totals["round_trips"] += round_trip
+
+
+class _TimedConnectionMixin:
+    def send_packed_command(self, command, check_health=True):
+        t0 = time.perf_counter()
+        try:
+            return super().send_packed_command(command, check_health)
+        finally:
+            _record(time.perf_counter() - t0, round_trip=True)
+
+    def read_response(self, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return super().read_response(*args, **kwargs)
+        finally:
+            _record(time.perf_counter() - t0, round_trip=False)
+
+
+class TimedConnection(_TimedConnectionMixin, Connection):
+    pass
+
+
+class TimedSSLConnection(_TimedConnectionMixin, SSLConnection):
+    pass
+
+
+def stats() -> dict:
+    """Process-wide totals since start-up: {"round_trips": n, "seconds": s}."""
+    with _totals_lock:
+        return dict(_totals)
+
+
+def request_stats() -> dict | None:
+    """Round trips/seconds so far in the current request (None outside one)."""
+    current = _request_stats.get()
+    return dict(current) if current is not None else None
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Pool
+# ──────────────────────────────────────────────────────────────────────────
+def build_pool(url: str, **overrides) -> redis.ConnectionPool:
+    pool = redis.ConnectionPool.from_url(url, **{**_POOL_DEFAULTS, **overrides})
+    pool.connection_class = (TimedSSLConnection if issubclass(pool.connection_class, SSLConnection)
+                             else TimedConnection)
+    return pool
+
+
+def init_app(app: Flask) -> redis.Redis | None:
+    """
+    Create the shared client for *app* (None when no Redis URL is configured,
+    e.g. in development) and wire sessions/rate limits to it.
+    Must run before Session().init_app and limiter.init_app.
+    """
+    url = app.config.get("UPSTASH_TLS_URL")
+    if url:
+        pool = build_pool(url, max_connections=app.config.get(
+            "REDIS_MAX_CONNECTIONS", _POOL_DEFAULTS["max_connections"]))
+        client = redis.Redis(connection_pool=pool)
+        app.extensions["redis"] = client
+
+        if app.config.get("SESSION_TYPE") == "redis":
+            app.config["SESSION_REDIS"] = client
+        options = dict(app.config.get("RATELIMIT_STORAGE_OPTIONS") or {})
+        options["connection_pool"] = pool
+        app.config["RATELIMIT_STORAGE_OPTIONS"] = options
+    else:
+        client = None
+
+    @app.before_request
+    def _start_redis_stats():
+        _request_stats.set({"round_trips": 0, "seconds": 0.0})
+
+    @app.teardown_request
+    def _log_redis_stats(_exc=None):
+        per_request = _request_stats.get()
+        if per_request and per_request["round_trips"]:
+            app.logger.debug("redis: %d round trip(s), %.1f ms",
+                             per_request["round_trips"], per_request["seconds"] * 1000)
+        _request_stats.set(None)
+
+    return client
+
+
+def get_redis() -> redis.Redis | None:
+    """The current app's shared client, or None if Redis isn't configured."""
+    return current_app.extensions.get("redis")
@@ -0,0 +1,190 @@
+"""Live route updates for the driver's page, streamed as Server-Sent Events.
+
+Writers call :func:`publish` after committing a change::
+
+    route_events.publish(date, "stop", {"pickup_id": 7, "status": "Complete"})
+
+and ``/live-route/events?date=…`` streams it to every open page for that day
+(:func:`stream`). Fan-out inside a process is a :class:`Broker` of bounded
+queues. With Redis configured, ``publish`` goes to a pub/sub channel instead
+and one relay thread per process (started with its first subscriber) feeds
+the local broker, so a change made in one gunicorn worker reaches pages
+streaming from another.
+
+A stream holds one thread of a ``gthread`` worker, never a whole worker, and
+a process serves at most ``ROUTE_EVENTS_MAX_STREAMS`` at once (the rest get
+a 503 and fall back to reloading). Streams end after ``max_seconds``; the
+browser's EventSource reconnects by itself.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+CHANNEL_PREFIX = "route-events:"
+KEEPALIVE_SECONDS = 15.0
+MAX_STREAM_SECONDS = 300.0
+_QUEUE_SIZE = 100
+
+log = logging.getLogger(__name__)
+
+
+class TooManyStreams(Exception):
+    pass
+
+
+@dataclass(eq=False)
+class Subscription:
+    date: str
+    broker: "Broker"
+    events: queue.Queue = field(default_factory=lambda: queue.Queue(_QUEUE_SIZE))
+
+    def get(self, timeout: float) -> str | None:
+        """Next encoded event, or None after *timeout* seconds."""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """In-process fan-out of encoded events to the subscribers of a date."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subs: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, date: str, limit: int | None = None) -> Subscription:
+        sub = Subscription(date, self)
+        with self._lock:
+            if limit is not None and self._count() >= limit:
+                raise TooManyStreams(f"{limit} live route streams already open")
+            self._subs.setdefault(date, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subs.get(sub.date)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.date]
+
+    def deliver(self, date: str, message: str) -> int:
+        with self._lock:
+            subs = list(self._subs.get(date, ()))
+        for sub in subs:
+            try:
+                sub.events.put_nowait(message)
+            except queue.Full:           # a stalled client; it reloads on reconnect
+                log.warning("route events: dropped an event for a slow %s stream", date)
+        return len(subs)
+
+    def _count(self) -> int:
+        return sum(len(s) for s in self._subs.values())
+
+    def count(self) -> int:
+        with self._lock:
+            return self._count()
+
+
+_broker = Broker()
+
+
+def encode(event: str, data: dict) -> str:
+    """One SSE frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Redis relay
+# ──────────────────────────────────────────────────────────────────────────
+_relay: threading.Thread | None = None
+_relay_lock = threading.Lock()
+
+
+def _relay_loop(client) -> None:
+    backoff = 1.0
+    while True:
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            backoff = 1.0
+            while True:
+                msg = pubsub.get_message(timeout=1.0)
+                if msg and msg["type"] == "pmessage":
+                    channel, data = msg["channel"], msg["data"]
+                    if isinstance(channel, bytes):
+                        channel, data = channel.decode(), data.decode()
+                    _broker.deliver(channel[len(CHANNEL_PREFIX):], data)
+        except Exception as e:
+            log.warning("route events: Redis relay failed (%s); retrying in %.0fs", e, backoff)
+        finally:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 30.0)
+
+
+def _ensure_relay(client) -> None:
+    global _relay
+    with _relay_lock:
+        if _relay is None or not _relay.is_alive():
+            _relay = threading.Thread(target=_relay_loop, args=(client,),
+                                      name="route-events-relay", daemon=True)
+            _relay.start()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Public API (app context required)
+# ──────────────────────────────────────────────────────────────────────────
+def _redis():
+    from helpers.redis_pool import get_redis
+    return get_redis()
+
+
+def publish(date: str, event: str, data: dict) -> None:
+    """Send *event* to every page streaming *date*. Call after committing."""
+    message = encode(event, data)
+    client = _redis()
+    if client is not None:
+        try:
+            client.publish(f"{CHANNEL_PREFIX}{date}", message)
+            return
+        except Exception as e:
+            log.warning("route events: Redis publish failed (%s); delivering locally", e)
+    _broker.deliver(date, message)
+
+
+def subscribe(date: str, limit: int | None = None) -> Subscription:
+    """Raises :class:`TooManyStreams` when *limit* streams are already open."""
+    sub = _broker.subscribe(date, limit)
+    client = _redis()
+    if client is not None:
+        _ensure_relay(client)
+    return sub
+
+
+def stream(sub: Subscription, *, keepalive: float = KEEPALIVE_SECONDS,
+           max_seconds: float = MAX_STREAM_SECONDS):
+    """SSE body for *sub*; unsubscribes when done or when the client goes away."""
+    try:
+        yield "retry: 3000\n\n"
+        deadline = time.monotonic() + max_seconds
+        while (left := deadline - time.monotonic()) > 0:
+            message = sub.get(timeout=min(keepalive, left))
+            yield message if message is not None else ": keepalive\n\n"
+        yield encode("reconnect", {})
+    finally:
+        sub.close()
+
+
+def stats() -> dict:
+    return {"streams": _broker.count(), "relay": bool(_relay and _relay.is_alive())}
@@ -1,209 +1,306 @@
 #!/usr/bin/env python3
+"""Routing benchmark and regression suite – fully offline.
+
+Usage (from the repo root)::
+
+    python -m helpers.route_probe                         # full grid -> route_probe.json
+    python -m helpers.route_probe --sizes 5,25 --configs production,greedy
+    python -m helpers.route_probe --baseline benchmarks/route_probe_baseline.json
+    python -m helpers.route_probe --update-baseline benchmarks/route_probe_baseline.json
+
+Stop sets are synthetic and seeded: ``uniform`` (anywhere in the service
+area) and ``clustered`` (tight knots around two or three service ZIPs), from
+5 to 300 stops, always starting and ending at the depot. Matrices come from
+the production fetcher, ``fetch_matrices_mapbox``, talking to
+``helpers.geo_standin`` – so the chunking/API-call count is the real one and
+nothing leaves the machine. ``--record DIR`` saves each case's matrices and
+``--cases DIR`` replays saved ones instead (record against the live API with
+``--live`` to benchmark on real road times).
+
+Every case is solved with every :data:`CONFIGS` entry through
+``mapbox_routing.solve_route``. Per run the JSON has wall time, matrix fetch
+time, API calls, tour meters/seconds and the gap to the best tour known for
+that case (this run or the baseline).
+
+With ``--baseline`` the run exits 1 if any (case, config) got a longer tour
+than ``--cost-tol`` allows, needed more API calls, or took more than
+``--time-tol`` longer – so CI can gate on it.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
 import os
+import platform
+import random
 import sys
-import math
-import logging
-from typing import List, Tuple, Optional
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
 
-import requests
-from flask import Flask, current_app
+from flask import Flask
 
-# Import your production helper so behavior matches the site.
-from mapbox_routing import compute_optimized_route
+import helpers.mapbox_routing as mapbox_routing
+from helpers.geo_standin import GeoStandin
+from helpers.mapbox_routing import fetch_matrices_mapbox, solve_route
 
 # ----------------------------------------------------------------------
-# Config (hardcoded per your notes)
+# Scenario space
 # ----------------------------------------------------------------------
 DEPOT = "5389 Mallard Dr., Pleasanton, CA 94566"  # start == end
+DEPOT_LONLAT = (-121.8885, 37.6603)
 
-# ADDRESSES = [
-#     "2436 Rivers Bend Circle, Livermore CA",
-#     "3103 Belmont Court, Livermore, California 94550, United States",
-#     "3531 Germaine Way, Livermore, California 94550, United States",
-#     "4057 Sherry Court, Pleasanton, California 94566, United States",
-#     "227 Mission Drive, Pleasanton, California 94566, United States",
-#     "5786 Shadow Ridge Court, Pleasanton, California 94566, United States",
-#     "31 Castledown Road, Pleasanton, California 94566, United States",
-#     "3341 Medallion Court, Pleasanton, California 94588, United States",
-#     "4639 Sandalwood Drive, Pleasanton, California 94588, United States",
-#     "8401 Tiger Lily Drive, San Ramon, California 94582, United States",
-#     "704 Brookside Drive, Danville, California 94526, United States",
-#     "333 Andora Lane, San Ramon, California 94583, United States",
-#     "123 Enchanted Way, San Ramon, California 94583, United States",
-#     "627 Hardcastle Court, San Ramon, California 94583, United States",
-#     "3580 Ballantyne Drive, Pleasanton, California 94588, United States",
-#     "4007 Suffolk Way, Pleasanton, California 94588, United States",
-#     "3545 Dickens Court, Pleasanton, California 94588, United States",
-#     "2130 Camino Brazos, Pleasanton, California 94566, United States",
-#     "5489 Blackbird Drive, Pleasanton, California 94566, United States",
-# ]
-
-ADDRESSES = [
-    "4326 Quail Run Lane, Danville, CA",
-    "536 Sonoma Ave, Livermore, CA",
-    "2678 Willowren Way, Pleasanton, CA",
-    "5489 Blackbird Drive, Pleasanton, CA",
-    "5786 Shadow Ridge Court, Pleasanton, CA",
-    "151 Bolla Avenue, Alamo, CA",
-    "123 Enchanted Way, San Ramon, CA",
-    "333 Andora Lane, San Ramon, CA",
-    "1346 Aster Lane, Livermore, CA"
-]
+# Approximate centroids of the ZIPs in the service_areas seed migration.
+SERVICE_ZIPS = {
+    "94566": (-121.8707, 37.6524),   # Pleasanton
+    "94588": (-121.8950, 37.6921),   # Pleasanton
+    "94568": (-121.9124, 37.7159),   # Dublin
+    "94550": (-121.7570, 37.6819),   # Livermore
+    "94551": (-121.7560, 37.7180),   # Livermore
+    "94582": (-121.9180, 37.7660),   # San Ramon
+    "94583": (-121.9700, 37.7700),   # San Ramon
+    "94506": (-121.9300, 37.8120),   # Danville
+    "94526": (-121.9870, 37.8130),   # Danville
+    "94507": (-122.0330, 37.8500),   # Alamo
+}
 
+SIZES = (5, 10, 25, 50, 100, 200, 300)
+LAYOUTS = ("uniform", "clustered")
 PROFILE = "mapbox/driving"
-TIME_LIMIT_SEC = 25
+
+
+@dataclass(frozen=True)
+class SolverConfig:
+    name: str
+    first_solution: str
+    metaheuristic: str
+    polish: bool = True
+    optimize_for: str = "distance"
+
+
+CONFIGS = {c.name: c for c in (
+    # What compute_optimized_route runs in production.
+    SolverConfig("production", "LOCAL_CHEAPEST_INSERTION", "GUIDED_LOCAL_SEARCH"),
+    SolverConfig("production-no-polish", "LOCAL_CHEAPEST_INSERTION", "GUIDED_LOCAL_SEARCH",
+                 polish=False),
+    # Stops at the first local optimum: the fast end of the trade-off.
+    SolverConfig("greedy", "PATH_CHEAPEST_ARC", "GREEDY_DESCENT"),
+    SolverConfig("savings-tabu", "SAVINGS", "TABU_SEARCH"),
+)}
+
+
+@dataclass
+class Case:
+    name: str
+    layout: str
+    size: int
+    coords: list[str]                 # "lon,lat"; [0] is the depot
+    durations: list[list[int]] | None = None
+    distances: list[list[int]] | None = None
+    api_calls: int = 0
+    fetch_s: float = 0.0
+
+
+def generate_stops(layout: str, size: int, seed: int = 0) -> list[tuple[float, float]]:
+    """Deterministic (lon, lat) stops over the service ZIPs."""
+    rng = random.Random(f"{layout}:{size}:{seed}")
+    zips = list(SERVICE_ZIPS.values())
+    km_lat, km_lon = 1 / 111.0, 1 / (111.0 * math.cos(math.radians(37.7)))
+
+    if layout == "uniform":
+        centers, spread_km = [rng.choice(zips) for _ in range(size)], 1.8
+    elif layout == "clustered":
+        knots = rng.sample(zips, rng.randint(2, 3))
+        centers, spread_km = [rng.choice(knots) for _ in range(size)], 0.5
+    else:
+        raise ValueError(f"unknown layout {layout!r}")
+    return [(round(lon + rng.gauss(0, spread_km) * km_lon, 6),
+             round(lat + rng.gauss(0, spread_km) * km_lat, 6)) for lon, lat in centers]
+
+
+def synthetic_cases(sizes, layouts) -> list[Case]:
+    depot = f"{DEPOT_LONLAT[0]},{DEPOT_LONLAT[1]}"
+    return [Case(f"{layout}-{size}", layout, size,
+                 [depot] + [f"{lon},{lat}" for lon, lat in generate_stops(layout, size)])
+            for layout in layouts for size in sizes]
+
+
+def load_cases(directory: Path) -> list[Case]:
+    return [Case(**json.loads(p.read_text())) for p in sorted(directory.glob("*.json"))]
+
 
 # ----------------------------------------------------------------------
-# Minimal Flask app just for context + logging
+# Running
 # ----------------------------------------------------------------------
 def create_probe_app() -> Flask:
+    """Minimal app: fetch_matrices_mapbox logs through current_app."""
     app = Flask("route_probe")
-    try:
-        from dotenv import load_dotenv, find_dotenv  # type: ignore
-        load_dotenv(find_dotenv())
-    except Exception:
-        pass
-
-    if not app.logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
-        app.logger.addHandler(handler)
-    app.logger.setLevel(logging.INFO)
+    app.logger.setLevel(logging.WARNING)
     return app
 
-# ----------------------------------------------------------------------
-# Utilities
-# ----------------------------------------------------------------------
-def ensure_token(logger: logging.Logger) -> str:
-    token = os.getenv("MAPBOX_ACCESS_TOKEN")
-    if not token:
-        logger.error("MAPBOX_ACCESS_TOKEN is not set in the environment.")
-        sys.exit(1)
-    return token
-
-def haversine_miles(lonlat_a: str, lonlat_b: str) -> float:
-    def deg2rad(x: float) -> float: return x * math.pi / 180.0
-    lon1, lat1 = map(float, lonlat_a.split(","))
-    lon2, lat2 = map(float, lonlat_b.split(","))
-    R = 3958.7613  # miles
-    dlat = deg2rad(lat2 - lat1)
-    dlon = deg2rad(lon2 - lon1)
-    a = math.sin(dlat/2)**2 + math.cos(deg2rad(lat1))*math.cos(deg2rad(lat2))*math.sin(dlon/2)**2
-    return 2 * R * math.asin(math.sqrt(a))
-
-def geocode_norm(addresses: List[str]) -> List[str]:
-    # Use the same private helper your app uses (works under app context).
-    from mapbox_routing import _maybe_geocode  # type: ignore
-    token = os.getenv("MAPBOX_ACCESS_TOKEN")
-    return [_maybe_geocode(a, token) for a in addresses]
-
-def pretty_hms(sec: int) -> str:
-    h, rem = divmod(sec, 3600)
-    m, _ = divmod(rem, 60)
-    return f"{h}h {m}m" if h else f"{m}m"
-
-def directions_leg_metrics(
-    a_lonlat: str,
-    b_lonlat: str,
-    token: str,
-    profile: str,
-    logger: logging.Logger,
-) -> Optional[Tuple[float, float]]:
-    """
-    Returns (distance_meters, duration_seconds) for a->b using Mapbox Directions.
-    None if the call fails (we'll log and keep going).
-    """
-    try:
-        base = "https://api.mapbox.com/directions/v5"
-        coords = f"{a_lonlat};{b_lonlat}"
-        url = f"{base}/{profile}/{coords}"
-        params = {
-            "alternatives": "false",
-            "overview": "false",
-            "annotations": "distance,duration",
-            "geometries": "geojson",
-            "access_token": token,
-        }
-        r = requests.get(url, params=params, timeout=15)
-        r.raise_for_status()
-        data = r.json()
-        routes = data.get("routes") or []
-        if not routes:
-            logger.warning("Directions returned no routes for %s -> %s", a_lonlat, b_lonlat)
-            return None
-        dist_m = float(routes[0].get("distance", 0.0))
-        dur_s  = float(routes[0].get("duration", 0.0))
-        return dist_m, dur_s
-    except Exception as e:
-        logger.warning("Directions error for %s -> %s: %s", a_lonlat, b_lonlat, e)
-        return None
+
+def fetch_case(case: Case, standin: GeoStandin | None) -> None:
+    """Fill in the case's matrices via the production fetcher."""
+    before = sum(standin.hits.values()) if standin else 0
+    t0 = time.perf_counter()
+    durations, distances = fetch_matrices_mapbox(case.coords, profile=PROFILE)
+    case.fetch_s = time.perf_counter() - t0
+    case.durations = mapbox_routing._normalize_square_matrix(durations, len(case.coords), "durations")
+    case.distances = mapbox_routing._normalize_square_matrix(distances, len(case.coords), "distances")
+    # Live runs can't count server hits; the tiling is deterministic, so count calls.
+    case.api_calls = (sum(standin.hits.values()) - before) if standin else _matrix_calls(len(case.coords))
+
+
+def _matrix_calls(n: int, max_coords: int = 25) -> int:
+    if n <= max_coords:
+        return 1
+    chunks = math.ceil(n / (max_coords // 2))
+    return chunks * (chunks + 1) // 2
+
+
+def fetch_all(cases: list[Case], live: bool = False) -> None:
+    """Fetch every case's matrices from the stand-in (or, if *live*, MAPBOX_API_URL)."""
+    if live:
+        with create_probe_app().app_context():
+            for case in cases:
+                fetch_case(case, None)
+        return
+
+    saved_env, saved_rpm = dict(os.environ), mapbox_routing._MB_RPM
+    with GeoStandin() as standin:
+        os.environ.update(standin.env())
+        # The per-minute Matrix cap protects the real API; the stand-in doesn't need it.
+        mapbox_routing._MB_RPM = 10**9
+        try:
+            with create_probe_app().app_context():
+                for case in cases:
+                    fetch_case(case, standin)
+        finally:
+            os.environ.clear()
+            os.environ.update(saved_env)
+            mapbox_routing._MB_RPM = saved_rpm
+
+
+def run_case(case: Case, config: SolverConfig, time_limit: float) -> dict:
+    t0 = time.perf_counter()
+    res = solve_route(case.durations, case.distances, roundtrip=True,
+                      optimize_for=config.optimize_for, time_limit_sec=time_limit,
+                      first_solution=config.first_solution,
+                      metaheuristic=config.metaheuristic, polish=config.polish)
+    wall = time.perf_counter() - t0
+    cost = res["total_distance_meters" if config.optimize_for == "distance"
+               else "total_duration_seconds"]
+    return {"case": case.name, "layout": case.layout, "stops": case.size,
+            "config": config.name, "wall_s": round(wall, 4), "fetch_s": round(case.fetch_s, 4),
+            "api_calls": case.api_calls, "cost": cost,
+            "meters": res["total_distance_meters"], "seconds": res["total_duration_seconds"]}
+
+
+def add_gaps(results: list[dict], best_known: dict[str, int]) -> dict[str, int]:
+    """Set each result's ``gap`` to the best tour for its case; returns the new best."""
+    best = dict(best_known)
+    for r in results:
+        best[r["case"]] = min(best.get(r["case"], r["cost"]), r["cost"])
+    for r in results:
+        r["gap"] = round(r["cost"] / best[r["case"]] - 1, 5) if best[r["case"]] else 0.0
+    return best
+
+
+def find_regressions(results: list[dict], baseline: dict, *, cost_tol: float,
+                     time_tol: float) -> list[str]:
+    base = {(r["case"], r["config"]): r for r in baseline.get("results", [])}
+    problems = []
+    for r in results:
+        b = base.get((r["case"], r["config"]))
+        if b is None:
+            continue
+        key = f"{r['case']} / {r['config']}"
+        if r["cost"] > b["cost"] * (1 + cost_tol):
+            problems.append(f"{key}: tour {r['cost']} vs {b['cost']} (+{r['cost'] / b['cost'] - 1:.1%})")
+        if r["api_calls"] > b["api_calls"]:
+            problems.append(f"{key}: {r['api_calls']} API calls vs {b['api_calls']}")
+        # + 50 ms so sub-second runs don't trip on scheduler noise
+        if r["wall_s"] > b["wall_s"] * (1 + time_tol) + 0.05:
+            problems.append(f"{key}: {r['wall_s']:.2f}s vs {b['wall_s']:.2f}s")
+    return problems
+
+
+def run(cases: list[Case], configs: list[SolverConfig], time_limit: float,
+        baseline: dict | None = None, log=print) -> dict:
+    results = []
+    for case in cases:
+        for config in configs:
+            r = run_case(case, config, time_limit)
+            results.append(r)
+            log(f"{case.name:15} {config.name:22} {r['wall_s']:7.2f}s "
+                f"{r['api_calls']:4d} calls  {r['meters'] / 1609.344:7.1f} mi")
+    best_known = add_gaps(results, (baseline or {}).get("best_known", {}))
+    return {
+        "meta": {"time_limit_s": time_limit, "profile": PROFILE,
+                 "configs": [asdict(c) for c in configs],
+                 "python": platform.python_version(), "machine": platform.machine(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())},
+        "best_known": best_known,
+        "results": results,
+    }
+
 
 # ----------------------------------------------------------------------
 # Main
 # ----------------------------------------------------------------------
-def main() -> None:
-    app = create_probe_app()
-    with app.app_context():
-        logger = current_app.logger
-        token = ensure_token(logger)
-
-        logger.info("Depot (start=end): %s", DEPOT)
-        logger.info("Stops (%d): %s", len(ADDRESSES), "; ".join(ADDRESSES))
-
-        # 1) Optimize using your production stack (Matrix-based durations)
-        ordered, total_sec_matrix, leg_secs_matrix = compute_optimized_route(
-            waypoints=ADDRESSES,
-            start_location=DEPOT,
-            end_location=DEPOT,
-            profile=PROFILE,
-            time_limit_sec=TIME_LIMIT_SEC,
-        )
-
-        logger.info("Optimized order (start → end):")
-        for i, a in enumerate(ordered):
-            logger.info("  %2d. %s", i, a)
-
-        # 2) Normalize to lon,lat for Directions calls
-        norm = geocode_norm(ordered)
-        logger.info("Geocoded (lon,lat):")
-        for i, g in enumerate(norm):
-            logger.info("  %2d. %s", i, g)
-
-        # 3) Per-leg Directions metrics (distance+duration) vs Matrix duration
-        total_dist_m = 0.0
-        total_sec_dir = 0.0
-        logger.info("Legs (Matrix duration vs Directions distance/duration):")
-        for i in range(len(norm) - 1):
-            a = norm[i]
-            b = norm[i + 1]
-            mtx_sec = leg_secs_matrix[i]
-            dd = directions_leg_metrics(a, b, token, PROFILE, logger)
-            if dd is None:
-                logger.info("  %2d -> %2d  matrix=%4ds  directions=unavailable", i, i+1, mtx_sec)
-                continue
-            dist_m, dir_sec = dd
-            total_dist_m += dist_m
-            total_sec_dir += dir_sec
-
-            # Warn if durations disagree a lot (helps catch profile/traffic inconsistencies)
-            warn = ""
-            if mtx_sec and abs(dir_sec - mtx_sec) / max(mtx_sec, 1) > 0.10:
-                warn = "  ⚠︎ duration mismatch >10%"
-            logger.info(
-                "  %2d -> %2d  matrix=%4ds | directions=%4ds, %5.2f mi%s",
-                i, i+1, mtx_sec, int(dir_sec), dist_m / 1609.344, warn
-            )
-
-        logger.info("Totals:")
-        logger.info("  Matrix total time: %s", pretty_hms(int(total_sec_matrix)))
-        logger.info("  Directions total time: %s", pretty_hms(int(total_sec_dir)))
-        logger.info("  Directions total distance: %.2f mi", total_dist_m / 1609.344)
-
-        # 4) Quick lower-bound sanity (haversine) to spot wild outliers
-        total_miles_lb = 0.0
-        for i in range(len(norm) - 1):
-            total_miles_lb += haversine_miles(norm[i], norm[i+1])
-        logger.info("  Straight-line sum (lower bound): ~%.1f mi", total_miles_lb)
+def _csv(value: str) -> list[str]:
+    return [v for v in value.split(",") if v]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--layouts", default=",".join(LAYOUTS))
+    parser.add_argument("--configs", default=",".join(CONFIGS))
+    parser.add_argument("--time-limit", type=float, default=2.0, help="solver seconds per run")
+    parser.add_argument("--out", type=Path, default=Path("route_probe.json"))
+    parser.add_argument("--cases", type=Path, help="replay recorded cases from this directory")
+    parser.add_argument("--record", type=Path, help="save each case's matrices here")
+    parser.add_argument("--live", action="store_true",
+                        help="fetch matrices from MAPBOX_API_URL instead of the local stand-in")
+    parser.add_argument("--baseline", type=Path, help="fail (exit 1) on regressions against this file")
+    parser.add_argument("--update-baseline", type=Path, help="write this run as the new baseline")
+    parser.add_argument("--cost-tol", type=float, default=0.02, help="allowed tour growth (0.02 = 2%%)")
+    parser.add_argument("--time-tol", type=float, default=1.0, help="allowed wall-time growth (1.0 = 2x)")
+    args = parser.parse_args(argv)
+
+    configs = [CONFIGS[name] for name in _csv(args.configs)]
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    if args.cases:
+        cases = load_cases(args.cases)
+    else:
+        cases = synthetic_cases([int(s) for s in _csv(args.sizes)], _csv(args.layouts))
+        fetch_all(cases, live=args.live)
+    if args.record:
+        args.record.mkdir(parents=True, exist_ok=True)
+        for case in cases:
+            (args.record / f"{case.name}.json").write_text(json.dumps(asdict(case)))
+
+    report = run(cases, configs, args.time_limit, baseline)
+    args.out.write_text(json.dumps(report, indent=1))
+    print(f"wrote {args.out} ({len(report['results'])} runs)")
+    if args.update_baseline:
+        args.update_baseline.write_text(json.dumps(report, indent=1))
+        print(f"wrote baseline {args.update_baseline}")
+
+    if baseline is not None:
+        problems = find_regressions(report["results"], baseline,
+                                    cost_tol=args.cost_tol, time_tol=args.time_tol)
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        if problems:
+            return 1
+        print("no regressions against", args.baseline)
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
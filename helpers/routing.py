@@ -3,6 +3,8 @@ import requests
 from urllib.parse import urlencode
 from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 
+from helpers.api_urls import google_maps_url
+
 
 def fetch_distance_matrix(locations, api_key=None):
     """
@@ -25,7 +27,7 @@ def fetch_distance_matrix(locations, api_key=None):
         "key": api_key
     }
 
-    url = "https://maps.googleapis.com/maps/api/distancematrix/json?" + urlencode(params)
+    url = google_maps_url("/maps/api/distancematrix/json?") + urlencode(params)
     response = requests.get(url)
     data = response.json()
 
@@ -1,6 +1,32 @@
 # schedule.py
+"""
+Booking calendar for /date and /edit-request-time.
+
+The whole horizon the wizard can page through (week_offset 0..MAX_WEEK_OFFSET)
+is computed in one go – one ServiceSchedule query plus, when
+PICKUP_SLOT_CAPACITY is set, one grouped count of Requested pickups per
+(date, slot) – and kept per worker in a VersionedCache. Page views then read
+it from memory. The calendar is rebuilt when:
+
+* admin_schedule saves (``invalidate_schedule()``),
+* a booking is made, moved or cancelled (``note_booking_changed()``; only
+  matters when capacity limits are on), or
+* the date rolls over.
+
+A ZIP with service days (helpers.service_area) only sees those weekdays;
+that filter is applied per call, on top of the shared calendar.
+"""
 from datetime import date, timedelta
-from models import PickupRequest, ServiceSchedule  # or wherever these are coming from
+
+from flask import current_app
+from sqlalchemy import func
+
+from helpers.versioned_cache import VersionedCache, bump_version
+from models import db, PickupRequest, ServiceSchedule  # or wherever these are coming from
+
+MAX_WEEK_OFFSET = 2
+_CACHE_NAME = "schedule_calendar"
+
 
 def get_service_schedule():
     """
@@ -9,7 +35,103 @@ def get_service_schedule():
     """
     return ServiceSchedule.query.order_by(ServiceSchedule.id).all()
 
-def build_schedule(offset: int = 0):
+
+def _slot_key(start: str, end: str) -> str:
+    """How a slot is stored in PickupRequest.request_time, e.g. "08:00-16:00"."""
+    return f"{start}-{end}"
+
+
+def _booked_counts(first: date, last: date) -> dict[tuple[str, str], int]:
+    """{(iso_date, slot_key): n} for Requested pickups in [first, last]."""
+    rows = (
+        db.session.query(PickupRequest.request_date, PickupRequest.request_time,
+                         func.count(PickupRequest.id))
+        .filter(PickupRequest.status == "Requested",
+                PickupRequest.request_date >= first.isoformat(),
+                PickupRequest.request_date <= last.isoformat())
+        .group_by(PickupRequest.request_date, PickupRequest.request_time)
+        .all()
+    )
+    return {(d, t): n for d, t, n in rows}
+
+
+def _build_calendar(today: date) -> dict:
+    """Precompute build_schedule() output for every allowed week offset."""
+    capacity = current_app.config.get("PICKUP_SLOT_CAPACITY") or 0
+
+    # Create a dict keyed by day_of_week ("monday", "tuesday", etc.)
+    schedule_map = {s.day_of_week.lower(): s for s in get_service_schedule()}
+
+    horizon_end = today + timedelta(weeks=MAX_WEEK_OFFSET, days=6)
+    booked = _booked_counts(today, horizon_end) if capacity else {}
+
+    weeks = []
+    for offset in range(MAX_WEEK_OFFSET + 1):
+        # The base date is "today" + X weeks
+        base_date = today + timedelta(weeks=offset)
+        days_list = []
+        for i in range(7):
+            day_date = base_date + timedelta(days=i)
+            # Skip if day_date is the same as "today"
+            # (i.e. do not return same-day entries)
+            if day_date == today:
+                continue
+
+            sched = schedule_map.get(day_date.strftime("%A").lower())
+            if not sched or not sched.is_available:
+                continue
+
+            # Build up to 2 time slot entries if they exist
+            slots = []
+            if sched.slot1_start and sched.slot1_end:
+                slots.append((sched.slot1_start, sched.slot1_end))
+            if sched.slot2_start and sched.slot2_end:
+                slots.append((sched.slot2_start, sched.slot2_end))
+
+            if capacity:
+                iso = day_date.isoformat()
+                slots = [s for s in slots if booked.get((iso, _slot_key(*s)), 0) < capacity]
+
+            if slots:
+                days_list.append({
+                    'date_obj': day_date,
+                    'date_str': day_date.strftime("%b. %d"),
+                    'day_of_week': day_date.strftime("%A"),
+                    'slots': slots
+                })
+        weeks.append((days_list, base_date.strftime("%b. %d")))
+
+    return {"today": today, "weeks": weeks}
+
+
+_calendar = VersionedCache(_CACHE_NAME, lambda: _build_calendar(date.today()))
+
+
+def invalidate_schedule() -> None:
+    """Call when ServiceSchedule rows change; caller commits."""
+    bump_version(_CACHE_NAME)
+    _calendar.invalidate()
+
+
+def note_booking_changed() -> None:
+    """Call when a pickup is booked, moved or cancelled; caller commits."""
+    if current_app.config.get("PICKUP_SLOT_CAPACITY"):
+        invalidate_schedule()
+
+
+def _current_calendar() -> dict:
+    calendar = _calendar.get()
+    if calendar["today"] != date.today():
+        _calendar.invalidate()
+        calendar = _calendar.get()
+    return calendar
+
+
+def _serves(service_days: frozenset[str], day: dict) -> bool:
+    return not service_days or day["day_of_week"].lower() in {d.lower() for d in service_days}
+
+
+def build_schedule(offset: int = 0, service_days: frozenset[str] = frozenset()):
     """
     Returns a tuple of (days_list, base_date_str).
 
@@ -20,54 +142,34 @@ def build_schedule(offset: int = 0):
         'day_of_week': "e.g. Saturday",
         'slots': [ (start,end), (start2,end2) ]
     }
-    
+
     base_date_str is a string representation of the base date,
     e.g. 'Jan. 01'
+
+    Slots already holding PICKUP_SLOT_CAPACITY Requested pickups are left out
+    (no limit when unset/0). With *service_days* (weekday names, see
+    ServiceAreaIndex.service_days) only those days are listed; empty = all.
     """
 
     # Ensure offset is within 0..2
     if offset < 0:
         offset = 0
-    if offset > 2:
-        offset = 2
+    if offset > MAX_WEEK_OFFSET:
+        offset = MAX_WEEK_OFFSET
 
-    # The base date is "today" + X weeks
-    base_date = date.today() + timedelta(weeks=offset)
-    base_date_str = base_date.strftime("%b. %d")
+    days_list, base_date_str = _current_calendar()["weeks"][offset]
+    # Callers get their own list; the cached one is shared between requests.
+    return [dict(d) for d in days_list if _serves(service_days, d)], base_date_str
 
-    schedule_data = get_service_schedule()
 
-    # Create a dict keyed by day_of_week ("monday", "tuesday", etc.)
-    schedule_map = {}
-    for s in schedule_data:
-        schedule_map[s.day_of_week.lower()] = s
-
-    days_list = []
-    for i in range(7):
-        day_date = base_date + timedelta(days=i)
-        # Skip if day_date is the same as "today"
-        # (i.e. do not return same-day entries)
-        if day_date == date.today():
-            continue
-        
-        day_of_week_str = day_date.strftime("%A").lower()
-
-        if day_of_week_str in schedule_map:
-            sched = schedule_map[day_of_week_str]
-            if sched.is_available:
-                # Build up to 2 time slot entries if they exist
-                slots = []
-                if sched.slot1_start and sched.slot1_end:
-                    slots.append((sched.slot1_start, sched.slot1_end))
-                if sched.slot2_start and sched.slot2_end:
-                    slots.append((sched.slot2_start, sched.slot2_end))
-
-                if slots:
-                    days_list.append({
-                        'date_obj': day_date,
-                        'date_str': day_date.strftime("%b. %d"),
-                        'day_of_week': day_date.strftime("%A"),
-                        'slots': slots
-                    })
-
-    return days_list, base_date_str
+def is_bookable(day: str, service_days: frozenset[str] = frozenset()) -> bool:
+    """
+    Whether build_schedule() offers *day* (ISO date) to a ZIP served on
+    *service_days*: open, not today, not full and within the horizon. Booking
+    POSTs check this; the calendar page alone doesn't stop a crafted date.
+    """
+    for days_list, _ in _current_calendar()["weeks"]:
+        for d in days_list:
+            if d["date_obj"].isoformat() == day:
+                return _serves(service_days, d)
+    return False
@@ -0,0 +1,277 @@
+"""Where we pick up: ZIP codes, their cities and service days.
+
+The ``service_areas`` table is the single source of truth; /verify_zip,
+/request_pickup and /api/validate_address all read it through
+:func:`service_areas`, an immutable in-memory index that is rebuilt only when
+an edit bumps its version (see helpers/versioned_cache.py).
+
+Optionally, ``SERVICE_AREA_GEOJSON`` points at a GeoJSON Polygon/MultiPolygon
+(or a FeatureCollection of them). :func:`geofence` then rejects lon/lat points
+outside the drawn area before we spend a Google API call on them. Containment
+uses a grid precomputed at load time, so most points are answered by a single
+dict lookup; only points in cells the boundary passes through fall back to a
+ray-casting test.
+
+CLI::
+
+    flask service-area list
+    flask service-area add 94582 "San Ramon" [--days Monday,Thursday]
+    flask service-area remove 94582 [--city "San Ramon"]
+"""
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from helpers.versioned_cache import VersionedCache, bump_version
+from models import ServiceArea, db
+
+_CACHE_NAME = "service_areas"
+_GRID_SIZE = 64
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# ZIP index
+# ──────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Area:
+    city: str
+    service_days: frozenset[str]      # empty = every day on the schedule
+
+
+class ServiceAreaIndex:
+    """Read-only ZIP → (Area, …) map. Supports ``zip in index``."""
+
+    __slots__ = ("_by_zip",)
+
+    def __init__(self, rows: Iterable[ServiceArea]):
+        by_zip: dict[str, list[Area]] = {}
+        for row in rows:
+            days = frozenset(d.strip() for d in (row.service_days or "").split(",") if d.strip())
+            by_zip.setdefault(row.zipcode, []).append(Area(row.city, days))
+        self._by_zip: Mapping[str, tuple[Area, ...]] = MappingProxyType(
+            {z: tuple(areas) for z, areas in by_zip.items()}
+        )
+
+    def __contains__(self, zip_code) -> bool:
+        return zip_code in self._by_zip
+
+    def __len__(self) -> int:
+        return len(self._by_zip)
+
+    def zips(self) -> list[str]:
+        return sorted(self._by_zip)
+
+    def areas(self, zip_code: str) -> tuple[Area, ...]:
+        return self._by_zip.get(zip_code, ())
+
+    def cities(self, zip_code: str) -> tuple[str, ...]:
+        return tuple(a.city for a in self.areas(zip_code))
+
+    def primary_city(self, zip_code: str) -> str | None:
+        areas = self.areas(zip_code)
+        return areas[0].city if areas else None
+
+    def service_days(self, zip_code: str, city: str | None = None) -> frozenset[str]:
+        """Days this ZIP (optionally narrowed to *city*) is served; empty = all."""
+        days: set[str] = set()
+        for area in self.areas(zip_code):
+            if city and area.city.lower() != city.lower():
+                continue
+            if not area.service_days:
+                return frozenset()
+            days |= area.service_days
+        return frozenset(days)
+
+
+def _load_index() -> ServiceAreaIndex:
+    rows = ServiceArea.query.order_by(ServiceArea.zipcode, ServiceArea.id).all()
+    current_app.logger.debug("Loaded %d service-area rows.", len(rows))
+    return ServiceAreaIndex(rows)
+
+
+_index_cache = VersionedCache(_CACHE_NAME, _load_index)
+
+
+def service_areas() -> ServiceAreaIndex:
+    """The current index (app context required)."""
+    return _index_cache.get()
+
+
+def invalidate_service_areas() -> None:
+    """Call after editing service_areas; caller commits."""
+    bump_version(_CACHE_NAME)
+    _index_cache.invalidate()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Optional geofence
+# ──────────────────────────────────────────────────────────────────────────
+_OUTSIDE, _INSIDE, _EDGE = 0, 1, 2
+
+
+def _point_in_rings(x: float, y: float, rings) -> bool:
+    """Even-odd ray cast across every ring (holes included)."""
+    inside = False
+    for ring in rings:
+        j = len(ring) - 1
+        for i in range(len(ring)):
+            xi, yi = ring[i]
+            xj, yj = ring[j]
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+    return inside
+
+
+class Geofence:
+    """Polygon containment backed by a precomputed ``grid_size``² cell grid."""
+
+    def __init__(self, polygons: list[list[list[tuple[float, float]]]], grid_size: int = _GRID_SIZE):
+        self._polygons = polygons
+        xs = [p[0] for poly in polygons for ring in poly for p in ring]
+        ys = [p[1] for poly in polygons for ring in poly for p in ring]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self._n = grid_size
+        self._dx = (self.bbox[2] - self.bbox[0]) / grid_size or 1e-9
+        self._dy = (self.bbox[3] - self.bbox[1]) / grid_size or 1e-9
+        self._cells = self._build_grid()
+
+    def _cell_of(self, x: float, y: float) -> tuple[int, int]:
+        cx = min(int((x - self.bbox[0]) / self._dx), self._n - 1)
+        cy = min(int((y - self.bbox[1]) / self._dy), self._n - 1)
+        return cx, cy
+
+    def _build_grid(self) -> dict[tuple[int, int], int]:
+        cells: dict[tuple[int, int], int] = {}
+        # Any cell an edge's bounding box touches might straddle the boundary.
+        for poly in self._polygons:
+            for ring in poly:
+                for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                    cx1, cy1 = self._cell_of(min(x1, x2), min(y1, y2))
+                    cx2, cy2 = self._cell_of(max(x1, x2), max(y1, y2))
+                    for cx in range(cx1, cx2 + 1):
+                        for cy in range(cy1, cy2 + 1):
+                            cells[(cx, cy)] = _EDGE
+        # Every other cell is wholly in or out; its centre decides which.
+        for cx in range(self._n):
+            for cy in range(self._n):
+                if (cx, cy) not in cells:
+                    x = self.bbox[0] + (cx + 0.5) * self._dx
+                    y = self.bbox[1] + (cy + 0.5) * self._dy
+                    cells[(cx, cy)] = _INSIDE if self._exact(x, y) else _OUTSIDE
+        return cells
+
+    def _exact(self, x: float, y: float) -> bool:
+        return any(_point_in_rings(x, y, poly) for poly in self._polygons)
+
+    def contains(self, lon: float, lat: float) -> bool:
+        x0, y0, x1, y1 = self.bbox
+        if not (x0 <= lon <= x1 and y0 <= lat <= y1):
+            return False
+        state = self._cells[self._cell_of(lon, lat)]
+        if state == _EDGE:
+            return self._exact(lon, lat)
+        return state == _INSIDE
+
+    @classmethod
+    def from_geojson(cls, data: dict, grid_size: int = _GRID_SIZE) -> "Geofence":
+        geoms = []
+        if data.get("type") == "FeatureCollection":
+            geoms = [f["geometry"] for f in data.get("features", [])]
+        elif data.get("type") == "Feature":
+            geoms = [data["geometry"]]
+        else:
+            geoms = [data]
+
+        polygons = []
+        for g in geoms:
+            if g["type"] == "Polygon":
+                polygons.append(g["coordinates"])
+            elif g["type"] == "MultiPolygon":
+                polygons.extend(g["coordinates"])
+        if not polygons:
+            raise ValueError("GeoJSON contains no Polygon/MultiPolygon geometry")
+
+        # Drop the closing vertex GeoJSON repeats; the ray cast wraps anyway.
+        cleaned = [
+            [[(float(p[0]), float(p[1])) for p in (ring[:-1] if ring[0] == ring[-1] else ring)]
+             for ring in poly]
+            for poly in polygons
+        ]
+        return cls(cleaned, grid_size)
+
+
+_geofence_cache: dict[str, Geofence | None] = {}
+
+
+def geofence() -> Geofence | None:
+    """The configured geofence, or None if SERVICE_AREA_GEOJSON is unset/unreadable."""
+    path = os.getenv("SERVICE_AREA_GEOJSON", "")
+    if path not in _geofence_cache:
+        fence = None
+        if path:
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    fence = Geofence.from_geojson(json.load(fh))
+            except (OSError, ValueError, KeyError) as e:
+                current_app.logger.error("Could not load service-area geofence %s: %s", path, e)
+        _geofence_cache[path] = fence
+    return _geofence_cache[path]
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────────────────
+@click.group("service-area")
+def service_area_cli():
+    """List or edit the ZIP codes we service."""
+
+
+@service_area_cli.command("list")
+@with_appcontext
+def list_areas():
+    for row in ServiceArea.query.order_by(ServiceArea.zipcode, ServiceArea.city):
+        click.echo(f"{row.zipcode}  {row.city:<15} {row.service_days or 'all scheduled days'}")
+
+
+@service_area_cli.command("add")
+@click.argument("zipcode")
+@click.argument("city")
+@click.option("--days", default="", help="Comma-separated weekdays; default is every scheduled day.")
+@with_appcontext
+def add_area(zipcode: str, city: str, days: str):
+    if not (zipcode.isdigit() and len(zipcode) == 5):
+        raise click.BadParameter("ZIP must be 5 digits.", param_hint="ZIPCODE")
+    row = ServiceArea.query.filter_by(zipcode=zipcode, city=city).first()
+    if row is None:
+        row = ServiceArea(zipcode=zipcode, city=city)
+        db.session.add(row)
+    row.service_days = days or None
+    invalidate_service_areas()
+    db.session.commit()
+    click.echo(f"✔ {zipcode} {city} saved.")
+
+
+@service_area_cli.command("remove")
+@click.argument("zipcode")
+@click.option("--city", default=None, help="Only remove this city's entry for the ZIP.")
+@with_appcontext
+def remove_area(zipcode: str, city: str | None):
+    q = ServiceArea.query.filter_by(zipcode=zipcode)
+    if city:
+        q = q.filter_by(city=city)
+    deleted = q.delete(synchronize_session=False)
+    invalidate_service_areas()
+    db.session.commit()
+    click.echo(f"✔ Removed {deleted} row(s).")
+
+
+def register(app):
+    """Attach the CLI group to *app*. Call this from create_app()."""
+    app.cli.add_command(service_area_cli)
@@ -0,0 +1,176 @@
+"""Redis-backed sessions with a per-process read-through cache.
+
+Stock Flask-Session does a Redis ``GET`` of the whole session on every
+request that carries a session cookie and, with
+``SESSION_REFRESH_EACH_REQUEST``, a ``SET`` on the way out – two TLS round
+trips per page view even when nothing changed.
+:class:`CachedRedisSessionInterface` cuts repeat views to one small ``GET``:
+
+* No cookie → a fresh, empty session; Redis is never touched.
+* Every write stores a random *tag* next to the session
+  (``<store id>:tag``, same TTL). A worker that has the sid cached serves
+  its copy only if that key still holds the cached tag; a different tag
+  (another worker wrote since) or a missing one (cleared, logged out,
+  expired) means reloading – so a revoked session is never served from
+  any worker's cache, whatever cookie is replayed.
+* Only modified sessions are written back. Unmodified ones just get their
+  TTL (and the cookie expiry) extended once less than half of
+  ``PERMANENT_SESSION_LIFETIME`` remains.
+
+Cookies carry the bare sid, as with the stock interface; the
+``<sid>.<tag>`` cookies an earlier version issued are still accepted.
+"""
+import secrets
+import threading
+import time
+
+from cachetools import TTLCache
+from flask import Flask
+from flask_session import Session
+from flask_session._utils import total_seconds
+from flask_session.defaults import Defaults
+from flask_session.redis import RedisSessionInterface
+from itsdangerous import BadSignature
+
+_CACHE_SIZE = 2048
+_CACHE_TTL = 300                # seconds a worker keeps its copy (still checked per request)
+
+
+class CachedRedisSessionInterface(RedisSessionInterface):
+
+    def __init__(self, *args, cache_size: int = _CACHE_SIZE, cache_ttl: int = _CACHE_TTL,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        # store_id -> (server tag, serialized data, redis expiry as unix time)
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._lock = threading.Lock()
+
+    # ── cookie <-> sid ────────────────────────────────────────────────────
+    def _parse_cookie(self, app: Flask, value: str) -> str:
+        if self.use_signer:
+            value = self._unsign(app, value)
+        return value.partition(".")[0]          # drop a legacy ".<tag>"
+
+    def _cookie_value(self, app: Flask, sid: str) -> str:
+        return self._sign(app, sid) if self.use_signer else sid
+
+    @staticmethod
+    def _tag_key(store_id: str) -> str:
+        return f"{store_id}:tag"
+
+    @staticmethod
+    def _text(value) -> str | None:
+        return value.decode() if isinstance(value, bytes) else value
+
+    # ── open ──────────────────────────────────────────────────────────────
+    def _new_session(self):
+        return self.session_class(sid=self._generate_sid(self.sid_length),
+                                  permanent=self.permanent)
+
+    def open_session(self, app: Flask, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if not cookie:
+            return self._new_session()
+        try:
+            sid = self._parse_cookie(app, cookie)
+        except BadSignature:
+            return self._new_session()
+
+        store_id = self._get_store_id(sid)
+        with self._lock:
+            cached = self._cache.get(store_id)
+        if cached and self._text(self.client.get(self._tag_key(store_id))) == cached[0]:
+            tag, raw = cached[0], cached[1]
+        else:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.get(store_id)
+            pipe.get(self._tag_key(store_id))
+            pipe.ttl(store_id)
+            raw, tag, ttl = pipe.execute()
+            tag = self._text(tag)
+            if not raw:
+                with self._lock:
+                    self._cache.pop(store_id, None)
+                return self._new_session()
+            expires_at = time.time() + ttl if ttl and ttl > 0 else 0.0
+            with self._lock:
+                if tag:                         # untagged (stock) data is re-read until rewritten
+                    self._cache[store_id] = (tag, raw, expires_at)
+                else:
+                    self._cache.pop(store_id, None)
+
+        session = self.session_class(self.serializer.decode(raw), sid=sid)
+        session._tag = tag
+        return session
+
+    # ── save ──────────────────────────────────────────────────────────────
+    def save_session(self, app: Flask, session, response) -> None:
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        name = self.get_cookie_name(app)
+        store_id = self._get_store_id(session.sid)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            if session.modified:
+                self.client.delete(store_id, self._tag_key(store_id))
+                with self._lock:
+                    self._cache.pop(store_id, None)
+                response.delete_cookie(key=name, domain=domain, path=path)
+                response.vary.add("Cookie")
+            return
+
+        lifetime = total_seconds(app.permanent_session_lifetime)
+        tag = getattr(session, "_tag", None)
+        if session.modified or not tag:
+            tag = secrets.token_urlsafe(6)
+            raw = self.serializer.encode(session)
+            pipe = self.client.pipeline(transaction=True)
+            pipe.set(store_id, raw, ex=lifetime)
+            pipe.set(self._tag_key(store_id), tag, ex=lifetime)
+            pipe.execute()
+            with self._lock:
+                self._cache[store_id] = (tag, raw, time.time() + lifetime)
+        else:
+            with self._lock:
+                cached = self._cache.get(store_id)
+            if cached and cached[2] - time.time() > lifetime / 2:
+                return                      # nothing changed, TTL still healthy
+            pipe = self.client.pipeline(transaction=True)
+            pipe.expire(store_id, lifetime)
+            pipe.expire(self._tag_key(store_id), lifetime)
+            pipe.execute()
+            if cached:
+                with self._lock:
+                    self._cache[store_id] = (cached[0], cached[1], time.time() + lifetime)
+
+        response.set_cookie(
+            key=name,
+            value=self._cookie_value(app, session.sid),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add("Cookie")
+
+
+def init_app(app: Flask) -> None:
+    """Flask-Session as configured, with the cached interface for Redis."""
+    Session().init_app(app)
+    stock = app.session_interface
+    if isinstance(stock, RedisSessionInterface):
+        app.session_interface = CachedRedisSessionInterface(
+            app,
+            client=stock.client,
+            key_prefix=stock.key_prefix,
+            use_signer=stock.use_signer,
+            permanent=stock.permanent,
+            sid_length=stock.sid_length,
+            serialization_format=app.config.get("SESSION_SERIALIZATION_FORMAT",
+                                                Defaults.SESSION_SERIALIZATION_FORMAT),
+        )
@@ -0,0 +1,97 @@
+"""Typed, cached view of the ``config`` key/value table.
+
+All rows are loaded with one SELECT into an immutable :class:`SiteConfig`
+held by a :class:`~helpers.versioned_cache.VersionedCache`, so a worker only
+re-reads the table after someone calls :func:`set_depot` (or another writer
+bumps ``site_config``). Within a request :func:`site_config` always returns
+the same snapshot.
+
+Defaults for missing rows live here – not at each call site::
+
+    cfg = site_config()
+    cfg.depot_text    # what the admin typed, for display
+    cfg.depot_geo     # "lon,lat" for routing (falls back to depot_text)
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+from flask import g, has_request_context
+
+from helpers.versioned_cache import VersionedCache, bump_version
+from models import Config, db
+
+_CACHE_NAME = "site_config"
+_VERSION_PREFIX = "cache_version:"
+
+DEFAULT_DEPOT = "5389 Mallard Dr., Pleasanton, CA 94566"
+
+ADMIN_ADDRESS = "admin_address"
+GEOCODED_ADMIN_ADDRESS = "geocoded_admin_addr"
+
+
+@dataclass(frozen=True)
+class SiteConfig:
+    values: Mapping[str, str]
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        return self.values.get(key) or default
+
+    @property
+    def admin_address(self) -> str | None:
+        """The depot address as the admin entered it, or None if never set."""
+        return self.get(ADMIN_ADDRESS)
+
+    @property
+    def depot_text(self) -> str:
+        return self.get(ADMIN_ADDRESS, DEFAULT_DEPOT)
+
+    @property
+    def depot_geo(self) -> str:
+        """Geocoded depot; the text address (geocoded on use) if that failed."""
+        return self.get(GEOCODED_ADMIN_ADDRESS, self.depot_text)
+
+
+def _load() -> SiteConfig:
+    rows = Config.query.all()
+    return SiteConfig(MappingProxyType({
+        row.key: row.value for row in rows if not row.key.startswith(_VERSION_PREFIX)
+    }))
+
+
+_cache = VersionedCache(_CACHE_NAME, _load)
+
+
+def site_config() -> SiteConfig:
+    """The current config (app context required); one snapshot per request."""
+    if not has_request_context():
+        return _cache.get()
+    if "_site_config" not in g:
+        g._site_config = _cache.get()
+    return g._site_config
+
+
+def _upsert(key: str, value: str | None) -> None:
+    row = Config.query.filter_by(key=key).first()
+    if value is None:                    # value is NOT NULL: drop the row instead
+        if row is not None:
+            db.session.delete(row)
+    elif row is None:
+        db.session.add(Config(key=key, value=value))
+    else:
+        row.value = value
+
+
+def set_depot(text: str, geocoded: str | None) -> None:
+    """Store the depot address (and its geocode, None if geocoding failed). Caller commits."""
+    _upsert(ADMIN_ADDRESS, text)
+    _upsert(GEOCODED_ADMIN_ADDRESS, geocoded)
+    invalidate_site_config()
+
+
+def invalidate_site_config() -> None:
+    """Call after editing config rows; caller commits."""
+    bump_version(_CACHE_NAME)
+    _cache.invalidate()
+    if has_request_context():
+        g.pop("_site_config", None)
@@ -0,0 +1,122 @@
+"""Where does worker boot time go?
+
+Runs ``import app; app.create_app()`` in a fresh interpreter with
+``python -X importtime`` and reports:
+
+* wall time for ``import app`` and for ``create_app()``,
+* self import time aggregated per top-level package (the biggest offenders),
+* which of the deliberately-deferred heavy modules (``HEAVY_MODULES``) got
+  imported anyway.
+
+Usage::
+
+    flask profile-startup [--top 20] [--json]
+    python -m helpers.startup_profile [--top 20] [--json]
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import click
+
+ROOT = Path(__file__).resolve().parent.parent
+
+#: Modules only specific routes/jobs need; none should load during create_app().
+HEAVY_MODULES = (
+    "ortools",
+    "gspread",
+    "google.cloud.storage",
+    "google.oauth2",
+    "langdetect",
+    "pycognito",
+)
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.create_app()
+t2 = time.perf_counter()
+heavy = %r
+print("@@STARTUP@@" + json.dumps({
+    "import_seconds": t1 - t0,
+    "create_app_seconds": t2 - t1,
+    "heavy_loaded": [m for m in heavy if m in sys.modules],
+}))
+"""
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.+)$")
+
+
+def measure_startup(env: dict | None = None, timeout: float = 120) -> dict:
+    """
+    Profile app start-up in a subprocess. Returns::
+
+        {"import_seconds": float, "create_app_seconds": float,
+         "heavy_loaded": [...], "packages": [(name, self_seconds), ...]}
+
+    Raises RuntimeError (with the child's stderr tail) if start-up fails.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=ROOT, env={**os.environ, **(env or {})},
+        capture_output=True, text=True, timeout=timeout,
+    )
+    marker = next((l for l in proc.stdout.splitlines() if l.startswith("@@STARTUP@@")), None)
+    if proc.returncode != 0 or marker is None:
+        tail = "\n".join(proc.stderr.splitlines()[-15:])
+        raise RuntimeError(f"create_app() failed in profiler subprocess:\n{tail}")
+
+    per_package: dict[str, int] = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            per_package[m.group(3).strip().split(".")[0]] += int(m.group(1))
+
+    report = json.loads(marker[len("@@STARTUP@@"):])
+    report["packages"] = sorted(
+        ((name, us / 1e6) for name, us in per_package.items()),
+        key=lambda item: item[1], reverse=True,
+    )
+    return report
+
+
+def format_report(report: dict, top: int = 20) -> str:
+    lines = [
+        f"import app     {report['import_seconds'] * 1000:8.1f} ms",
+        f"create_app()   {report['create_app_seconds'] * 1000:8.1f} ms",
+        "",
+        f"{'package':<32}{'self import ms':>16}",
+    ]
+    for name, seconds in report["packages"][:top]:
+        lines.append(f"{name:<32}{seconds * 1000:16.1f}")
+    heavy = report["heavy_loaded"]
+    lines += ["", "deferred modules loaded at boot: " + (", ".join(heavy) if heavy else "none")]
+    return "\n".join(lines)
+
+
+@click.command("profile-startup")
+@click.option("--top", default=20, show_default=True, help="Packages to list.")
+@click.option("--json", "as_json", is_flag=True, help="Print the raw report as JSON.")
+def profile_startup(top: int, as_json: bool) -> None:
+    """Report import-time breakdown and create_app() time for a cold start."""
+    report = measure_startup()
+    if as_json:
+        report["packages"] = report["packages"][:top]
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo(format_report(report, top))
+
+
+def register(app):
+    """Attach the CLI command to *app*. Call this from create_app()."""
+    app.cli.add_command(profile_startup)
+
+
+if __name__ == "__main__":
+    profile_startup()
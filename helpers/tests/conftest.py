@@ -0,0 +1,82 @@
+import importlib
+import importlib.util
+
+import pytest
+from flask import Flask
+
+from helpers.geo_standin import GeoStandin
+from models import db
+
+_APP_DEPS = ("flask_sitemap", "flask_migrate", "upstash_redis", "authlib", "flask_talisman")
+
+# config.py reads every class body at import, production's included.
+_DEV_ENV = {
+    "FLASK_CONFIG": "development",
+    "SECRET_KEY": "test", "SITE_URL": "http://localhost",
+    "MAIL_USERNAME": "x", "MAIL_PASSWORD": "x", "MAIL_ERROR_ADDRESS": "x@example.com",
+    "COGNITO_USER_POOL_ID": "x", "COGNITO_CLIENT_ID": "x", "COGNITO_CLIENT_SECRET": "x",
+    "COGNITO_REGION": "us-west-1", "COGNITO_DOMAIN": "x",
+    "RECAPTCHA_PUBLIC_KEY": "x", "RECAPTCHA_PRIVATE_KEY": "x",
+    "GOOGLE_API_KEY": "x", "GOOGLE_BACKEND_API_KEY": "x",
+    "DATABASE_URI": "sqlite://", "UPSTASH_REDIS_TLS_URL": "rediss://localhost:6379",
+}
+
+
+@pytest.fixture
+def app():
+    """Bare Flask app bound to an in-memory SQLite DB (no blueprints/routes)."""
+    app = Flask("tests")
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI="sqlite://",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(scope="session")
+def dev_env():
+    """Dummy settings for the real app in development mode (``import app``
+    needs them); skips when the full app dependency set isn't installed."""
+    missing = [m for m in _APP_DEPS if importlib.util.find_spec(m) is None]
+    if missing:
+        pytest.skip(f"full app dependencies not installed: {', '.join(missing)}")
+    return dict(_DEV_ENV)
+
+
+@pytest.fixture(scope="session")
+def site(dev_env):
+    """The real app (create_app()) in testing mode, CSRF off and every
+    session with an ``id_token`` signed in. Tables are the test's job."""
+    with pytest.MonkeyPatch.context() as mp:
+        for name, value in dev_env.items():
+            mp.setenv(name, value)
+        app_module = importlib.import_module("app")
+        mp.setattr(app_module.ConfigClass, "TESTING", True, raising=False)   # no background threads
+        mp.setattr(app_module.ConfigClass, "WTF_CSRF_ENABLED", False, raising=False)
+        mp.setattr(app_module, "session_claims", lambda session, token: {"sub": "admin"})
+        yield app_module.create_app()
+
+
+@pytest.fixture(scope="session")
+def _geo_server():
+    with GeoStandin() as server:
+        yield server
+
+
+@pytest.fixture
+def geo_standin(_geo_server, monkeypatch):
+    """Running Mapbox/Google stand-in with the API base URLs pointed at it.
+
+    Faults are off and hits are zeroed per test; call ``configure()`` to inject.
+    """
+    _geo_server.configure()
+    _geo_server.places.clear()
+    for name, value in _geo_server.env().items():
+        monkeypatch.setenv(name, value)
+    return _geo_server
@@ -0,0 +1,81 @@
+import pytest
+import requests
+
+import helpers.address as address_mod
+from helpers.address import AddressError, verifyAddress
+
+_COMPONENTS = [
+    {"types": ["locality"], "long_name": "Dublin"},
+    {"types": ["postal_code"], "long_name": "94568"},
+]
+
+
+class FakeResponse:
+    def __init__(self, status, body=None):
+        self.status_code = status
+        self.ok = status < 400
+        self._body = body or {}
+
+    def json(self):
+        return self._body
+
+
+class FakeHTTP:
+    def __init__(self, get=None, post=None):
+        self.get_resp, self.post_resp = get, post
+        self.calls = 0
+
+    def get(self, *_a, **_kw):
+        self.calls += 1
+        return self.get_resp
+
+    def post(self, *_a, **_kw):
+        self.calls += 1
+        if isinstance(self.post_resp, Exception):
+            raise self.post_resp
+        return self.post_resp
+
+
+@pytest.fixture
+def google(app, monkeypatch):
+    app.config["GOOGLE_BACKEND_API_KEY"] = "test"
+    address_mod._result_cache.clear()
+    monkeypatch.setattr(address_mod, "_outage_until", 0.0)
+
+    def _install(**responses):
+        http = FakeHTTP(**responses)
+        monkeypatch.setattr(address_mod, "_http", http)
+        return http
+    return _install
+
+
+def test_repeat_lookup_is_served_from_cache(google):
+    http = google(get=FakeResponse(200, {"status": "OK",
+                                         "result": {"address_components": _COMPONENTS}}))
+
+    assert verifyAddress("1 Main St, Dublin", "pid", "Dublin", "94568") == (True, "")
+    ok, msg = verifyAddress("1 Main St, Dublin", "pid", "Dublin", "94550")
+
+    assert not ok and "ZIP" in msg          # verdict re-evaluated against new input
+    assert http.calls == 1
+
+
+def test_outage_fails_fast_until_window_expires(google):
+    http = google(post=requests.Timeout())
+
+    with pytest.raises(AddressError):
+        verifyAddress("1 Main St, Dublin", None, "Dublin", "94568")
+    with pytest.raises(AddressError):
+        verifyAddress("2 Main St, Dublin", None, "Dublin", "94568")
+
+    assert http.calls == 1
+
+
+def test_client_error_does_not_open_outage_window(google):
+    http = google(post=FakeResponse(400))
+
+    for street in ("1 Main St", "2 Main St"):
+        with pytest.raises(AddressError):
+            verifyAddress(street, None, "Dublin", "94568")
+
+    assert http.calls == 2
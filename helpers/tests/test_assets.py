@@ -0,0 +1,91 @@
+import gzip
+
+import brotli
+import pytest
+from flask import Flask
+
+import helpers.assets as assets
+
+
+@pytest.fixture
+def static(tmp_path, monkeypatch):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css" / "a.css").write_text("body {  color : red; }\n.x { background: url('../images/x.png'); }")
+    (tmp_path / "css" / "b.css").write_text("@import url('https://fonts.example/f.css');\n/* note */ p { margin: 0 }")
+    (tmp_path / "js" / "one.js").write_text("function one() {\n  return 1;   // one\n}")
+    (tmp_path / "js" / "two.js").write_text("const two = one() + 1;")
+    monkeypatch.setattr(assets, "STATIC_DIR", tmp_path)
+    monkeypatch.setattr(assets, "DIST_DIR", tmp_path / "dist")
+    monkeypatch.setattr(assets, "MANIFEST", tmp_path / "dist" / "manifest.json")
+    monkeypatch.setattr(assets, "BUNDLES", {"page.css": ["css/a.css", "css/b.css"],
+                                            "site.js": ["js/one.js", "js/two.js"]})
+    assets._manifest_cache.clear()
+    yield tmp_path
+    assets._manifest_cache.clear()
+
+
+@pytest.fixture
+def client(static):
+    app = Flask("assets")
+    assets.register(app)
+    return app.test_client()
+
+
+def test_css_bundle_hoists_imports_and_pins_relative_urls(static):
+    css = assets.concat("page.css")
+    assert css.startswith("@import url('https://fonts.example/f.css');")
+    assert css.count("@import") == 1
+    assert "url('/static/images/x.png')" in css
+    assert css.index("color") < css.index("margin")
+
+
+def test_build_writes_fingerprinted_precompressed_files(static):
+    manifest = assets.build(log=lambda *_: None)
+
+    assert set(manifest) == {"page.css", "site.js", "css/a.css", "css/b.css", "js/one.js", "js/two.js"}
+    out = static / "dist" / manifest["site.js"]
+    body = out.read_bytes()
+    assert b"// one" not in body and b"two=one()+1" in body.replace(b" ", b"")
+    assert gzip.decompress((static / "dist" / (manifest["site.js"] + ".gz")).read_bytes()) == body
+    assert brotli.decompress((static / "dist" / (manifest["site.js"] + ".br")).read_bytes()) == body
+
+    (static / "js" / "two.js").write_text("const two = 2;")
+    rebuilt = assets.build(log=lambda *_: None)
+    assert rebuilt["site.js"] != manifest["site.js"]
+    assert not out.exists()                              # stale build pruned
+
+
+def test_serves_the_best_precompressed_variant(static, client):
+    manifest = assets.build(log=lambda *_: None)
+    url = f"/assets/{manifest['page.css']}"
+
+    br = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    gz = client.get(url, headers={"Accept-Encoding": "gzip"})
+    plain = client.get(url)
+
+    assert br.headers["Content-Encoding"] == "br"
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in plain.headers
+    assert brotli.decompress(br.data) == gzip.decompress(gz.data) == plain.data
+    for resp in (br, gz, plain):
+        assert resp.mimetype == "text/css"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        assert "immutable" in resp.headers["Cache-Control"]
+
+
+def test_asset_url_uses_the_build_when_present(static, client):
+    app = client.application
+    with app.test_request_context():
+        assert assets.asset_url("page.css") == "/assets/page.css"
+    manifest = assets.build(log=lambda *_: None)
+    with app.test_request_context():
+        assert assets.asset_url("page.css") == f"/assets/{manifest['page.css']}"
+
+
+def test_unbuilt_bundles_are_served_live(static, client):
+    resp = client.get("/assets/site.js")
+    assert resp.status_code == 200 and "no-cache" in resp.headers["Cache-Control"]
+    assert "function one()" in resp.text and "const two" in resp.text
+    assert client.get("/assets/js/missing.js").status_code == 404
+    assert client.get("/assets/../config.py").status_code == 404
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+from authlib.jose import JsonWebKey, jwt
+
+import helpers.auth as auth
+from helpers.auth import JoseError, session_claims
+
+
+@pytest.fixture
+def signed(app, monkeypatch):
+    app.config.update(COGNITO_REGION="us-west-1", COGNITO_USER_POOL_ID="pool",
+                      COGNITO_CLIENT_ID="client")
+    key = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": "k1"})
+    monkeypatch.setattr(auth, "_KEYS", {"k1": key})
+    monkeypatch.setattr(auth, "_JWKS_TS", time.time())
+
+    def _make(exp_in=3600, signing_key=key):
+        now = int(time.time())
+        claims = {"iss": auth._issuer(app.config), "aud": "client", "token_use": "id",
+                  "sub": "admin-1", "email": "a@x.com", "iat": now, "exp": now + exp_in}
+        return jwt.encode({"alg": "RS256"}, claims, signing_key).decode()
+    return _make
+
+
+def test_repeat_requests_skip_signature_verification(signed, monkeypatch):
+    token, session = signed(), {}
+    assert session_claims(session, token)["sub"] == "admin-1"
+
+    def _boom(_token):
+        raise AssertionError("should have used the cached claims")
+    monkeypatch.setattr(auth, "verify_cognito_jwt", _boom)
+
+    assert session_claims(session, token)["email"] == "a@x.com"
+
+
+def test_cache_is_bound_to_token_and_expiry(signed):
+    session = {}
+    session_claims(session, signed())
+    session["auth_claims"]["exp"] = int(time.time()) - 1
+
+    with pytest.raises(JoseError):               # expired token must re-verify and fail
+        session_claims(session, signed(exp_in=-10))
+
+
+def test_unknown_kid_refreshes_once_then_rejects(signed, monkeypatch):
+    calls = []
+    monkeypatch.setattr(auth, "refresh_jwks", lambda *a: calls.append(1))
+    monkeypatch.setattr(auth, "_JWKS_TS", time.time() - 120)
+
+    rotated = JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": "k2"})
+
+    with pytest.raises(JoseError):
+        auth.verify_cognito_jwt(signed(signing_key=rotated))
+    assert calls == [1]
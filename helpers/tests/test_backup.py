@@ -0,0 +1,148 @@
+import datetime
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+import helpers.backup as backup
+from helpers.live_route import save_route
+from models import db, Config, PickupRequest, DriverLocation, RouteSolution, RouteStop
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """File-backed SQLite so the parallel dump threads get their own connections."""
+    app = Flask("backup-tests")
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'src.db'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture(autouse=True)
+def _no_overlap(monkeypatch):
+    """Rows written within the test would all fall inside the re-read window."""
+    monkeypatch.setattr(backup, "_WATERMARK_OVERLAP", datetime.timedelta(0))
+
+
+def _pickup(address, **kw):
+    return PickupRequest(address=address, city="Dublin", zipcode="94568",
+                         awareness="Friend", **kw)
+
+
+def test_full_then_incremental_backup_restores(file_app, tmp_path, monkeypatch):
+    store = backup.LocalStore(tmp_path / "bucket")
+    stamps = iter(["20250101_000000", "20250102_000000"])
+    monkeypatch.setattr(backup, "_timestamp", lambda: next(stamps))
+
+    db.session.add_all([_pickup("1 A St"), _pickup("2 B St"),
+                        _pickup("3 C St", admin_notes=backup.SKIP_NOTE)])
+    db.session.add(DriverLocation(address="Depot", city="Pleasanton"))
+    db.session.commit()
+
+    full = backup.run_backup(store, max_workers=3)
+    assert full["kind"] == "full"
+    assert full["tables"]["pickup_requests"]["rows"] == 2          # backfill row skipped
+    entry = full["tables"]["pickup_requests"]
+    raw = (tmp_path / "bucket" / entry["object"]).read_bytes()
+    assert gzip.decompress(raw).decode().startswith("id,")
+
+    db.session.add(_pickup("4 D St", notes=None))
+    db.session.commit()
+    inc = backup.run_backup(store, incremental=True)
+    assert inc["kind"] == "incremental" and inc["parent"] == full["id"]
+    assert inc["tables"]["pickup_requests"]["rows"] == 1
+    assert inc["tables"]["driver_location"]["rows"] == 0
+
+    # Wipe, then restore the chain.
+    PickupRequest.query.delete()
+    DriverLocation.query.delete()
+    db.session.commit()
+
+    applied = backup.run_restore(store)
+    assert applied == [full["id"], inc["id"]]
+    assert sorted(p.address for p in PickupRequest.query) == ["1 A St", "2 B St", "4 D St"]
+    assert DriverLocation.query.one().city == "Pleasanton"
+
+
+def test_incremental_restore_replaces_resolved_route_stops(file_app, tmp_path, monkeypatch):
+    store = backup.LocalStore(tmp_path / "bucket")
+    stamps = iter(["20250101_000000", "20250102_000000"])
+    monkeypatch.setattr(backup, "_timestamp", lambda: next(stamps))
+
+    sol = RouteSolution(date="2025-06-02")
+    db.session.add(sol)
+    save_route(sol, ["D", "a", "b", "D"], [1, 2, 3], [10, 20, 30], [])
+    db.session.commit()
+    backup.run_backup(store)
+
+    save_route(sol, ["D", "b", "a", "D"], [4, 5, 6], [40, 50, 60], [])
+    db.session.commit()
+    backup.run_backup(store, incremental=True)
+
+    backup.run_restore(store)
+    db.session.expire_all()
+    stops = RouteStop.query.order_by(RouteStop.seq).all()
+    assert [s.geo for s in stops] == ["D", "b", "a", "D"]
+
+
+def test_incrementals_replay_edits_and_deletes(file_app, tmp_path, monkeypatch):
+    store = backup.LocalStore(tmp_path / "bucket")
+    stamps = iter(["20250101_000000", "20250102_000000"])
+    monkeypatch.setattr(backup, "_timestamp", lambda: next(stamps))
+
+    keep, drop = _pickup("1 A St"), _pickup("2 B St")
+    db.session.add_all([keep, drop, Config(key="admin_address", value="Old depot")])
+    db.session.commit()
+    backup.run_backup(store)
+
+    keep.status = "Complete"                                 # edited in place
+    db.session.delete(drop)
+    Config.query.one().value = "New depot"                   # no watermark: copied whole
+    db.session.commit()
+    inc = backup.run_backup(store, incremental=True)
+    assert inc["tables"]["pickup_requests"]["mode"] == "delta"
+    assert inc["tables"]["pickup_requests"]["rows"] == 1
+    assert inc["tables"]["pickup_requests"]["ids"] == [keep.id]
+    assert inc["tables"]["config"]["mode"] == "snapshot"
+
+    # Restore over a DB that still holds the full snapshot's state
+    db.session.add(_pickup("2 B St", id=drop.id))
+    keep.status = "Pending"
+    Config.query.one().value = "Old depot"
+    db.session.commit()
+
+    backup.run_restore(store)
+    db.session.expire_all()
+    assert [(p.address, p.status) for p in PickupRequest.query] == [("1 A St", "Complete")]
+    assert Config.query.one().value == "New depot"
+
+
+def test_full_restore_keeps_rows_outside_the_backup(file_app, tmp_path):
+    store = backup.LocalStore(tmp_path / "bucket")
+    db.session.add_all([_pickup("1 A St"), _pickup("3 C St", admin_notes=backup.SKIP_NOTE)])
+    db.session.commit()
+    backup.run_backup(store)
+
+    backup.run_restore(store)
+    assert sorted(p.address for p in PickupRequest.query) == ["1 A St", "3 C St"]
+
+
+def test_restore_rejects_corrupt_object(file_app, tmp_path):
+    store = backup.LocalStore(tmp_path / "bucket")
+    db.session.add(_pickup("1 A St"))
+    db.session.commit()
+    manifest = backup.run_backup(store)
+
+    obj = tmp_path / "bucket" / manifest["tables"]["pickup_requests"]["object"]
+    obj.write_bytes(gzip.compress(b"id\n999\n"))
+
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        backup.run_restore(store)
+    assert json.loads((tmp_path / "bucket" / "backups" / manifest["id"] / "manifest.json").read_text())
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from helpers import breadcrumbs
+from helpers.breadcrumbs import Ping, haversine_m, parse_pings, prune, record_pings, stop_etas
+from helpers.live_route import remaining_stops, save_route
+from models import DriverLocation, DriverPing, RouteSolution, db
+
+NOW = datetime(2025, 6, 2, 17, 0, 0)
+DAY = timedelta(hours=24)
+
+
+def _ms(at: datetime) -> int:
+    return int((at - datetime(1970, 1, 1)).total_seconds() * 1000)
+
+
+def test_parse_pings_sorts_and_skips_stale_or_future_fixes():
+    payload = {"pings": [
+        {"lon": -121.9, "lat": 37.7, "t": _ms(NOW - timedelta(seconds=30)), "accuracy": 12.6},
+        {"lon": -121.8, "lat": 37.6, "t": _ms(NOW - timedelta(seconds=60))},
+        {"lon": -121.8, "lat": 37.6, "t": _ms(NOW - 2 * DAY)},                    # stale
+        {"lon": -121.8, "lat": 37.6, "t": _ms(NOW + timedelta(hours=1))},        # future
+    ]}
+    pings = parse_pings(payload, max_age=DAY, now=NOW)
+
+    assert [(p.lon, p.accuracy_m) for p in pings] == [(-121.8, None), (-121.9, 12)]
+    assert pings[-1].recorded_at == NOW - timedelta(seconds=30)
+    assert pings[-1].geo == "-121.900000,37.700000"
+
+
+@pytest.mark.parametrize("payload", [
+    {}, {"pings": "x"}, {"pings": [{"lon": 1}]}, {"pings": [{"lon": 200, "lat": 0, "t": 0}]},
+    {"pings": [{"lon": 0, "lat": 0, "t": 0}] * (breadcrumbs.MAX_BATCH + 1)},
+])
+def test_parse_pings_rejects_malformed_batches(payload):
+    with pytest.raises(ValueError):
+        parse_pings(payload, max_age=DAY, now=NOW)
+
+
+def test_record_pings_appends_and_moves_driver_location(app, monkeypatch):
+    monkeypatch.setattr(breadcrumbs, "_pruned_at", 0.0)
+    monkeypatch.setattr(breadcrumbs, "_utcnow", lambda: NOW)
+    db.session.add(DriverPing(recorded_at=NOW - 4 * DAY, lon_e6=0, lat_e6=0))
+    db.session.commit()
+
+    latest = record_pings([Ping(NOW - timedelta(seconds=5), -121.8, 37.6, 9),
+                           Ping(NOW, -121.912345, 37.654321)], retention=3 * DAY)
+    db.session.commit()
+
+    rows = DriverPing.query.order_by(DriverPing.recorded_at).all()
+    assert [(r.lon_e6, r.lat_e6, r.accuracy_m) for r in rows] == [
+        (-121800000, 37600000, 9), (-121912345, 37654321, None)]     # old row pruned
+    assert rows[-1].lon == -121.912345
+    assert DriverLocation.query.one().geocoded_addr == latest.geo == "-121.912345,37.654321"
+
+
+def test_prune_deletes_only_rows_past_retention(app):
+    db.session.add_all([DriverPing(recorded_at=NOW - 2 * DAY, lon_e6=0, lat_e6=0),
+                        DriverPing(recorded_at=NOW - timedelta(hours=1), lon_e6=0, lat_e6=0)])
+    db.session.commit()
+    assert prune(DAY, now=NOW) == 1
+    assert DriverPing.query.count() == 1
+
+
+def _stops(app_geos, legs):
+    sol = RouteSolution(date="2025-06-02")
+    db.session.add(sol)
+    save_route(sol, app_geos, legs, [0] * len(legs), zip((1, 2), app_geos[1:3]))
+    db.session.commit()
+    return sol.stops
+
+
+def test_stop_etas_scale_the_current_leg_and_add_the_rest(app):
+    depot, a, b = "-121.90,37.70", "-121.80,37.70", "-121.70,37.70"
+    stops = _stops([depot, a, b, depot], [600, 300, 900])
+    done, ahead = remaining_stops(stops, [1, 2])
+
+    # Halfway (in a straight line) from the depot to `a`
+    assert stop_etas(done, ahead, (-121.85, 37.70)) == [300, 600, 1500]
+    assert stop_etas(done, ahead, (-121.85, 37.70), dwell_seconds=120) == [300, 720, 1740]
+
+    # `a` done: its stop is passed, so the fix is measured against a → b
+    done, ahead = remaining_stops(stops, [2])
+    assert stop_etas(done, ahead, (-121.70, 37.70)) == [0, 900]
+
+
+def test_stop_etas_fall_back_to_flat_speed_without_a_usable_leg(app):
+    here, there = (-121.90, 37.70), (-121.80, 37.70)
+    stops = _stops(["text depot", "-121.80,37.70", "x", "text depot"], [600, 300, 900])
+    done, ahead = remaining_stops(stops, [1, 2])
+
+    expected = round(haversine_m(here, there) * breadcrumbs.DETOUR_FACTOR
+                     / breadcrumbs.FALLBACK_SPEED_MPS)
+    assert stop_etas(done, ahead, here) == [expected, expected + 300, expected + 1200]
+    assert stop_etas(done, [], here) == []
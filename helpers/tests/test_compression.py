@@ -0,0 +1,113 @@
+import gzip
+
+import brotli
+import pytest
+from flask import Flask, Response, stream_with_context
+from werkzeug.test import Client
+
+from helpers.compression import CompressionMiddleware, choose_encoding
+
+BIG = "<tr><td>pickup</td><td>Pleasanton</td></tr>\n" * 200
+
+
+@pytest.fixture
+def client():
+    app = Flask("compression")
+    closed = []
+
+    @app.route("/page")
+    def page():
+        resp = Response(BIG, mimetype="text/html")
+        resp.set_etag("v1")
+        return resp
+
+    @app.route("/small")
+    def small():
+        return {"ok": True}
+
+    @app.route("/png")
+    def png():
+        return Response(b"\x89PNG" * 1000, mimetype="image/png")
+
+    @app.route("/stream")
+    def stream():
+        def rows():
+            try:
+                for _ in range(20):
+                    yield BIG
+            finally:
+                closed.append(True)
+        return Response(stream_with_context(rows()), mimetype="text/html")
+
+    @app.route("/events")
+    def events():
+        return Response(iter([BIG]), mimetype="text/event-stream")
+
+    @app.route("/precompressed")
+    def precompressed():
+        return Response(gzip.compress(BIG.encode()), mimetype="text/css",
+                        headers={"Content-Encoding": "gzip"})
+
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, min_size=1024)
+    app.closed = closed
+    return app.test_client()
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"), ("gzip", "gzip"), ("br;q=0, gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"), ("*", "br"), ("identity", None), (None, None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_compresses_with_the_preferred_encoding(client):
+    br = client.get("/page", headers={"Accept-Encoding": "gzip, br"})
+    gz = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/page")
+
+    assert br.headers["Content-Encoding"] == "br"
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert "Content-Encoding" not in plain.headers
+    assert brotli.decompress(br.data).decode() == gzip.decompress(gz.data).decode() == BIG
+    assert int(br.headers["Content-Length"]) == len(br.data) < len(BIG) // 10
+    for resp in (br, gz, plain):
+        assert resp.headers["Vary"] == "Accept-Encoding"
+    assert br.headers["ETag"] == 'W/"v1"' and plain.headers["ETag"] == '"v1"'
+
+
+def test_skips_small_incompressible_and_already_encoded_bodies(client):
+    small = client.get("/small", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in small.headers and small.json == {"ok": True}
+    assert small.headers["Vary"] == "Accept-Encoding"
+
+    png = client.get("/png", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in png.headers and "Vary" not in png.headers
+
+    events = client.get("/events", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in events.headers and events.text == BIG
+
+    pre = client.get("/precompressed", headers={"Accept-Encoding": "br"})
+    assert pre.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(pre.data).decode() == BIG
+
+    head = client.head("/page", headers={"Accept-Encoding": "br"})
+    assert "Content-Encoding" not in head.headers
+
+
+def test_streams_bodies_of_unknown_length(client):
+    resp = client.get("/stream", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in resp.headers
+    assert gzip.decompress(b"".join(resp.response)).decode() == BIG * 20
+    resp.close()
+    assert client.application.closed == [True]
+
+
+def test_unknown_length_below_threshold_passes_through():
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return iter([b"tiny ", b"body"])
+
+    resp = Client(CompressionMiddleware(app)).get("/", headers={"Accept-Encoding": "br"})
+    assert resp.data == b"tiny body" and "Content-Encoding" not in resp.headers
@@ -0,0 +1,115 @@
+from gspread.exceptions import WorksheetNotFound
+
+import helpers.export as export
+from models import db, PickupRequest, ExportedRow
+
+
+class _FakeWorksheet:
+    def __init__(self, title, rows=1):
+        self.title = title
+        self.row_count = rows
+        self.cells = {}          # row number -> list of values
+
+    def update(self, start, values, value_input_option=None):
+        first = int(start.lstrip("A"))
+        for i, row in enumerate(values):
+            self.cells[first + i] = list(row)
+
+    def add_rows(self, n):
+        self.row_count += n
+
+    def clear(self):
+        self.cells.clear()
+
+    def update_title(self, title):
+        self.title = title
+
+
+class _FakeSpreadsheet:
+    def __init__(self):
+        self.tabs = {}
+        self.batch_calls = []
+
+    def worksheet(self, title):
+        if title not in self.tabs:
+            raise WorksheetNotFound(title)
+        return self.tabs[title]
+
+    def worksheets(self):
+        return list(self.tabs.values())
+
+    def add_worksheet(self, title, rows, cols):
+        self.tabs[title] = _FakeWorksheet(title, int(rows))
+        return self.tabs[title]
+
+    def del_worksheet(self, ws):
+        self.tabs.pop(ws.title, None)
+
+    def values_batch_update(self, body):
+        self.batch_calls.append(body)
+        for item in body["data"]:
+            title, cell = item["range"].split("!")
+            self.tabs[title.strip("'")].update(cell, item["values"])
+
+
+def _add(**kw):
+    defaults = dict(address="1 Main St", city="Pleasanton", zipcode="94566",
+                    awareness="Friend", date_filed="2025-01-01")
+    defaults.update(kw)
+    db.session.add(PickupRequest(**defaults))
+    db.session.commit()
+
+
+def test_delta_export_sends_only_changed_and_new_rows(app, monkeypatch):
+    ss = _FakeSpreadsheet()
+    monkeypatch.setattr(export, "_open_requests_spreadsheet", lambda: ss)
+
+    for i in range(3):
+        _add(address=f"{i} Main St")
+    export.weekly_export(mode="full", chunk_size=2)
+
+    ws = ss.tabs["Requests"]
+    assert len(ws.cells) == 4                      # header + 3 rows
+    assert ExportedRow.query.count() == 3
+
+    # Unchanged table → only the header range goes out.
+    export.weekly_export(mode="delta")
+    assert [len(c["data"]) for c in ss.batch_calls] == [1]
+
+    # One edit + one new row → exactly those two ranges (plus the header).
+    edited = PickupRequest.query.order_by(PickupRequest.id).first()
+    edited.city = "Dublin"
+    db.session.commit()
+    _add(address="99 New St")
+    export.weekly_export(mode="delta")
+
+    sent = ss.batch_calls[-1]["data"]
+    assert len(sent) == 3
+    state = {s.request_id: s.sheet_row for s in ExportedRow.query.all()}
+    assert state[edited.request_id] in range(2, 5)
+    assert max(state.values()) == 5
+    assert "Dublin" in ws.cells[state[edited.request_id]]
+    assert "99 New St" in ws.cells[5]
+
+
+def test_delta_export_blanks_deleted_rows(app, monkeypatch):
+    ss = _FakeSpreadsheet()
+    monkeypatch.setattr(export, "_open_requests_spreadsheet", lambda: ss)
+
+    _add(address="1 Keep St")
+    _add(address="2 Gone St")
+    export.weekly_export(mode="full")
+
+    gone = PickupRequest.query.filter_by(address="2 Gone St").first()
+    row = ExportedRow.query.filter_by(request_id=gone.request_id).first().sheet_row
+    db.session.delete(gone)
+    db.session.commit()
+
+    export.weekly_export(mode="delta")
+    assert set(ss.tabs["Requests"].cells[row]) == {""}
+    assert ExportedRow.query.count() == 1
+
+
+def test_backup_watermark_is_not_exported():
+    header = export._header_row()
+    assert "Updated At" not in header and "Id" not in header
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+import requests
+
+import helpers.address as address_mod
+from helpers.address import AddressError, verifyAddress
+from helpers.api_urls import mapbox_url
+from helpers.mapbox_routing import _maybe_geocode, fetch_matrices_mapbox
+
+DEPOT = "5389 Mallard Dr., Pleasanton, CA 94566"
+STOPS = [f"{100 + i} Main St, Pleasanton, CA 94566" for i in range(30)]
+
+
+@pytest.fixture
+def google(app, geo_standin, monkeypatch):
+    app.config["GOOGLE_BACKEND_API_KEY"] = "standin"
+    address_mod._result_cache.clear()
+    monkeypatch.setattr(address_mod, "_outage_until", 0.0)
+    return geo_standin
+
+
+def test_base_urls_follow_the_environment(geo_standin, monkeypatch):
+    assert mapbox_url("/directions/v5") == f"{geo_standin.url}/directions/v5"
+    monkeypatch.delenv("MAPBOX_API_URL")
+    assert mapbox_url("/directions/v5") == "https://api.mapbox.com/directions/v5"
+
+
+def test_geocoding_is_deterministic(app, geo_standin):
+    first = _maybe_geocode(DEPOT, "standin")
+    assert first == _maybe_geocode(DEPOT, "standin") != _maybe_geocode(STOPS[0], "standin")
+    lon, lat = map(float, first.split(","))
+    assert -122.05 <= lon <= -121.70 and 37.62 <= lat <= 37.82
+
+
+def test_matrix_tiles_large_inputs_and_matches_a_single_call(app, geo_standin):
+    small_dur, small_dist = fetch_matrices_mapbox([DEPOT, *STOPS[:5]])
+    dur, dist = fetch_matrices_mapbox([DEPOT, *STOPS])        # 31 coords -> tiled
+
+    assert geo_standin.hits["matrix"] > 2
+    assert [row[:6] for row in dur[:6]] == small_dur
+    assert [row[:6] for row in dist[:6]] == small_dist
+    assert all(dur[i][i] == 0 for i in range(len(dur)))
+    assert dist[1][2] == dist[2][1] > 0
+
+
+def test_directions_sum_the_legs(app, geo_standin):
+    a, b = _maybe_geocode(DEPOT, "standin"), _maybe_geocode(STOPS[3], "standin")
+    route = requests.get(mapbox_url(f"/directions/v5/mapbox/driving/{a};{b};{a}"),
+                         params={"access_token": "standin"}).json()["routes"][0]
+    there, back = route["legs"]
+    assert there["distance"] == back["distance"] > 0
+    assert route["duration"] == pytest.approx(route["distance"] / 13.4, rel=0.01)
+
+
+def test_verify_address_via_place_details_and_validation(google):
+    google.add_place("pid-1", "4057 Sherry Ct, Pleasanton, CA 94566")
+
+    assert verifyAddress("4057 Sherry Ct", "pid-1", "Pleasanton", "94566") == (True, "")
+    assert verifyAddress("1 Elm St, Dublin, CA 94568", None, "Dublin", "94568") == (True, "")
+    ok, msg = verifyAddress("1 Elm St, Dublin, CA", None, "Dublin", "94568")
+    assert not ok and "complete match" in msg
+    assert google.hits == {"place_details": 1, "validate_address": 2}
+
+
+def test_injected_faults(google):
+    google.configure(throttle_rate=1.0)
+    with pytest.raises(AddressError):
+        verifyAddress("1 Elm St, Dublin, CA 94568", None, "Dublin", "94568")
+
+    google.configure(error_rate=1.0)
+    resp = requests.get(mapbox_url("/geocoding/v5/mapbox.places/x.json"),
+                        params={"access_token": "standin"})
+    assert resp.status_code == 500
+
+    google.configure(latency=0.05)
+    t0 = time.perf_counter()
+    requests.get(mapbox_url("/geocoding/v5/mapbox.places/x.json"), params={"access_token": "standin"})
+    assert time.perf_counter() - t0 >= 0.05
+    assert requests.get(mapbox_url("/geocoding/v5/mapbox.places/x.json")).status_code == 401
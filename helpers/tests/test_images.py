@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from flask import Flask, render_template_string
+
+import helpers.images as images
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    src, out = tmp_path / "images", tmp_path / "images" / "opt"
+    src.mkdir()
+    monkeypatch.setattr(images, "SRC_DIR", src)
+    monkeypatch.setattr(images, "OUT_DIR", out)
+    monkeypatch.setattr(images, "MANIFEST", out / "manifest.json")
+    images._manifest_cache.clear()
+    yield src, out
+    images._manifest_cache.clear()
+
+
+@pytest.fixture
+def site(tmp_path):
+    app = Flask("images", static_folder=str(tmp_path), static_url_path="/static")
+    images.register(app)
+    return app
+
+
+def _write_manifest(out, manifest):
+    out.mkdir(exist_ok=True)
+    (out / "manifest.json").write_text(json.dumps(manifest))
+    images._manifest_cache.clear()
+
+
+def test_unbuilt_image_falls_back_to_plain_img(dirs, site):
+    with site.test_request_context():
+        html = str(images.picture("Boxes1.jpeg", "Drop boxes", class_="hero"))
+    assert html.startswith("<img ") and 'src="/static/images/Boxes1.jpeg"' in html
+    assert 'class="hero"' in html and 'loading="lazy"' in html
+
+
+def test_picture_emits_sources_per_format(dirs, site):
+    _write_manifest(dirs[1], {"Boxes1.jpeg": {
+        "sha256": "x", "width": 1200, "height": 800, "fallback": "Boxes1.960.bbb.jpeg",
+        "sources": {"webp": [{"w": 480, "file": "Boxes1.480.aaa.webp"},
+                             {"w": 960, "file": "Boxes1.960.ccc.webp"}],
+                    "avif": [{"w": 480, "file": "Boxes1.480.ddd.avif"}]},
+    }})
+    with site.test_request_context():
+        html = render_template_string(
+            "{{ picture('Boxes1.jpeg', 'Boxes', sizes='50vw', aria_hidden='true') }}")
+
+    assert html.index('type="image/avif"') < html.index('type="image/webp"')
+    assert "/static/images/opt/Boxes1.480.aaa.webp 480w, /static/images/opt/Boxes1.960.ccc.webp 960w" in html
+    assert 'src="/static/images/opt/Boxes1.960.bbb.jpeg"' in html
+    assert 'width="1200" height="800"' in html and 'aria-hidden="true"' in html
+
+
+def test_hashed_variants_are_served_immutable(tmp_path, site):
+    (tmp_path / "images" / "opt").mkdir(parents=True)
+    (tmp_path / "images" / "opt" / "a.480.abc.webp").write_bytes(b"RIFF")
+    (tmp_path / "images" / "plain.png").write_bytes(b"PNG")
+    client = site.test_client()
+
+    cc = client.get("/static/images/opt/a.480.abc.webp").headers["Cache-Control"]
+    assert "immutable" in cc and "max-age=31536000" in cc
+    assert "immutable" not in client.get("/static/images/plain.png").headers.get("Cache-Control", "")
+
+
+def test_build_is_incremental(dirs):
+    Image = pytest.importorskip("PIL.Image")
+    src, out = dirs
+    Image.new("RGB", (1000, 500), "green").save(src / "a.jpeg", exif=b"Exif\x00\x00")
+    Image.new("RGBA", (300, 300), "red").save(src / "b.png")
+
+    logged = []
+    manifest = images.build(widths=(480, 960), log=logged.append)
+    assert sorted(logged) == ["encoding a.jpeg", "encoding b.png"]
+    assert [v["w"] for v in manifest["a.jpeg"]["sources"]["webp"]] == [480, 960]
+    assert [v["w"] for v in manifest["b.png"]["sources"]["webp"]] == [300]
+    with Image.open(out / manifest["a.jpeg"]["fallback"]) as fallback:
+        assert not fallback.getexif()
+
+    logged.clear()
+    images.build(widths=(480, 960), log=logged.append)
+    assert logged == []
+
+    Image.new("RGB", (1000, 500), "blue").save(src / "a.jpeg")
+    (src / "b.png").unlink()
+    manifest = images.build(widths=(480, 960), log=logged.append)
+    assert logged == ["encoding a.jpeg"] and set(manifest) == {"a.jpeg"}
+    assert {p.name for p in out.iterdir()} == images._files_of(manifest["a.jpeg"]) | {"manifest.json"}
@@ -0,0 +1,29 @@
+import helpers.import_backfill as backfill_mod
+from models import PickupRequest
+
+
+def test_bulk_import_streams_rows_in_chunks(app, tmp_path):
+    csv_path = tmp_path / "backfill.csv"
+    csv_path.write_text(
+        "Last Name,First Name,Address 1,Address 2,City,Zip,Email,Phone,"
+        "Last Pick-Up / Drop-Off,Awareness\n"
+        "Doe,Jane,1 Main St,,Dublin,94568,j@x.com,555,01/02/24,Nextdoor\n"
+        "Doe,John,2 Main St,Apt 4,Dublin,94568,,,inquiry,\n"
+        "Roe,Rita,3 Main St,,Livermore,94550,,,12/31/23,\n"
+        "Poe,Pat,4 Main St,,Livermore,94550,,,not a date,\n"
+        "Moe,Max,5 Main St,,Pleasanton,94566,,,03/04/22,Flyer\n",
+        encoding="utf-8",
+    )
+    backfill_mod.register(app)
+
+    result = app.test_cli_runner().invoke(
+        args=["import-backfill", "--path", str(csv_path), "--bulk", "--chunk-size", "2"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Imported 3 rows" in result.output
+    rows = PickupRequest.query.order_by(PickupRequest.id).all()
+    assert [r.address for r in rows] == ["1 Main St", "3 Main St", "5 Main St"]
+    assert rows[1].request_date == "2023-12-31" and rows[1].awareness == "Unknown"
+    assert len({r.request_id for r in rows}) == 3
+    assert all(r.email == "" and r.status == "Complete" for r in rows)
@@ -0,0 +1,66 @@
+from helpers.live_route import roll_forward, row_state, save_route, state_etag
+from helpers.query_stats import assert_max_queries
+from models import PickupRequest, RouteSolution, RouteStop, db
+
+DEPOT = "-121.87,37.66"
+
+
+def _solution(pickup_ids=(1, 2, 3)):
+    sol = RouteSolution(date="2025-06-02")
+    db.session.add(sol)
+    save_route(sol, [DEPOT, "a", "b", "c", DEPOT], [60, 120, 180, 240], [1000, 2000, 3000, 4000],
+               zip(pickup_ids, ["a", "b", "c"]))
+    db.session.commit()
+    return sol
+
+
+def test_save_route_stores_ordered_stops_and_integer_totals(app):
+    sol = _solution()
+    stops = RouteStop.query.filter_by(solution_id=sol.id).order_by(RouteStop.seq).all()
+
+    assert [(s.seq, s.pickup_id, s.geo) for s in stops] == [
+        (0, None, DEPOT), (1, 1, "a"), (2, 2, "b"), (3, 3, "c"), (4, None, DEPOT)]
+    assert [s.cum_seconds for s in stops] == [0, 60, 180, 360, 600]
+    assert (sol.total_seconds, sol.total_distance_meters) == (600, 10000)
+
+    # Re-solving replaces the rows in place
+    save_route(sol, [DEPOT, "c", DEPOT], [30, 40], [300, 400], [(3, "c")])
+    db.session.commit()
+    assert [(s.seq, s.pickup_id) for s in sol.stops] == [(0, None), (1, 3), (2, None)]
+    assert RouteStop.query.count() == 3
+
+
+def test_roll_forward_peels_done_stops_with_one_read(app):
+    sol = _solution()
+    db.session.expire_all()
+    sol = db.session.get(RouteSolution, sol.id)
+
+    with assert_max_queries(1):
+        left = roll_forward(sol, [2, 3], DEPOT, driver_location="-121.9,37.7")
+    assert left.addresses == ("-121.9,37.7", "b", "c", DEPOT)
+    assert left.legs_seconds == (120, 180, 240)
+    assert (left.seconds, left.meters) == (540, 9000)
+    assert not db.session.dirty
+
+    # 2 done before 1: the driver still passes 1, so nothing is peeled yet
+    assert roll_forward(sol, [1, 3], DEPOT).addresses == (DEPOT, "a", "b", "c", DEPOT)
+    assert roll_forward(sol, [], DEPOT).addresses == (DEPOT, DEPOT)
+    assert roll_forward(sol, [], DEPOT).seconds == 240          # still has to drive home
+    assert roll_forward(RouteSolution(date="x"), [1], DEPOT).addresses == ()
+
+
+def test_roll_forward_moves_the_end_stop_with_the_depot(app):
+    sol = _solution()
+    left = roll_forward(sol, [2, 3], "-121.80,37.70")
+
+    assert left.addresses == (DEPOT, "b", "c", "-121.80,37.70")
+    assert len(left.legs_seconds) == len(left.legs_meters) == len(left.addresses) - 1
+    assert left.seconds == 540          # old last leg stands in until a re-solve
+
+
+def test_state_etag_tracks_row_changes():
+    p = PickupRequest(id=1, status="Requested")
+    first = state_etag("2025-06-02", [row_state(p)])
+    assert state_etag("2025-06-02", [row_state(p)]) == first
+    p.status = "Complete"
+    assert state_etag("2025-06-02", [row_state(p)]) != first
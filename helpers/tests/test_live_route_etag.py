@@ -0,0 +1,62 @@
+"""/live-route conditional GETs against the real app (skipped without its dependencies)."""
+import time
+
+import pytest
+
+from helpers.live_route import save_route
+from helpers.site_config import set_depot
+from models import DriverLocation, PickupRequest, RouteSolution, db
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")   # Flask-Session filesystem backend
+
+DAY = time.strftime("%Y-%m-%d")
+DEPOT = "-121.87,37.66"
+
+
+@pytest.fixture
+def client(site):
+    with site.app_context():
+        db.create_all()
+        set_depot("5389 Mallard Dr., Pleasanton, CA 94566", DEPOT)
+        stops = [PickupRequest(address=f"{100 + i} Main St", city="Pleasanton", zipcode="94566",
+                               geocoded_addr=f"-121.8{i},37.6{i}", awareness="Friend",
+                               status="Requested", request_date=DAY, request_id=f"ET{i:06d}")
+                 for i in range(3)]
+        db.session.add_all(stops)
+        db.session.add(DriverLocation(address="1 First St", city="Dublin", geocoded_addr="-121.9,37.7"))
+        db.session.flush()
+        route = RouteSolution(date=DAY)
+        db.session.add(route)
+        save_route(route, [DEPOT, *(p.geocoded_addr for p in stops), DEPOT], [300] * 4, [2000] * 4,
+                   [(p.id, p.geocoded_addr) for p in stops])
+        db.session.commit()
+
+        client = site.test_client()
+        with client.session_transaction() as sess:
+            sess["id_token"] = "signed-in"
+        yield client
+        db.session.remove()
+        db.drop_all()
+
+
+def _ping(client, lon, lat):
+    resp = client.post("/driver/pings", json={
+        "date": DAY, "pings": [{"lon": lon, "lat": lat, "t": int(time.time() * 1000)}]})
+    assert resp.status_code == 200
+
+
+def test_driver_pings_keep_the_page_cacheable(client):
+    first = client.get(f"/live-route?date={DAY}")
+    assert first.status_code == 200
+    assert "1 First St, Dublin CA" in first.text          # last stop, not the GPS fix
+    etag = first.headers["ETag"]
+
+    _ping(client, -121.85, 37.65)
+    _ping(client, -121.84, 37.64)
+    again = client.get(f"/live-route?date={DAY}", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+
+    PickupRequest.query.filter_by(request_id="ET000000").one().status = "Complete"
+    db.session.commit()
+    changed = client.get(f"/live-route?date={DAY}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
@@ -1,3 +1,4 @@
+import threading
 import time
 from flask import Flask
 import helpers.monitoring as mon
@@ -20,3 +21,24 @@ def test_login_failure_spike(monkeypatch):
     assert mon._login_failure_check(threshold=threshold) is True
     assert any("Login failures threshold" in kw["error_type"] for _, kw in emails)
 
+
+
+def test_concurrent_5xx_alert_once_and_count_every_event(monkeypatch):
+    emails = _capture_emails(monkeypatch)
+    mon._reset_state(mon._5xx_state)
+    app = Flask("tests")
+
+    def hit():
+        with app.test_request_context("/boom"):
+            for _ in range(50):
+                mon.record_5xx()
+
+    threads = [threading.Thread(target=hit) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert mon._5xx_state["count"] == 400
+    assert len(emails) == 1
+    mon._reset_state(mon._5xx_state)
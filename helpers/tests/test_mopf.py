@@ -0,0 +1,48 @@
+import datetime
+
+import helpers.mopf as mopf_mod
+from models import DonationRecord, db
+
+
+class FakeWorksheet:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def insert_rows(self, values, row, value_input_option):
+        if self.fail:
+            raise RuntimeError("Sheets API unavailable")
+        self.calls.append((row, values))
+
+
+def _queue(n):
+    for i in range(n):
+        db.session.add(DonationRecord(
+            firstName=f"F{i}", lastName="L", email="d@x.com", address=f"{i} Main St",
+            city="Dublin", zip="94568", estimated_value="25", donation_date="2026-10-01",
+            submitted_at=datetime.datetime(2026, 10, 1, 9, 0, i),
+        ))
+    db.session.commit()
+
+
+def test_flush_pending_batches_newest_first_and_marks_synced(app, monkeypatch):
+    ws = FakeWorksheet()
+    monkeypatch.setattr(mopf_mod, "_get_worksheet", lambda: ws)
+    _queue(5)
+
+    assert mopf_mod.flush_pending(batch_size=2) == 5
+
+    assert [len(values) for _, values in ws.calls] == [2, 2, 1]
+    assert all(row == 2 for row, _ in ws.calls)
+    assert [v[0] for v in ws.calls[0][1]] == ["F1", "F0"]
+    assert ws.calls[0][1][0][-1] == "2026-10-01 09:00:01"
+    assert DonationRecord.query.filter(DonationRecord.sheet_synced_at.is_(None)).count() == 0
+    assert mopf_mod.flush_pending() == 0
+
+
+def test_flush_pending_keeps_rows_queued_on_api_error(app, monkeypatch):
+    monkeypatch.setattr(mopf_mod, "_get_worksheet", lambda: FakeWorksheet(fail=True))
+    _queue(3)
+
+    assert mopf_mod.flush_pending() == 0
+    assert DonationRecord.query.filter(DonationRecord.sheet_synced_at.is_(None)).count() == 3
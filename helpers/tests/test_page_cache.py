@@ -0,0 +1,116 @@
+import re
+
+import pytest
+from flask import Flask, flash
+from flask_talisman import Talisman
+from flask_wtf import CSRFProtect, FlaskForm
+from jinja2 import DictLoader
+
+import helpers.page_cache as page_cache
+from helpers.page_cache import cacheable_page, render_cached
+
+
+@pytest.fixture
+def site():
+    page_cache.clear()
+    app = Flask("pages")
+    app.config.update(SECRET_KEY="t", PAGE_CACHE_ENABLED=True, SITE_URL="https://ekolinq.test/")
+    app.jinja_loader = DictLoader({
+        "page.html": '<script nonce="{{ csp_nonce() }}"></script>{{ calls.append(1) or "" }}',
+        "form.html": "<form>{{ form.hidden_tag() }}</form>",
+        "canonical.html": '<link rel="canonical" href="{{ request.url }}">'
+                          "{{ url_for('canonical', _external=True) }}{{ calls.append(1) or '' }}",
+    })
+    CSRFProtect(app)
+    page_cache.init_app(app)
+    Talisman(app, content_security_policy={"script-src": "'self'"},
+             content_security_policy_nonce_in=["script-src"], force_https=False)
+    calls = []
+
+    @app.route("/page")
+    @cacheable_page
+    def page():
+        return render_cached("page.html", calls=calls)
+
+    @app.route("/form")
+    @cacheable_page
+    def form():
+        return render_cached("form.html", form=FlaskForm())
+
+    @app.route("/canonical")
+    @cacheable_page
+    def canonical():
+        return render_cached("canonical.html", calls=calls)
+
+    @app.route("/flash")
+    def set_flash():
+        flash("hi")
+        return "ok"
+
+    app.calls = calls
+    yield app
+    page_cache.clear()
+
+
+def _nonce(resp):
+    return re.search(r"'nonce-([^']+)'", resp.headers["Content-Security-Policy"]).group(1)
+
+
+def test_rendered_once_with_fresh_nonce_per_response(site):
+    client = site.test_client()
+    first, second = client.get("/page"), client.get("/page")
+
+    assert site.calls == [1]
+    for resp in (first, second):
+        assert f'nonce="{_nonce(resp)}"' in resp.text
+    assert _nonce(first) != _nonce(second)
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+
+def test_conditional_get_returns_304_without_csp(site):
+    client = site.test_client()
+    etag = client.get("/page").headers["ETag"]
+
+    resp = client.get("/page", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.data == b""
+    assert "Content-Security-Policy" not in resp.headers
+
+
+def test_csrf_pages_get_a_real_token_and_no_validators(site):
+    client = site.test_client()
+    tokens = set()
+    for _ in range(2):
+        resp = client.get("/form")
+        token = re.search(r'name="csrf_token" type="hidden" value="([^"]+)"', resp.text).group(1)
+        assert "__ekolinq" not in token
+        assert "ETag" not in resp.headers
+        tokens.add(token)
+    assert len(tokens) == 1              # same session -> same signed token
+
+    other = site.test_client().get("/form").text
+    assert tokens.pop() not in other     # never another visitor's token
+
+
+def test_query_strings_and_flashes_bypass_the_cache(site):
+    client = site.test_client()
+    client.get("/page")
+    client.get("/page?utm_source=x")
+    client.get("/flash")
+    client.get("/page")
+    assert site.calls == [1, 1, 1]
+
+
+def test_warm_renders_marked_views(site):
+    assert page_cache.warm(site) == 3
+    assert site.calls == [1, 1]
+
+
+def test_host_header_neither_keys_nor_leaks_into_the_cache(site):
+    client = site.test_client()
+    pages = {client.get("/canonical", headers={"Host": host}).text
+             for host in ("ekolinq.test", "evil.example", "a.evil.example")}
+
+    assert site.calls == [1]
+    assert pages == {'<link rel="canonical" href="https://ekolinq.test/canonical">'
+                     "https://ekolinq.test/canonical"}
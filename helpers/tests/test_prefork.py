@@ -0,0 +1,27 @@
+import gc
+
+import helpers.prefork as prefork
+from helpers.service_area import _index_cache
+from models import ServiceArea, db
+
+
+def test_warm_builds_shared_caches_before_fork(app, monkeypatch):
+    db.session.add(ServiceArea(zipcode="94566", city="Pleasanton"))
+    db.session.commit()
+    _index_cache.invalidate()
+    started = []
+    monkeypatch.setattr(prefork, "start_background_threads", lambda a: started.append(a))
+
+    try:
+        prefork.warm(app)
+    finally:
+        gc.unfreeze()
+    prefork.after_fork(app)
+    prefork.worker_ready(app, forked_at=None)
+
+    assert _index_cache._value is not None and "94566" in _index_cache._value
+    assert started == [app]
+
+
+def test_memory_usage_reports_rss():
+    assert prefork.memory_usage()["rss"] > 0
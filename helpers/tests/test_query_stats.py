@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+
+import helpers.query_stats as query_stats
+from helpers.query_stats import assert_max_queries, assert_query_budget, fingerprint, query_budget
+from models import Config, db
+
+
+@pytest.fixture
+def site(app):
+    app.config["QUERY_STATS_HEADERS"] = True
+    query_stats.init_app(app)
+    query_stats.reset()
+    db.session.add_all([Config(key=f"k{i}", value=str(i)) for i in range(5)])
+    db.session.commit()
+
+    @app.route("/one-query")
+    @query_budget(1)
+    def one_query():
+        return {"n": Config.query.count()}
+
+    @app.route("/n-plus-one")
+    @query_budget(2)
+    def n_plus_one():
+        keys = [c.key for c in Config.query.all()]
+        return {"values": [Config.query.filter_by(key=k).first().value for k in keys]}
+
+    yield app
+    query_stats.reset()
+
+
+def test_fingerprint_normalises_literals_and_in_lists():
+    a = fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'x'   AND v IN (?, ?, ?)")
+    b = fingerprint("SELECT *\n FROM t WHERE id = 22 AND name = 'it''s' AND v IN (?)")
+    assert a == b == "SELECT * FROM t WHERE id = ? AND name = ? AND v IN (?…)"
+    assert fingerprint("SELECT a FROM t WHERE b = %(b_1)s") == "SELECT a FROM t WHERE b = ?"
+
+
+def test_headers_logs_and_stats(site, caplog):
+    client = site.test_client()
+    ok = client.get("/one-query")
+    assert ok.headers["X-DB-Queries"] == "1" and ok.headers["X-DB-Repeated"] == "0"
+
+    with caplog.at_level(logging.WARNING):
+        bad = client.get("/n-plus-one")
+    assert bad.headers["X-DB-Queries"] == "6" and bad.headers["X-DB-Repeated"] == "1"
+    warnings = [r.getMessage() for r in caplog.records]
+    assert any("n_plus_one ran the same statement 5x" in m for m in warnings)
+    assert any("over its budget of 2" in m for m in warnings)
+
+    stats = query_stats.stats()
+    assert stats["one_query"]["queries"] == 1
+    assert stats["n_plus_one"] == {"requests": 1, "queries": 6, "seconds": stats["n_plus_one"]["seconds"],
+                                   "max_queries": 6, "repeated_requests": 1, "mean_queries": 6.0}
+
+
+def test_budget_helpers(site):
+    client = site.test_client()
+    assert assert_query_budget(client, "/one-query").json == {"n": 5}
+
+    with pytest.raises(AssertionError, match="budget 2, ran 6 queries"):
+        assert_query_budget(client, "/n-plus-one")
+    with pytest.raises(AssertionError, match=r"ran 5x \(N\+1\?\)"):
+        assert_query_budget(client, "/n-plus-one", budget=10)
+
+    with assert_max_queries(2) as log:
+        Config.query.all()
+    assert log.count == 1
+    with pytest.raises(AssertionError, match="at most 0 queries"):
+        with assert_max_queries(0):
+            Config.query.all()
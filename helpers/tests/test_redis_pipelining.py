@@ -0,0 +1,125 @@
+import inspect
+
+from flask import Flask
+from flask_limiter import Limiter
+
+import helpers.redis_pool as redis_pool
+from helpers.cus_limiter import PipelinedLimiter, PrefetchingFixedWindowRateLimiter
+
+
+class _FakeRedis:
+    """Just enough of redis/limits' INCR+EXPIRE script to count round trips."""
+
+    def __init__(self):
+        self.counts = {}
+        self.round_trips = 0
+
+    def incr_expire(self, keys, args, client=None):
+        if client is not None:                 # queued on a pipeline
+            client.queue.append((keys[0], int(args[1])))
+            return client
+        self.round_trips += 1
+        return self._incr(keys[0], int(args[1]))
+
+    def _incr(self, key, amount):
+        self.counts[key] = self.counts.get(key, 0) + amount
+        return self.counts[key]
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis, self.queue = redis, []
+
+    def execute(self):
+        self.redis.round_trips += 1
+        return [self.redis._incr(k, n) for k, n in self.queue]
+
+
+def _limited_app(fake):
+    app = Flask(__name__)
+    app.config.update(RATELIMIT_STORAGE_URI="redis://localhost:1", RATELIMIT_ENABLED=True)
+    limiter = PipelinedLimiter(key_func=lambda: "1.2.3.4",
+                               default_limits=["50 per hour", "10 per minute"])
+    limiter.init_app(app)
+    storage = limiter._storage
+    storage.lua_incr_expire = fake.incr_expire
+    storage.get_connection = lambda readonly=False: fake
+
+    @app.route("/hit")
+    @limiter.limit("3 per minute")
+    @limiter.shared_limit("100 per hour", scope="pickup")
+    def hit():
+        return "ok"
+
+    return app, limiter
+
+
+def test_all_limits_share_one_round_trip():
+    fake = _FakeRedis()
+    app, limiter = _limited_app(fake)
+    assert isinstance(limiter._limiter, PrefetchingFixedWindowRateLimiter)
+
+    client = app.test_client()
+    assert client.get("/hit").status_code == 200
+    assert fake.round_trips == 1
+    assert len(fake.counts) == 2               # route + shared; defaults overridden
+
+    fake.round_trips = 0
+    statuses = [client.get("/hit").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    assert fake.round_trips == 3
+
+
+def test_defaults_are_pipelined_together():
+    fake = _FakeRedis()
+    app, _ = _limited_app(fake)
+    app.add_url_rule("/plain", "plain", lambda: "ok")
+
+    assert app.test_client().get("/plain").status_code == 200
+    assert fake.round_trips == 1
+    assert sorted(fake.counts.values()) == [1, 1]
+
+
+def test_pool_is_shared_and_instrumented():
+    app = Flask(__name__)
+    app.config.update(UPSTASH_TLS_URL="rediss://:pw@localhost:6380", SESSION_TYPE="redis")
+    client = redis_pool.init_app(app)
+
+    pool = client.connection_pool
+    assert app.config["SESSION_REDIS"] is client
+    assert app.config["RATELIMIT_STORAGE_OPTIONS"]["connection_pool"] is pool
+    assert pool.connection_class is redis_pool.TimedSSLConnection
+    assert pool.max_connections == 20
+
+    with app.test_request_context():
+        assert redis_pool.get_redis() is client
+
+
+def test_no_url_means_no_client():
+    app = Flask(__name__)
+    assert redis_pool.init_app(app) is None
+    assert "SESSION_REDIS" not in app.config
+
+
+def test_flask_limiter_private_api_is_still_there():
+    """PipelinedLimiter leans on Flask-Limiter/limits internals (pinned in
+    requirements.txt); an upgrade that moves them must fail here, not quietly
+    fall back to one round trip per limit."""
+    filter_limits = getattr(Limiter, "_Limiter__filter_limits", None)
+    assert callable(filter_limits)
+    assert list(inspect.signature(filter_limits).parameters) == [
+        "self", "endpoint", "blueprint", "callable_name", "in_middleware"]
+    assert list(inspect.signature(Limiter._check_request_limit).parameters) == [
+        "self", "callable_name", "in_middleware"]
+
+    app = Flask(__name__)
+    app.config.update(RATELIMIT_STORAGE_URI="redis://localhost:1")
+    limiter = PipelinedLimiter(key_func=lambda: "1.2.3.4")
+    limiter.init_app(app)
+    for name in ("_storage", "_storage_dead", "_limiter", "_key_prefix"):
+        assert hasattr(limiter, name), name
+    for name in ("lua_incr_expire", "prefixed_key", "get_connection"):
+        assert callable(getattr(limiter._storage, name, None)), name
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import event
+
+import models
+from models import PickupRequest, add_request, db
+
+_PICKUP = dict(address="1 Main St", city="Dublin", zipcode="94568", awareness="Flyer")
+
+
+def test_add_request_issues_no_lookup_queries(app):
+    statements = []
+
+    def _record(conn, cursor, statement, *_a):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        add_request(**_PICKUP)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in statements)
+    assert sum(s.lstrip().upper().startswith("INSERT") for s in statements) == 1
+
+
+def test_add_request_retries_on_request_id_collision(app, monkeypatch):
+    first_id = add_request(**_PICKUP)
+    taken = db.session.get(PickupRequest, first_id).request_id
+
+    ids = iter([taken, taken, "FRESH001"])
+    monkeypatch.setattr(models, "new_request_id", lambda: next(ids))
+
+    second_id = add_request(**_PICKUP)
+
+    assert db.session.get(PickupRequest, second_id).request_id == "FRESH001"
+    assert PickupRequest.query.count() == 2
+
+
+def test_add_request_gives_up_after_max_attempts(app, monkeypatch):
+    first_id = add_request(**_PICKUP)
+    taken = db.session.get(PickupRequest, first_id).request_id
+    monkeypatch.setattr(models, "new_request_id", lambda: taken)
+
+    with pytest.raises(RuntimeError):
+        add_request(**_PICKUP)
+    assert PickupRequest.query.count() == 1
@@ -0,0 +1,60 @@
+import json
+import threading
+
+import pytest
+
+import helpers.route_events as route_events
+from helpers.route_events import Broker, TooManyStreams
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    fresh = Broker()
+    monkeypatch.setattr(route_events, "_broker", fresh)
+    return fresh
+
+
+def _frames(body: str) -> list[tuple[str, dict]]:
+    out = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines() if not line.startswith((":", "retry")))
+        if lines:
+            out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_publish_reaches_only_that_days_streams(app, broker):
+    today = route_events.subscribe("2025-06-02")
+    other = route_events.subscribe("2025-06-03")
+
+    route_events.publish("2025-06-02", "stop", {"pickup_id": 7, "status": "Complete"})
+
+    assert _frames(today.get(timeout=0)) == [("stop", {"pickup_id": 7, "status": "Complete"})]
+    assert other.get(timeout=0) is None
+
+
+def test_stream_keeps_alive_ends_and_unsubscribes(app, broker):
+    sub = route_events.subscribe("2025-06-02")
+    body = route_events.stream(sub, keepalive=0.01, max_seconds=0.2)
+    assert next(body) == "retry: 3000\n\n"
+
+    message = route_events.encode("remaining", {"time": "1 hr", "distance": "3.20 mi"})
+    threading.Timer(0.05, broker.deliver, args=("2025-06-02", message)).start()
+    rest = "".join(body)
+
+    assert ": keepalive" in rest
+    assert _frames(rest) == [("remaining", {"time": "1 hr", "distance": "3.20 mi"}),
+                             ("reconnect", {})]
+    assert broker.count() == 0
+
+
+def test_stream_limit_and_client_disconnect(app, broker):
+    first = route_events.subscribe("2025-06-02", limit=1)
+    with pytest.raises(TooManyStreams):
+        route_events.subscribe("2025-06-02", limit=1)
+
+    body = route_events.stream(first)
+    next(body)
+    body.close()                               # client went away
+    assert broker.count() == 0
+    route_events.subscribe("2025-06-02", limit=1)
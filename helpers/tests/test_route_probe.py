@@ -0,0 +1,77 @@
+import json
+import math
+import threading
+
+import pytest
+from flask import Flask
+
+pytest.importorskip("ortools")
+
+import helpers.mapbox_routing as mapbox_routing
+import helpers.route_probe as route_probe
+from helpers.mapbox_routing import solve_route
+
+
+def test_stop_sets_are_seeded_and_stay_near_service_zips():
+    uniform = route_probe.generate_stops("uniform", 40)
+    clustered = route_probe.generate_stops("clustered", 40)
+    assert uniform == route_probe.generate_stops("uniform", 40) != clustered
+    for lon, lat in uniform + clustered:
+        assert -122.1 < lon < -121.65 and 37.6 < lat < 37.9
+
+
+def test_roundtrip_cost_includes_the_leg_back_to_the_depot():
+    # Depot, A, B, C: the shortest open path is depot-A-C-B, but B is the
+    # farthest from home; the shortest tour is depot-A-B-C-depot.
+    pts = [(0, 0), (1, 0), (5, 5), (0, 5)]
+    cost = [[round(math.dist(a, b) * 100) for b in pts] for a in pts]
+    res = solve_route(cost, cost, roundtrip=True, time_limit_sec=0.2)
+    assert res["order_indices"] in ([0, 1, 2, 3, 0], [0, 3, 2, 1, 0])
+
+
+def test_run_writes_json_and_gates_on_regressions(tmp_path, capsys):
+    out, baseline = tmp_path / "run.json", tmp_path / "baseline.json"
+    args = ["--sizes", "5,30", "--layouts", "clustered", "--configs", "greedy,production",
+            "--time-limit", "0.2", "--out", str(out)]
+
+    assert route_probe.main([*args, "--update-baseline", str(baseline)]) == 0
+    report = json.loads(out.read_text())
+    assert {(r["case"], r["config"]) for r in report["results"]} == {
+        (case, config) for case in ("clustered-5", "clustered-30")
+        for config in ("greedy", "production")}
+    big = [r for r in report["results"] if r["case"] == "clustered-30"]
+    assert all(r["api_calls"] == 6 for r in big)           # 31 coords -> tiled Matrix calls
+    assert min(r["gap"] for r in big) == 0.0
+
+    assert route_probe.main([*args, "--baseline", str(baseline)]) == 0
+
+    data = json.loads(baseline.read_text())
+    for r in data["results"]:
+        r["cost"] = int(r["cost"] * 0.9)
+        r["api_calls"] -= 1
+    baseline.write_text(json.dumps(data))
+    assert route_probe.main([*args, "--baseline", str(baseline)]) == 1
+    err = capsys.readouterr().err
+    assert "REGRESSION clustered-30 / greedy: tour" in err and "API calls" in err
+
+
+def test_matrix_rate_limit_reserves_slots_across_threads(monkeypatch):
+    monkeypatch.setattr(mapbox_routing, "_MB_RPM", 3)
+    monkeypatch.setattr(mapbox_routing, "_req_ts", [])
+    slept = []
+    monkeypatch.setattr(mapbox_routing.time, "sleep", slept.append)
+
+    app = Flask("tests")
+
+    def call():
+        with app.app_context():
+            mapbox_routing._ratelimit()
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(mapbox_routing._req_ts) == 5
+    assert len(slept) == 2 and all(s > 59 for s in slept)
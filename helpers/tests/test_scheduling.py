@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+import helpers.scheduling as sched_mod
+from helpers.scheduling import build_schedule, invalidate_schedule, is_bookable, note_booking_changed
+from models import PickupRequest, ServiceSchedule, db
+
+_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _seed(open_day: str):
+    for day in _DAYS:
+        db.session.add(ServiceSchedule(day_of_week=day, is_available=(day == open_day),
+                                       slot1_start="08:00", slot1_end="16:00"))
+    db.session.commit()
+    sched_mod._calendar.invalidate()
+
+
+def _next(day_name: str) -> date:
+    d = date.today() + timedelta(days=1)
+    while d.strftime("%A") != day_name:
+        d += timedelta(days=1)
+    return d
+
+
+def _count_queries(app, fn):
+    seen = []
+    listener = lambda *a, **kw: seen.append(a[2])
+    event.listen(db.engine, "before_cursor_execute", listener)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", listener)
+    return seen
+
+
+def test_calendar_is_served_from_memory_after_first_build(app):
+    open_day = _next("Wednesday").strftime("%A")
+    _seed(open_day)
+
+    days, _ = build_schedule(0)
+    assert [d["day_of_week"] for d in days] == [open_day]
+
+    queries = _count_queries(app, lambda: [build_schedule(o) for o in (0, 1, 2)])
+    assert queries == []
+
+
+def test_admin_save_invalidates_calendar(app, monkeypatch):
+    monkeypatch.setattr(sched_mod._calendar, "_check_every", 0)
+    _seed("Wednesday")
+    build_schedule(0)
+
+    ServiceSchedule.query.filter_by(day_of_week="Thursday").one().is_available = True
+    invalidate_schedule()
+    db.session.commit()
+
+    days, _ = build_schedule(1)
+    assert {d["day_of_week"] for d in days} == {"Wednesday", "Thursday"}
+
+
+def test_full_slots_are_hidden(app, monkeypatch):
+    app.config["PICKUP_SLOT_CAPACITY"] = 2
+    monkeypatch.setattr(sched_mod._calendar, "_check_every", 0)
+    day = _next("Friday")
+    _seed("Friday")
+
+    for _ in range(2):
+        db.session.add(PickupRequest(address="1 Main St", city="Dublin", zipcode="94568",
+                                     awareness="Flyer", status="Requested",
+                                     request_date=day.isoformat(), request_time="08:00-16:00"))
+    note_booking_changed()
+    db.session.commit()
+
+    offset = (day - date.today()).days // 7
+    days, _ = build_schedule(offset)
+    assert day not in [d["date_obj"] for d in days]
+
+
+def test_service_days_narrow_the_calendar_and_bookings(app):
+    for day in _DAYS:
+        db.session.add(ServiceSchedule(day_of_week=day, is_available=True,
+                                       slot1_start="08:00", slot1_end="16:00"))
+    db.session.commit()
+    sched_mod._calendar.invalidate()
+    monday, tuesday = _next("Monday"), _next("Tuesday")
+
+    days, _ = build_schedule(1, frozenset({"Monday", "thursday"}))
+    assert {d["day_of_week"] for d in days} == {"Monday", "Thursday"}
+    assert len(build_schedule(1)[0]) == 7
+
+    assert is_bookable(monday.isoformat(), frozenset({"Monday"}))
+    assert not is_bookable(tuesday.isoformat(), frozenset({"Monday"}))
+    assert is_bookable(tuesday.isoformat())
+    assert not is_bookable(date.today().isoformat())
+    assert not is_bookable((date.today() + timedelta(weeks=4)).isoformat())
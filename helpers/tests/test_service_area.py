@@ -0,0 +1,69 @@
+import helpers.service_area as sa_mod
+from helpers.address import verifyZip
+from helpers.service_area import Geofence, service_areas
+from helpers.versioned_cache import bump_version
+from models import ServiceArea, db
+
+
+def _seed():
+    db.session.add_all([
+        ServiceArea(zipcode="94566", city="Pleasanton"),
+        ServiceArea(zipcode="94582", city="San Ramon", service_days="Monday,Thursday"),
+    ])
+    db.session.commit()
+    sa_mod._index_cache.invalidate()
+
+
+def test_index_maps_zip_to_city_and_days(app):
+    _seed()
+    idx = service_areas()
+
+    assert verifyZip(idx, "94582")["valid"]
+    assert not verifyZip(idx, "94110")["valid"]
+    assert idx.primary_city("94582") == "San Ramon"
+    assert idx.service_days("94582") == {"Monday", "Thursday"}
+    assert idx.service_days("94566") == frozenset()
+
+
+def test_index_reloads_only_after_version_bump(app, monkeypatch):
+    _seed()
+    monkeypatch.setattr(sa_mod._index_cache, "_check_every", 0)
+    before = service_areas()
+
+    db.session.add(ServiceArea(zipcode="94507", city="Alamo"))
+    db.session.commit()
+    assert service_areas() is before            # no bump → same snapshot
+
+    bump_version("service_areas")
+    db.session.commit()
+    assert "94507" in service_areas()
+
+
+def test_cli_add_invalidates_index(app):
+    _seed()
+    assert "94507" not in service_areas()
+    sa_mod.register(app)
+
+    result = app.test_cli_runner().invoke(args=["service-area", "add", "94507", "Alamo"])
+
+    assert result.exit_code == 0, result.output
+    assert service_areas().cities("94507") == ("Alamo",)
+
+
+def test_geofence_grid_matches_exact_test():
+    # Square with a square hole, GeoJSON-style (closed rings).
+    fence = Geofence.from_geojson({
+        "type": "Polygon",
+        "coordinates": [
+            [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+            [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]],
+        ],
+    }, grid_size=8)
+
+    assert fence.contains(1, 1)
+    assert not fence.contains(5, 5)             # in the hole
+    assert not fence.contains(11, 5)            # outside the bbox
+    for x in range(0, 100):
+        for y in range(0, 100):
+            px, py = x / 10 + 0.05, y / 10 + 0.05
+            assert fence.contains(px, py) == fence._exact(px, py)
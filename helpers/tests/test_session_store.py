@@ -0,0 +1,176 @@
+import time
+from datetime import timedelta
+
+import pytest
+import redis
+from flask import Flask, session
+
+from helpers.session_store import CachedRedisSessionInterface
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+class _FakeRedis(redis.Redis):
+    """Dict-backed GET/SET/TTL/EXPIRE/DELETE counting commands and round trips."""
+
+    def __init__(self):                    # no connection pool on purpose
+        self.data: dict = {}               # key -> (value, expires_at)
+        self.commands = 0
+        self.round_trips = 0
+
+    def _run(self, op, name, *args):
+        self.commands += 1
+        if op == "get":
+            return self.data.get(name, (None,))[0]
+        if op == "ttl":
+            return int(self.data[name][1] - time.time()) if name in self.data else -2
+        if op == "set":
+            value, ex = args
+            self.data[name] = (value, time.time() + ex)
+        elif op == "expire" and name in self.data:
+            self.data[name] = (self.data[name][0], time.time() + args[0])
+        elif op == "delete":
+            self.data.pop(name, None)
+
+    def get(self, name):
+        self.round_trips += 1
+        return self._run("get", name)
+
+    def delete(self, *names):
+        self.round_trips += 1
+        for name in names:
+            self._run("delete", name)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client, self.queued = client, []
+
+    def get(self, name):
+        self.queued.append(("get", name))
+
+    def ttl(self, name):
+        self.queued.append(("ttl", name))
+
+    def set(self, name, value, ex=None, **_):
+        self.queued.append(("set", name, value, ex))
+
+    def expire(self, name, time_):
+        self.queued.append(("expire", name, time_))
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [self.client._run(*args) for args in self.queued]
+
+
+def _worker(client):
+    app = Flask("tests")
+    app.config.update(SECRET_KEY="test", PERMANENT_SESSION_LIFETIME=timedelta(days=1))
+    app.session_interface = CachedRedisSessionInterface(app, client=client, permanent=True,
+                                                        use_signer=True)
+
+    @app.route("/page")
+    def page():
+        return "page"
+
+    @app.route("/set/<value>")
+    def set_value(value):
+        session["value"] = value
+        return "ok"
+
+    @app.route("/get")
+    def get_value():
+        return session.get("value", "")
+
+    @app.route("/clear")
+    def clear():
+        session.clear()
+        return "ok"
+
+    return app
+
+
+def test_anonymous_views_never_touch_redis():
+    client = _FakeRedis()
+    browser = _worker(client).test_client()
+    for _ in range(5):
+        browser.get("/page")
+    assert client.commands == 0
+
+
+def test_repeat_views_only_check_the_tag():
+    client = _FakeRedis()
+    browser = _worker(client).test_client()
+    browser.get("/set/a")
+    assert client.round_trips == 1                 # session + tag in one pipeline
+
+    assert [browser.get("/get").text for _ in range(3)] == ["a", "a", "a"]
+    assert client.round_trips == 1 + 3             # one small GET each, no body, no SET
+
+
+def test_write_on_another_worker_invalidates_by_tag():
+    client = _FakeRedis()
+    worker_a, worker_b = _worker(client), _worker(client)
+    browser = worker_a.test_client()
+    browser.get("/set/a")
+
+    # Same browser (cookie jar), request lands on worker B.
+    cookie = browser.get_cookie("session")
+    browser_b = worker_b.test_client()
+    browser_b.set_cookie("session", cookie.value)
+    assert browser_b.get("/get").text == "a"       # B loads from Redis
+    browser_b.get("/set/b")
+
+    before = client.round_trips
+    assert browser.get("/get").text == "b"         # A's cached tag is stale
+    assert client.round_trips == before + 2        # tag check, then reload
+
+
+def test_cookie_replayed_after_logout_is_rejected_by_every_worker():
+    client = _FakeRedis()
+    worker_a, worker_b = _worker(client), _worker(client)
+    browser_a, browser_b = worker_a.test_client(), worker_b.test_client()
+    browser_a.get("/set/secret")
+    stolen = browser_a.get_cookie("session").value
+    browser_b.set_cookie("session", stolen)
+    assert browser_b.get("/get").text == "secret"  # B now has it cached
+
+    browser_a.get("/clear")                        # logout handled by A
+
+    browser_b.set_cookie("session", stolen)
+    assert browser_b.get("/get").text == ""
+    assert len(worker_b.session_interface._cache) == 0
+
+
+def test_legacy_cookies_are_loaded_and_tagged():
+    client = _FakeRedis()
+    app = _worker(client)
+    iface = app.session_interface
+    browser = app.test_client()
+    browser.get("/set/a")
+    sid = iface._unsign(app, browser.get_cookie("session").value)
+    store_id = iface._get_store_id(sid)
+
+    # Stock Flask-Session data (no tag key) behind a "<sid>.<tag>" cookie
+    del client.data[iface._tag_key(store_id)]
+    iface._cache.clear()
+    browser.set_cookie("session", iface._sign(app, f"{sid}.oldtag"))
+
+    assert browser.get("/get").text == "a"
+    assert iface._tag_key(store_id) in client.data
+    assert iface._unsign(app, browser.get_cookie("session").value) == sid
+
+
+def test_cleared_session_is_deleted_everywhere():
+    client = _FakeRedis()
+    app = _worker(client)
+    browser = app.test_client()
+    browser.get("/set/a")
+    browser.get("/clear")
+
+    assert client.data == {}
+    assert len(app.session_interface._cache) == 0
+    assert browser.get_cookie("session") is None
@@ -0,0 +1,45 @@
+import helpers.site_config as sc_mod
+from helpers.query_stats import assert_max_queries
+from helpers.site_config import DEFAULT_DEPOT, set_depot, site_config
+from models import Config, db
+
+
+def test_defaults_when_no_rows(app):
+    sc_mod._cache.invalidate()
+    cfg = site_config()
+    assert cfg.admin_address is None
+    assert cfg.depot_text == cfg.depot_geo == DEFAULT_DEPOT
+
+
+def test_one_query_then_cached_until_set_depot(app, monkeypatch):
+    sc_mod._cache.invalidate()
+    monkeypatch.setattr(sc_mod._cache, "_check_every", 60)
+    with assert_max_queries(2):                 # version check + one SELECT of all rows
+        site_config()
+    with assert_max_queries(0):
+        assert site_config().depot_text == DEFAULT_DEPOT
+
+    set_depot("1 Main St, Dublin, CA 94568", "-121.9,37.7")
+    db.session.commit()
+    cfg = site_config()
+    assert (cfg.depot_text, cfg.depot_geo) == ("1 Main St, Dublin, CA 94568", "-121.9,37.7")
+    assert not any(k.startswith("cache_version:") for k in cfg.values)
+
+
+def test_failed_geocode_falls_back_to_the_text(app):
+    set_depot("1 Main St, Dublin, CA 94568", "-121.9,37.7")
+    db.session.commit()
+    set_depot("2 Oak Ave, Dublin, CA 94568", None)
+    db.session.commit()
+
+    assert Config.query.filter_by(key="geocoded_admin_addr").first() is None
+    assert site_config().depot_geo == "2 Oak Ave, Dublin, CA 94568"
+
+
+def test_one_snapshot_per_request(app):
+    sc_mod._cache.invalidate()
+    with app.test_request_context():
+        first = site_config()
+        db.session.add(Config(key="admin_address", value="elsewhere"))
+        sc_mod._cache.invalidate()
+        assert site_config() is first
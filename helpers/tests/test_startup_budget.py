@@ -0,0 +1,17 @@
+"""Cold-start budget for create_app().
+
+Runs in a subprocess (so imports are really cold) with development config and
+dummy credentials. Skipped when the full app dependency set isn't installed.
+"""
+import os
+
+from helpers.startup_profile import measure_startup
+
+_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "3.0"))
+
+
+def test_create_app_within_budget_and_defers_heavy_imports(dev_env):
+    report = measure_startup(env=dev_env)
+
+    assert report["heavy_loaded"] == []
+    assert report["create_app_seconds"] < _BUDGET_SECONDS, report
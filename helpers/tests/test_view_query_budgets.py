@@ -0,0 +1,87 @@
+"""The ``@query_budget`` of each instrumented view, against the real app.
+
+Development config on in-memory SQLite with a few days of pickups, so a
+per-row query (N+1) in a view or its template blows the budget. Skipped when
+the full app dependency set isn't installed.
+"""
+import time
+
+import pytest
+
+from helpers.live_route import save_route
+from helpers.query_stats import assert_query_budget
+from helpers.site_config import set_depot
+from models import DriverLocation, PickupRequest, RouteSolution, db
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")   # Flask-Session filesystem backend
+
+DAY = "2025-06-02"
+DEPOT = "-121.87,37.66"
+
+
+@pytest.fixture
+def client(site):
+    with site.app_context():
+        db.create_all()
+        _seed()
+        client = site.test_client()
+        with client.session_transaction() as sess:
+            sess["id_token"] = "signed-in"
+        yield client
+        db.session.remove()
+        db.drop_all()
+
+
+def _seed(per_day=6):
+    set_depot("5389 Mallard Dr., Pleasanton, CA 94566", DEPOT)
+    pickups = []
+    for day in ("2025-06-01", DAY, "2025-06-03"):
+        for i in range(per_day):
+            pickups.append(PickupRequest(
+                fname=f"F{i}", lname=f"L{i}", email=f"p{i}@example.com",
+                address=f"{100 + i} Main St", city="Pleasanton", zipcode="94566",
+                geocoded_addr=f"-121.8{i},37.6{i}", awareness="Friend",
+                status="Complete" if i < 2 else "Requested",
+                request_date=day, request_time="9am - 1pm", date_filed="2025-05-30",
+                request_id=f"{day[-2:]}{i:06d}",
+            ))
+    db.session.add_all(pickups)
+    db.session.add(DriverLocation(address="100 Main St", city="Pleasanton"))
+    db.session.flush()
+
+    stops = [p for p in pickups if p.request_date == DAY]
+    route = RouteSolution(date=DAY)
+    db.session.add(route)
+    n = len(stops)
+    save_route(route, [DEPOT, *(p.geocoded_addr for p in stops), DEPOT],
+               [300] * (n + 1), [2000] * (n + 1),
+               [(p.id, p.geocoded_addr) for p in stops])
+    db.session.commit()
+
+
+def test_admin_pickups_within_budget(client):
+    resp = assert_query_budget(client, "/admin-pickups?status_filter=Requested&sort_by=date_requested")
+    assert resp.status_code == 200
+
+
+def test_filtered_requests_within_budget(client):
+    resp = assert_query_budget(client, "/admin/filtered_requests?start_date=2025-05-01")
+    assert resp.status_code == 200
+
+
+def test_live_route_within_budget(client):
+    resp = assert_query_budget(client, f"/live-route?date={DAY}")
+    assert resp.status_code == 200
+    assert "102 Main St" in resp.text
+
+
+def test_driver_pings_within_budget(client):
+    now_ms = int(time.time() * 1000)
+    resp = assert_query_budget(client, "/driver/pings", method="POST", json={
+        "date": DAY,
+        "pings": [{"lon": -121.86, "lat": 37.65 + i / 1000, "t": now_ms - (3 - i) * 5000}
+                  for i in range(3)],
+    })
+    assert resp.status_code == 200
+    assert resp.get_json()["accepted"] == 3
+    assert len(resp.get_json()["etas"]) == 5         # four stops still ahead, then the depot
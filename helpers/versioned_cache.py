@@ -0,0 +1,76 @@
+"""Per-process caches of DB-backed data, invalidated across workers.
+
+Each cache has a version number stored in the ``config`` table under
+``cache_version:<name>``. A worker keeps its loaded value until it notices –
+at most every ``check_every`` seconds, with one indexed SELECT – that the
+stored version moved on. Whoever edits the underlying rows calls
+:func:`bump_version` in the same transaction.
+"""
+import threading
+import time
+from typing import Callable, Generic, TypeVar
+
+from models import Config, db
+
+T = TypeVar("T")
+
+_KEY_PREFIX = "cache_version:"
+
+
+def _version_key(name: str) -> str:
+    return f"{_KEY_PREFIX}{name}"
+
+
+def current_version(name: str) -> int:
+    row = Config.query.filter_by(key=_version_key(name)).first()
+    return int(row.value) if row and row.value.isdigit() else 0
+
+
+def bump_version(name: str) -> int:
+    """Mark cache *name* stale in every worker. Caller commits."""
+    row = Config.query.filter_by(key=_version_key(name)).first()
+    if row is None:
+        row = Config(key=_version_key(name), value="0")
+        db.session.add(row)
+    new = (int(row.value) if row.value.isdigit() else 0) + 1
+    row.value = str(new)
+    return new
+
+
+class VersionedCache(Generic[T]):
+    """
+    Holds ``loader()``'s result until ``bump_version(name)`` is seen.
+
+    ``get()`` must run inside an app context. ``invalidate()`` drops the local
+    copy only (tests, or right after this worker bumped the version).
+    """
+
+    def __init__(self, name: str, loader: Callable[[], T], check_every: float = 5.0):
+        self.name = name
+        self._loader = loader
+        self._check_every = check_every
+        self._lock = threading.Lock()
+        self._value: T | None = None
+        self._version = -1
+        self._checked_at = 0.0
+
+    def get(self) -> T:
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < self._check_every:
+            return self._value
+
+        with self._lock:
+            if self._value is not None and now - self._checked_at < self._check_every:
+                return self._value
+            version = current_version(self.name)
+            if self._value is None or version != self._version:
+                self._value = self._loader()
+                self._version = version
+            self._checked_at = time.monotonic()
+            return self._value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
+            self._version = -1
+            self._checked_at = 0.0
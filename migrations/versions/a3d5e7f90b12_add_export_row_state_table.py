@@ -0,0 +1,32 @@
+"""Add export_row_state table for incremental Sheets export.
+
+Revision ID: a3d5e7f90b12
+Revises: 86c4732d7fc3
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d5e7f90b12'
+down_revision = '86c4732d7fc3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('export_row_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.String(length=8), nullable=False),
+    sa.Column('sheet_row', sa.Integer(), nullable=False),
+    sa.Column('row_hash', sa.String(length=64), nullable=False),
+    sa.Column('exported_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('request_id')
+    )
+
+
+def downgrade():
+    op.drop_table('export_row_state')
@@ -0,0 +1,150 @@
+"""Store solved routes as route_stop rows with integer totals.
+
+Revision ID: b7e2c94d1f08
+Revises: d91e6b07c2a4
+Create Date: 2026-10-19 16:42:08.518230
+
+"""
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2c94d1f08'
+down_revision = 'd91e6b07c2a4'
+branch_labels = None
+depends_on = None
+
+_COORDS = re.compile(r"^\s*-?\d+(\.\d+)?\s*,\s*-?\d+(\.\d+)?\s*$")
+_HMS = re.compile(r"^(\d+):(\d\d):(\d\d)$")
+
+route_solution = sa.table(
+    'route_solution',
+    sa.column('id', sa.Integer), sa.column('date', sa.String),
+    sa.column('route_json', sa.Text), sa.column('legs_json', sa.Text),
+    sa.column('legs_meters_json', sa.Text), sa.column('total_time_str', sa.String),
+    sa.column('total_seconds', sa.Integer), sa.column('total_distance_meters', sa.Integer),
+)
+pickup_requests = sa.table(
+    'pickup_requests',
+    sa.column('id', sa.Integer), sa.column('request_date', sa.String),
+    sa.column('address', sa.String), sa.column('city', sa.String),
+    sa.column('zipcode', sa.String), sa.column('geocoded_addr', sa.String),
+)
+route_stop = sa.table(
+    'route_stop',
+    sa.column('solution_id', sa.Integer), sa.column('seq', sa.Integer),
+    sa.column('pickup_id', sa.Integer), sa.column('geo', sa.String),
+    sa.column('leg_seconds', sa.Integer), sa.column('leg_meters', sa.Integer),
+    sa.column('cum_seconds', sa.Integer), sa.column('cum_meters', sa.Integer),
+)
+
+
+def _pickup_keys(row) -> list[str]:
+    """Every string the app has used for a pickup in route_json."""
+    keys = [f"{row.address}, {row.city}, CA {row.zipcode}", f"{row.address}, {row.city} CA"]
+    if row.geocoded_addr and _COORDS.match(row.geocoded_addr):
+        keys.insert(0, row.geocoded_addr.replace(" ", ""))
+    return keys
+
+
+def _backfill(conn) -> None:
+    for sol in conn.execute(sa.select(route_solution)).fetchall():
+        route = json.loads(sol.route_json or "[]")
+        legs_s = json.loads(sol.legs_json or "[]")
+        legs_m = json.loads(sol.legs_meters_json or "[]")
+
+        by_key: dict[str, list[int]] = {}
+        pickups = conn.execute(sa.select(pickup_requests)
+                               .where(pickup_requests.c.request_date == sol.date)).fetchall()
+        for p in pickups:
+            for key in _pickup_keys(p):
+                by_key.setdefault(key, []).append(p.id)
+
+        rows, used, cum_s, cum_m = [], set(), 0, 0
+        for seq, geo in enumerate(route):
+            leg_s = int(legs_s[seq - 1]) if 0 < seq <= len(legs_s) else 0
+            leg_m = int(legs_m[seq - 1]) if 0 < seq <= len(legs_m) else 0
+            cum_s += leg_s
+            cum_m += leg_m
+            pickup_id = None
+            if 0 < seq < len(route) - 1:
+                pickup_id = next((i for i in by_key.get(geo, ()) if i not in used), None)
+                used.add(pickup_id)
+            rows.append({"solution_id": sol.id, "seq": seq, "pickup_id": pickup_id, "geo": geo,
+                         "leg_seconds": leg_s, "leg_meters": leg_m,
+                         "cum_seconds": cum_s, "cum_meters": cum_m})
+        if rows:
+            conn.execute(route_stop.insert(), rows)
+
+        m = _HMS.match(sol.total_time_str or "")
+        total = int(m.group(1)) * 3600 + int(m.group(2)) * 60 + int(m.group(3)) if m else cum_s
+        conn.execute(route_solution.update().where(route_solution.c.id == sol.id)
+                     .values(total_seconds=total,
+                             total_distance_meters=sol.total_distance_meters or cum_m))
+
+
+def upgrade():
+    op.create_table('route_stop',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('solution_id', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('pickup_id', sa.Integer(), nullable=True),
+    sa.Column('geo', sa.String(length=255), nullable=False),
+    sa.Column('leg_seconds', sa.Integer(), nullable=False),
+    sa.Column('leg_meters', sa.Integer(), nullable=False),
+    sa.Column('cum_seconds', sa.Integer(), nullable=False),
+    sa.Column('cum_meters', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['pickup_id'], ['pickup_requests.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['solution_id'], ['route_solution.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('solution_id', 'seq', name='uq_route_stop_solution_seq'),
+    sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('route_stop', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_route_stop_pickup_id'), ['pickup_id'], unique=False)
+
+    with op.batch_alter_table('route_solution', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_seconds', sa.Integer(), nullable=False,
+                                      server_default='0'))
+        batch_op.create_index(batch_op.f('ix_route_solution_date'), ['date'], unique=False)
+
+    _backfill(op.get_bind())
+
+    with op.batch_alter_table('route_solution', schema=None) as batch_op:
+        batch_op.drop_column('route_json')
+        batch_op.drop_column('legs_json')
+        batch_op.drop_column('legs_meters_json')
+        batch_op.drop_column('total_time_str')
+
+
+def downgrade():
+    with op.batch_alter_table('route_solution', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_time_str', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('legs_meters_json', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('legs_json', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('route_json', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    for sol in conn.execute(sa.select(route_solution)).fetchall():
+        stops = conn.execute(sa.select(route_stop).where(route_stop.c.solution_id == sol.id)
+                             .order_by(route_stop.c.seq)).fetchall()
+        h, rem = divmod(sol.total_seconds or 0, 3600)
+        conn.execute(route_solution.update().where(route_solution.c.id == sol.id).values(
+            route_json=json.dumps([s.geo for s in stops]),
+            legs_json=json.dumps([s.leg_seconds for s in stops[1:]]),
+            legs_meters_json=json.dumps([s.leg_meters for s in stops[1:]]),
+            total_time_str=f"{h:02}:{rem // 60:02}:{rem % 60:02}",
+        ))
+
+    with op.batch_alter_table('route_solution', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_route_solution_date'))
+        batch_op.drop_column('total_seconds')
+
+    with op.batch_alter_table('route_stop', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_route_stop_pickup_id'))
+
+    op.drop_table('route_stop')
@@ -0,0 +1,33 @@
+"""Queue donation_records for the MOPF Google Sheet.
+
+Revision ID: c4f8a2b61d37
+Revises: a3d5e7f90b12
+Create Date: 2026-10-19 11:03:27.402915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f8a2b61d37'
+down_revision = 'a3d5e7f90b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('donation_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('submitted_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('sheet_synced_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_donation_records_sheet_synced_at'), ['sheet_synced_at'], unique=False)
+
+    # Everything submitted before this revision was written to the sheet inline.
+    op.execute("UPDATE donation_records SET sheet_synced_at = CURRENT_TIMESTAMP")
+
+
+def downgrade():
+    with op.batch_alter_table('donation_records', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_donation_records_sheet_synced_at'))
+        batch_op.drop_column('sheet_synced_at')
+        batch_op.drop_column('submitted_at')
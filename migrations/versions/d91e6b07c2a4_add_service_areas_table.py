@@ -0,0 +1,52 @@
+"""Add service_areas table and seed the current ZIP list.
+
+Revision ID: d91e6b07c2a4
+Revises: c4f8a2b61d37
+Create Date: 2026-10-19 13:26:51.774302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91e6b07c2a4'
+down_revision = 'c4f8a2b61d37'
+branch_labels = None
+depends_on = None
+
+# The union of the old /verify_zip list and request_pickup's ZIP_TO_CITY.
+_SEED = [
+    ("94566", "Pleasanton"),
+    ("94588", "Pleasanton"),
+    ("94568", "Dublin"),
+    ("94550", "Livermore"),
+    ("94551", "Livermore"),
+    ("94582", "San Ramon"),
+    ("94583", "San Ramon"),
+    ("94506", "Danville"),
+    ("94526", "Danville"),
+    ("94507", "Alamo"),
+]
+
+
+def upgrade():
+    service_areas = op.create_table('service_areas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('zipcode', sa.String(length=5), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=False),
+    sa.Column('service_days', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('zipcode', 'city', name='uq_service_area_zip_city')
+    )
+    with op.batch_alter_table('service_areas', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_service_areas_zipcode'), ['zipcode'], unique=False)
+
+    op.bulk_insert(service_areas, [{"zipcode": z, "city": c} for z, c in _SEED])
+
+
+def downgrade():
+    with op.batch_alter_table('service_areas', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_service_areas_zipcode'))
+
+    op.drop_table('service_areas')
@@ -0,0 +1,42 @@
+"""Add driver_ping breadcrumbs and driver_location.geocoded_addr.
+
+Revision ID: e5a1d73c9b20
+Revises: b7e2c94d1f08
+Create Date: 2026-10-19 18:05:37.264915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a1d73c9b20'
+down_revision = 'b7e2c94d1f08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('driver_ping',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.Column('lon_e6', sa.Integer(), nullable=False),
+    sa.Column('lat_e6', sa.Integer(), nullable=False),
+    sa.Column('accuracy_m', sa.SmallInteger(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('driver_ping', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_driver_ping_recorded_at'), ['recorded_at'], unique=False)
+
+    with op.batch_alter_table('driver_location', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('geocoded_addr', sa.String(length=50), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('driver_location', schema=None) as batch_op:
+        batch_op.drop_column('geocoded_addr')
+
+    with op.batch_alter_table('driver_ping', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_driver_ping_recorded_at'))
+
+    op.drop_table('driver_ping')
@@ -0,0 +1,42 @@
+"""Add updated_at to pickup_requests and donation_records.
+
+Revision ID: f3b8d06a2c41
+Revises: e5a1d73c9b20
+Create Date: 2026-10-19 20:14:52.730118
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d06a2c41'
+down_revision = 'e5a1d73c9b20'
+branch_labels = None
+depends_on = None
+
+_TABLES = ('pickup_requests', 'donation_records')
+
+
+def upgrade():
+    # Backfilled with the app's clock (naive local time, as the ORM's onupdate
+    # writes it): a UTC CURRENT_TIMESTAMP ahead of it would put the backup
+    # watermark in the future and hide the next hours of edits.
+    now = datetime.now()
+    for table in _TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(sa.table(table, sa.column('updated_at', sa.DateTime)).update()
+                   .values(updated_at=now))
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+            batch_op.create_index(batch_op.f(f'ix_{table}_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    for table in _TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(batch_op.f(f'ix_{table}_updated_at'))
+            batch_op.drop_column('updated_at')
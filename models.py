@@ -4,7 +4,6 @@ from sqlalchemy import event
 import random
 from datetime import datetime, timedelta, timezone, date
 from zoneinfo import ZoneInfo
-import json
 
 # ──────────────────────────────────────────────────────────────────────────
 # Timezone helpers
@@ -58,29 +57,38 @@ class PickupRequest(db.Model):
 
     admin_notes = db.Column(db.String(2000), nullable=True)
 
+    # Change watermark for incremental backups (helpers.backup)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now,
+                           nullable=False, index=True)
+
 
 import string
 import secrets
+from sqlalchemy.exc import IntegrityError
 _BASE62 = string.ascii_uppercase + string.digits
+_ID_LENGTH = 8
+MAX_ID_ATTEMPTS = 5
 
-def generate_unique_request_id(length: int = 8, max_attempts: int = 20) -> str:
+def new_request_id(length: int = _ID_LENGTH) -> str:
     """
-    Return an 8-character, URL-safe ID that is (a) unpredictable and
-    (b) unique in the PickupRequest table.
+    Return an 8-character, URL-safe, unpredictable ID.
+
+    No read-before-write: uniqueness is enforced by the UNIQUE constraint on
+    ``pickup_requests.request_id``. With 36**8 (~2.8e12) possible codes a
+    collision is vanishingly rare; writers that hit one simply retry
+    (see :func:`add_request` and :func:`is_request_id_collision`).
     """
-    for _ in range(max_attempts):
-        code = ''.join(secrets.choice(_BASE62) for _ in range(length))
-        if not PickupRequest.query.filter_by(request_id=code).first():
-            return code
+    return ''.join(secrets.choice(_BASE62) for _ in range(length))
 
-    raise RuntimeError("Could not generate a unique request_id; "
-                       "increase length or investigate DB state.")
+def is_request_id_collision(exc: IntegrityError) -> bool:
+    """True if *exc* is the request_id UNIQUE constraint, not some other error."""
+    return "request_id" in str(getattr(exc, "orig", exc))
 
 @event.listens_for(PickupRequest, 'before_insert')
 def assign_request_id(mapper, connection, target):
-    # If no request_id is set, generate one.
+    # If no request_id is set, generate one (zero extra queries).
     if not target.request_id:
-        target.request_id = generate_unique_request_id()
+        target.request_id = new_request_id()
 
 
 class ServiceSchedule(db.Model):
@@ -131,36 +139,81 @@ def get_address():
     return config.value if config else None
 
 def add_request(**kwargs):
-    new_pickup = PickupRequest(**kwargs)
-    db.session.add(new_pickup)
-    db.session.commit()
-    return new_pickup.id
+    """
+    Insert a PickupRequest and return its primary key.
+
+    The insert runs inside a SAVEPOINT so that a (rare) request_id collision
+    only rolls back this row; we then retry with a fresh ID.
+    """
+    for _ in range(MAX_ID_ATTEMPTS):
+        new_pickup = PickupRequest(**kwargs)
+        try:
+            with db.session.begin_nested():
+                db.session.add(new_pickup)
+        except IntegrityError as exc:
+            if not is_request_id_collision(exc) or kwargs.get("request_id"):
+                raise
+            continue
+        pickup_id = new_pickup.id       # read before commit expires it
+        db.session.commit()
+        return pickup_id
+
+    raise RuntimeError("Could not insert a unique request_id; "
+                       "increase length or investigate DB state.")
 
 class RouteSolution(db.Model):
     """
     Table to cache/store the solved route for a given date (or driver, if multiple).
+    The route itself is the ordered RouteStop rows in ``stops``.
     """
     id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.String(50), nullable=False)  
-    route_json = db.Column(db.Text, nullable=True)
-    total_time_str = db.Column(db.String(50), nullable=True)
+    date = db.Column(db.String(50), nullable=False, index=True)
     last_updated = db.Column(db.DateTime, default=datetime.now)
-    legs_json = db.Column(db.Text)
     needs_refresh = db.Column(db.Boolean, default=False, nullable=False)
 
-    legs_meters_json = db.Column(db.Text, nullable=True, default="[]")   # meters per leg
+    total_seconds = db.Column(db.Integer, nullable=False, default=0)
     total_distance_meters = db.Column(db.Integer, nullable=True, default=0)
-    
+
+    stops = db.relationship("RouteStop", order_by="RouteStop.seq",
+                            cascade="all, delete-orphan", passive_deletes=True)
+
     def to_dict(self):
         return {
             "id": self.id,
             "date": self.date,
-            "route": json.loads(self.route_json) if self.route_json else [],
-            "total_time_str": self.total_time_str,
+            "route": [stop.geo for stop in self.stops],
+            "total_seconds": self.total_seconds,
+            "total_distance_meters": self.total_distance_meters,
             "last_updated": self.last_updated.isoformat()
         }
 
 
+class RouteStop(db.Model):
+    """
+    One stop of a RouteSolution in visiting order. seq 0 is the start and the
+    last row the end depot (no pickup_id on either). leg_* is the leg *into*
+    this stop, cum_* the running totals from the start up to this stop.
+    """
+    __tablename__ = 'route_stop'
+    __table_args__ = (
+        db.UniqueConstraint('solution_id', 'seq', name='uq_route_stop_solution_seq'),
+        # Rows are replaced on every re-solve; never reuse ids (incremental backups go by id)
+        {"sqlite_autoincrement": True},
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    solution_id = db.Column(db.Integer, db.ForeignKey('route_solution.id', ondelete='CASCADE'),
+                            nullable=False)
+    seq = db.Column(db.Integer, nullable=False)
+    pickup_id = db.Column(db.Integer, db.ForeignKey('pickup_requests.id', ondelete='SET NULL'),
+                          nullable=True, index=True)
+    geo = db.Column(db.String(255), nullable=False)       # the address/lon,lat the solver used
+    leg_seconds = db.Column(db.Integer, nullable=False, default=0)
+    leg_meters = db.Column(db.Integer, nullable=False, default=0)
+    cum_seconds = db.Column(db.Integer, nullable=False, default=0)
+    cum_meters = db.Column(db.Integer, nullable=False, default=0)
+
+
 class DriverLocation(db.Model):
     """
     Stores the driver's last known location, so the route can start from there.
@@ -169,11 +222,42 @@ class DriverLocation(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     address = db.Column(db.String(255), nullable=True)
     city = db.Column(db.String(255), nullable=True)
-    updated_at = db.Column(db.DateTime, default=datetime.now(), onupdate=datetime.now())
+    geocoded_addr = db.Column(db.String(50), nullable=True)    # "lon,lat" – GPS or the pickup's geocode
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
     def full_address(self):
+        """'lon,lat' when known (no geocoding needed), else the text address."""
+        if self.geocoded_addr:
+            return self.geocoded_addr
+        return self.text_address()
+
+    def text_address(self):
+        """The last stop (or refresh-form address) as text, never a GPS fix; None if unset."""
         return f"{self.address}, {self.city} CA" if (self.address and self.city) else None
-    
+
+
+class DriverPing(db.Model):
+    """
+    Append-only GPS breadcrumbs from the driver's phone, kept for
+    DRIVER_PING_RETENTION_HOURS (helpers.breadcrumbs prunes older rows).
+    Coordinates are integer microdegrees (~0.1 m) to keep rows small.
+    """
+    __tablename__ = 'driver_ping'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recorded_at = db.Column(db.DateTime, nullable=False, index=True)   # UTC, from the phone
+    lon_e6 = db.Column(db.Integer, nullable=False)
+    lat_e6 = db.Column(db.Integer, nullable=False)
+    accuracy_m = db.Column(db.SmallInteger, nullable=True)
+
+    @property
+    def lon(self) -> float:
+        return self.lon_e6 / 1e6
+
+    @property
+    def lat(self) -> float:
+        return self.lat_e6 / 1e6
+
 class SiteRating(db.Model):
     """
     Stores the driver's last known location, so the route can start from there.
@@ -202,4 +286,40 @@ class DonationRecord(db.Model):
     estimated_value = db.Column(db.String(5), nullable=False)
     donation_date = db.Column(db.String(20), nullable=False)
 
-    date_filed = db.Column(db.String(120), nullable=True)
\ No newline at end of file
+    date_filed = db.Column(db.String(120), nullable=True)
+
+    # Google Sheet queue: NULL until helpers.mopf has appended this row.
+    submitted_at = db.Column(db.DateTime, default=datetime.now, nullable=True)
+    sheet_synced_at = db.Column(db.DateTime, nullable=True, index=True)
+
+    # Change watermark for incremental backups (helpers.backup)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now,
+                           nullable=False, index=True)
+
+class ServiceArea(db.Model):
+    """
+    One (ZIP, city) we pick up in. service_days is a comma-separated list of
+    weekday names; NULL means every day that is open in ServiceSchedule.
+    Read through helpers.service_area.service_areas(), not directly.
+    """
+    __tablename__ = 'service_areas'
+    __table_args__ = (db.UniqueConstraint('zipcode', 'city', name='uq_service_area_zip_city'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    zipcode = db.Column(db.String(5), nullable=False, index=True)
+    city = db.Column(db.String(100), nullable=False)
+    service_days = db.Column(db.String(100), nullable=True)
+
+class ExportedRow(db.Model):
+    """
+    Where each PickupRequest currently lives in the "Requests" Google Sheet,
+    plus a hash of the values we last wrote there. Lets weekly_export() send
+    only new or changed rows instead of rewriting the whole tab.
+    """
+    __tablename__ = 'export_row_state'
+
+    id = db.Column(db.Integer, primary_key=True)
+    request_id = db.Column(db.String(8), unique=True, nullable=False)
+    sheet_row = db.Column(db.Integer, nullable=False)
+    row_hash = db.Column(db.String(64), nullable=False)
+    exported_at = db.Column(db.DateTime, default=datetime.now)
@@ -1,77 +1,199 @@
 document.addEventListener('DOMContentLoaded', () => {
-    const markCompleteButtons = document.querySelectorAll('.mark-complete');
-    const markIncompleteButtons = document.querySelectorAll('.mark-incomplete');
-    const markPickupImpossibleButtons = document.querySelectorAll('.mark-pickup-not-possible');
-
     const csrfToken = document.querySelector('input[name="csrf_token"]').value;
+    const routeDate = new URLSearchParams(window.location.search).get('date');
 
-  
-    markCompleteButtons.forEach(button => {
-      button.addEventListener('click', async function() {
-        const pickupId = this.getAttribute('data-pickup-id');
-  
-        try {
-          const formData = new FormData();
-          formData.append('pickup_id', pickupId);
-          formData.append('csrf_token', csrfToken);
-
-  
-          const response = await fetch('/toggle_pickup_status', {
-            method: 'POST',
-            body: formData
-          });
-  
-          if (!response.ok) {
-            alert('Error updating status');
-            return;
-          }
-  
-          // At this point we don't really need the JSON data since we're reloading,
-          // but here's how you'd parse it if needed:
-          // const data = await response.json();
-  
-          // Simply reload the entire page:
-          window.location.reload();
-  
-        } catch (error) {
-          console.error(error);
-          alert('Something went wrong');
+    // ── Live updates ─────────────────────────────────────────────────────
+    // /live-route/events streams stop/remaining/driver changes (from this
+    // device or any other), so the page patches itself instead of reloading.
+    // Without a stream (unsupported, refused, or dropped) we reload as before.
+    let live = false;
+    let plannedClose = false;   // server ends streams every few minutes
+    let missedEvents = false;
+
+    if (window.EventSource && routeDate) {
+      const events = new EventSource(`/live-route/events?date=${encodeURIComponent(routeDate)}`);
+
+      events.addEventListener('open', () => {
+        if (missedEvents) {
+          window.location.reload();   // cheap: 304 unless something changed
+          return;
         }
+        live = true;
       });
-    });
+      events.addEventListener('error', () => {
+        live = false;
+        if (!plannedClose) missedEvents = true;
+        plannedClose = false;
+      });
+      events.addEventListener('reconnect', () => { plannedClose = true; });
+      events.addEventListener('stop', e => applyStop(JSON.parse(e.data)));
+      events.addEventListener('remaining', e => applyRemaining(JSON.parse(e.data)));
+      events.addEventListener('driver', e => applyDriver(JSON.parse(e.data)));
+      events.addEventListener('eta', e => applyEtas(JSON.parse(e.data)));
+    }
+
+    function applyRemaining(data) {
+      document.querySelector('#route-stats .time').textContent = `${data.time} remaining`;
+      document.querySelector('#route-stats .miles').textContent = `${data.distance} left`;
+    }
+
+    function applyDriver(data) {
+      const input = document.getElementById('refresh-address');
+      if (input) input.value = data.location;
+    }
 
-    markPickupImpossibleButtons.forEach(button => {
-      button.addEventListener('click', async function() {
-        const pickupId = this.getAttribute('data-pickup-id');
-  
-        try {
-          const formData = new FormData();
-          formData.append('pickup_id', pickupId);  
-          formData.append('csrf_token', csrfToken);
-
-          const response = await fetch('/mark-pickup-not-possible', {
-            method: 'POST',
-            body: formData
-          });
-  
-          if (!response.ok) {
-            alert('Error updating status');
-            return;
-          }
-  
-          // At this point we don't really need the JSON data since we're reloading,
-          // but here's how you'd parse it if needed:
-          // const data = await response.json();
-  
-          // Simply reload the entire page:
+    function applyEtas(data) {
+      data.stops.forEach(stop => {
+        const slot = stop.pickup_id && document.querySelector(`[data-eta-for="${stop.pickup_id}"]`);
+        if (slot) slot.textContent = `ETA ${stop.at}`;
+      });
+      if (data.time) {
+        document.querySelector('#route-stats .time').textContent = `${data.time} remaining`;
+      }
+    }
+
+    // ── GPS breadcrumbs ──────────────────────────────────────────────────
+    // Today's route only: queue phone fixes and send them in batches; the
+    // server answers with fresh ETAs (and streams them to other open pages).
+    const PING_FLUSH_MS = 30000;
+    const PING_MIN_GAP_MS = 10000;
+    const today = new Date().toLocaleDateString('en-CA');   // YYYY-MM-DD
+    const pingQueue = [];
+
+    if (navigator.geolocation && routeDate === today) {
+      navigator.geolocation.watchPosition(pos => {
+        const last = pingQueue[pingQueue.length - 1];
+        if (last && pos.timestamp - last.t < PING_MIN_GAP_MS) return;
+        pingQueue.push({
+          lon: pos.coords.longitude,
+          lat: pos.coords.latitude,
+          t: pos.timestamp,
+          accuracy: Math.round(pos.coords.accuracy)
+        });
+      }, error => console.warn('GPS unavailable:', error.message),
+      { enableHighAccuracy: true, maximumAge: 5000 });
+
+      setInterval(flushPings, PING_FLUSH_MS);
+    }
+
+    async function flushPings() {
+      if (!pingQueue.length) return;
+      const batch = pingQueue.splice(0, pingQueue.length);
+      try {
+        const response = await fetch('/driver/pings', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
+          body: JSON.stringify({ date: routeDate, pings: batch })
+        });
+        if (!response.ok) {
+          if (response.status >= 500 || response.status === 429) pingQueue.unshift(...batch);
+          return;
+        }
+        // The page renders the last stop's address, not the GPS fix; and
+        // without a stream nobody else will tell this page the ETAs
+        const body = await response.json();
+        if (body.location) applyDriver({ location: body.location });
+        if (!live) applyEtas({ stops: body.etas, time: body.time });
+      } catch (error) {
+        pingQueue.unshift(...batch.slice(-100));   // offline: retry the most recent fixes
+      }
+    }
+
+    function applyStop(stop) {
+      if (stop.status === 'Requested') {
+        // Re-added stops need the full card and a route recompute
+        window.location.reload();
+        return;
+      }
+      const button = document.querySelector(
+        `.pickup-stop:not(.completed-stop) [data-pickup-id="${stop.pickup_id}"]`);
+      if (!button) return;   // already applied
+      button.closest('.pickup-stop').remove();
+      addCompletedStop(stop);
+      enableNextStop();
+    }
+
+    function addCompletedStop(stop) {
+      const list = document.getElementById('listed-completed-pickups');
+      if (!list.querySelector('.completed-stop')) list.replaceChildren();
+
+      const card = document.createElement('div');
+      card.className = 'pickup-stop completed-stop';
+      card.innerHTML = `
+        <div class="completed-header"><h4>Request Status: <b></b></h4></div>
+        <div class="pickup-content completed-content">
+          <p></p>
+          <div class="align-center button-wrapper">
+            <button class="mark-complete mark-incomplete button-wrapper-btn" data-current-status="Complete">
+              <i class="bi bi-x-octagon"></i> Move Back To Pickup Queue
+            </button>
+          </div>
+        </div>`;
+      card.querySelector('b').textContent = stop.status;
+      card.querySelector('p').textContent =
+        `${stop.address}${stop.address2 ? ' ' + stop.address2 : ''}, ${stop.city}, CA`;
+      card.querySelector('button').dataset.pickupId = stop.pickup_id;
+      list.appendChild(card);
+    }
+
+    function enableNextStop() {
+      const next = document.querySelector('main > .pickup-stop:not(.completed-stop)');
+      if (!next) {
+        const done = document.createElement('h3');
+        done.textContent = '🎉 You have completed all of the stops!';
+        document.querySelector('main').appendChild(done);
+        return;
+      }
+      next.querySelector('.pickup-header')?.classList.remove('disabled');
+      next.querySelectorAll('button').forEach(b => { b.disabled = false; });
+    }
+
+    // ── Stop actions ─────────────────────────────────────────────────────
+    // Delegated, so cards added by live updates work too.
+    document.addEventListener('click', async function(event) {
+      const button = event.target.closest('.mark-complete, .mark-pickup-not-possible');
+      if (!button || button.disabled) return;
+
+      const url = button.classList.contains('mark-pickup-not-possible')
+        ? '/mark-pickup-not-possible'
+        : '/toggle_pickup_status';
+
+      try {
+        const formData = new FormData();
+        formData.append('pickup_id', button.getAttribute('data-pickup-id'));
+        formData.append('csrf_token', csrfToken);
+
+        button.disabled = true;
+        const response = await fetch(url, {
+          method: 'POST',
+          body: formData
+        });
+
+        if (!response.ok) {
+          button.disabled = false;
+          alert('Error updating status');
+          return;
+        }
+
+        if (!live) {
           window.location.reload();
-  
-        } catch (error) {
-          console.error(error);
-          alert('Something went wrong');
+          return;
         }
-      });
-    })
+        // Apply our own change from the response: the stream may be served by
+        // another worker that never hears about it. The stream's copy of the
+        // same events is then a no-op.
+        const { updates } = await response.json();
+        if (updates.driver) applyDriver(updates.driver);
+        if (updates.remaining) applyRemaining(updates.remaining);
+        applyStop(updates.stop);
+
+      } catch (error) {
+        button.disabled = false;
+        console.error(error);
+        alert('Something went wrong');
+      }
+    });
+
     document.getElementById('completed-header')
     .addEventListener('click', function() {
         completedHeader = document.getElementById('completed-header'); 
@@ -1,3 +1,6 @@
+// lon/lat of the picked suggestion; lets the server geofence before any Google call
+let placeLonLat = null;
+
 window.initAutocomplete = function () {
   const addressEl = document.getElementById('address');
 
@@ -5,7 +8,7 @@ window.initAutocomplete = function () {
   const ac = new google.maps.places.Autocomplete(addressEl, {
     componentRestrictions: { country: "us" },
     types   : ["address"],
-    fields  : ["address_components", "name", "place_id"], // name lets Google fill the box
+    fields  : ["address_components", "name", "place_id", "geometry"], // name lets Google fill the box
   });
 
   ac.addListener("place_changed", () => fillForm(ac.getPlace()));
@@ -28,6 +31,8 @@ function fillForm(place) {
   // clear previous values
   ["address","city","zip"].forEach(id => document.getElementById(id).value = "");
   document.getElementById("place_id").value = place.place_id || "";
+  const loc = place.geometry && place.geometry.location;
+  placeLonLat = loc ? { lon: loc.lng(), lat: loc.lat() } : null;
 
   place.address_components.forEach(c => {
     c.types.forEach(t => {
@@ -95,6 +100,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const el = document.getElementById(id);
     el.addEventListener('input', () => {
       document.getElementById('place_id').value = '';
+      placeLonLat = null;
     });
   });
 
@@ -146,7 +152,9 @@ document.addEventListener('DOMContentLoaded', function() {
       full_addr: `${addr}, ${city}, CA ${zip}`,
       place_id : placeId,
       city     : city,   // ← add both
-      zip      : zip
+      zip      : zip,
+      lon      : placeLonLat ? placeLonLat.lon : null,
+      lat      : placeLonLat ? placeLonLat.lat : null
     });
 
     try {
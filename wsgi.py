@@ -0,0 +1,10 @@
+"""WSGI entry point for gunicorn (see gunicorn.conf.py).
+
+Builds the app once and warms shared state so that, with ``preload_app``,
+workers fork from a ready-made, copy-on-write master.
+"""
+from app import create_app
+from helpers.prefork import warm
+
+app = create_app()
+warm(app)